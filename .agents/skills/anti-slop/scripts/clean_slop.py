@@ -5,256 +5,623 @@ AI Slop Cleaner - Automatically removes common AI-generated content patterns fro
 
 import re
 import sys
+import json
+import difflib
+import argparse
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from pattern_packs import LANGUAGES, PatternPack, load_packs, language_packs, resolve_language
+from pattern_registry import REGISTRY
+from profiling import Profiler, measure, run_main
+
+# This skill's bundled pattern packs (pattern_packs.language_packs)
+PACKS_DIR = Path(__file__).resolve().parent.parent / 'packs'
+
+# Each stage is a list of (pattern, replacement, change message) rules,
+# applied in order. A rule only sees text already rewritten by earlier rules.
+
+HIGH_RISK_RULES = [(pattern, replacement, f"Removed/replaced: {pattern}") for pattern, replacement in {
+    r'\b(?:delve|dive deep) into\b': '',
+    r'\bunpack\b(?! (?:the|a|an))': 'examine',  # Keep "unpack the box"
+    r'\bnavigate the complexit(?:y|ies) of\b': 'handle',
+    r'\bin the ever-evolving landscape of\b': 'in',
+    r'\bin today\'s fast-paced world,?\b': '',
+    r'\bin today\'s digital age,?\b': '',
+    r'\bat the end of the day,?\b': 'ultimately',
+    r'\bit\'s important to note that\b': '',
+    r'\bit\'s worth noting that\b': '',
+}.items()]
+
+WORDY_RULES = [(pattern, replacement, f"Simplified: '{pattern}' → '{replacement}'") for pattern, replacement in {
+    r'\bin order to\b': 'to',
+    r'\bdue to the fact that\b': 'because',
+    r'\bat this point in time\b': 'now',
+    r'\bfor the purpose of\b': 'for',
+    r'\bhas the ability to\b': 'can',
+    r'\bis able to\b': 'can',
+    r'\bin spite of the fact that\b': 'although',
+    r'\btake into consideration\b': 'consider',
+    r'\bmake a decision\b': 'decide',
+    r'\bconduct an investigation\b': 'investigate',
+    r'\bin the event that\b': 'if',
+    r'\bprior to\b': 'before',
+    r'\bsubsequent to\b': 'after',
+}.items()]
+
+META_COMMENTARY_RULES = [(pattern, '', "Removed meta-commentary") for pattern in [
+    r'In this (?:article|post|document|section|guide),? (?:we will|I will|we|I) .*?[.!]\s*',
+    r'As we (?:explore|examine|discuss|delve into) .*?,?\s',
+    r'Let\'s take a (?:closer )?look at .*?[.!]\s*',
+    r'Now that we\'ve covered .*?,?\s',
+    r'Before we proceed,?\s.*?[.!]\s*',
+]]
+
+HEDGING_RULES = [(pattern, replacement, f"Reduced hedging: {pattern}") for pattern, replacement in {
+    r'\bmay or may not\b': 'may',
+    r'\bcould potentially\b': 'could',
+    r'\bmight possibly\b': 'might',
+    r'\bit appears that\b': '',
+    r'\bit seems that\b': '',
+    r'\bone could argue that\b': '',
+    r'\bsome might say that\b': '',
+    r'\bto a certain extent,?\b': '',
+    r'\bgenerally speaking,?\b': '',
+}.items()]
+
+BUZZWORD_RULES = [(pattern, replacement, f"Replaced buzzword: {pattern}") for pattern, replacement in {
+    r'\bleverag(?:e|ing)\b': 'use',
+    r'\butiliz(?:e|ing)\b': 'use',
+    r'\bsynergistic\b': 'cooperative',
+    r'\bparadigm shift\b': 'major change',
+    r'\bgame-changer\b': 'significant',
+    r'\bnext-generation\b': 'new',
+    r'\bworld-class\b': 'excellent',
+    r'\bbest-in-class\b': 'excellent',
+    r'\bcutting-edge\b': 'advanced',
+}.items()]
+
+REDUNDANT_QUALIFIER_RULES = [(pattern, replacement, f"Fixed redundant qualifier: {pattern}") for pattern, replacement in {
+    r'\bcompletely finish(?:ed)?\b': 'finished',
+    r'\babsolutely essential\b': 'essential',
+    r'\btotally unique\b': 'unique',
+    r'\bvery unique\b': 'unique',
+    r'\bpast history\b': 'history',
+    r'\bfuture plans\b': 'plans',
+    r'\bend result\b': 'result',
+    r'\bfinal outcome\b': 'outcome',
+}.items()]
+
+# Only remove in specific contexts where they're clearly filler
+EMPTY_INTENSIFIER_RULES = [(pattern, replacement, "Removed empty intensifier") for pattern, replacement in {
+    r'\breally important\b': 'important',
+    r'\bvery important\b': 'important',
+    r'\bquite literally\b': 'literally',
+    r'\bactually,?\s(?!not|the|a)\b': '',  # Remove filler "actually"
+}.items()]
+
+CLEANING_STAGES = [
+    HIGH_RISK_RULES,
+    WORDY_RULES,
+    META_COMMENTARY_RULES,
+    HEDGING_RULES,
+    BUZZWORD_RULES,
+    REDUNDANT_QUALIFIER_RULES,
+    EMPTY_INTENSIFIER_RULES,
+]
+
+
+# Characters on which str.lower() and re.IGNORECASE disagree about ASCII
+# letters (dotted and dotless i, long s, Kelvin sign)
+CASE_FOLD_EXCEPTIONS = REGISTRY.get('[\u0130\u0131\u017f\u212a]', owner='clean_slop')
+
+# Extra rewrites in aggressive mode: (pattern, flags, replacement), in order
+AGGRESSIVE_RULES = [
+    # Transition words at sentence starts
+    (r'^However,\s', re.MULTILINE, ''),
+    (r'^Furthermore,\s', re.MULTILINE, ''),
+    (r'^Moreover,\s', re.MULTILINE, ''),
+    # "It is X that" constructions
+    (r'\bIt is (?:important|crucial|essential|vital) (?:that|to)\b', re.IGNORECASE, ''),
+]
+
+# Spacing fixes for gaps left by deletions: (pattern, flags, replacement), in order
+SPACING_RULES = [
+    # Multiple spaces
+    (r' {2,}', 0, ' '),
+    # Space before punctuation
+    (r' +([.,;:!?])', 0, r'\1'),
+    # Multiple blank lines
+    (r'\n{3,}', 0, '\n\n'),
+    # Lowercase sentence starts after deletions
+    (r'([.!?])\s+([a-z])', 0, lambda m: m.group(1) + ' ' + m.group(2).upper()),
+    # Orphaned commas
+    (r',\s*,', 0, ','),
+]
+
+for _pattern, _flags, _ in AGGRESSIVE_RULES + SPACING_RULES:
+    REGISTRY.register(_pattern, _flags, 'clean_slop')
+
+
+def _is_bounded(pattern: str) -> bool:
+    """True if the pattern can never match more characters than it is long."""
+    return (not REGISTRY.get(r'(?<!\\)(?:\\\\)*(?:[*+{]|\\\d)', owner='clean_slop').search(pattern)
+            and '(?P=' not in pattern)
+
+
+def _group_bodies(pattern: str):
+    """Yield (opening, body) for each parenthesized group of the pattern."""
+    stack = []
+    escaped = False
+    for i, ch in enumerate(pattern):
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch == '(':
+            stack.append(i)
+        elif ch == ')' and stack:
+            start = stack.pop()
+            yield pattern[start:start + 4], pattern[start + 1:i]
+
+
+def _lookaround_reach(pattern: str) -> int:
+    """Upper bound on how far outside its match a pattern inspects the text."""
+    reach = 1  # \b looks at one neighbouring character
+    for opening, body in _group_bodies(pattern):
+        if opening.startswith(('(?=', '(?!', '(?<=', '(?<!')):
+            reach += len(body)
+    return reach
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """True if a '|' outside any group splits the whole pattern."""
+    depth = 0
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            return True
+    return False
+
+
+class RuleGroup:
+    """A run of rules applied one full substitution at a time."""
+
+    def __init__(self, rules: List[Tuple[str, str, str]]):
+        self.rules = rules
+        for pattern, _, _ in rules:
+            REGISTRY.register(pattern, re.IGNORECASE, 'clean_slop')
+        self.replacements = [replacement for _, replacement, _ in rules]
+        self._compiled = None
+
+    @property
+    def compiled(self) -> List[re.Pattern]:
+        """The rules' patterns, compiled through the registry on first use."""
+        if self._compiled is None:
+            self._compiled = [REGISTRY.get(pattern, re.IGNORECASE) for pattern, _, _ in self.rules]
+        return self._compiled
+
+    def apply(self, text: str, counts: List[int], changed: List[bool]) -> str:
+        """Rewrite text, adding per-rule replacement counts and change flags."""
+        return self.apply_sequential(text, counts, changed)
+
+    def apply_sequential(self, text: str, counts: List[int], changed: List[bool]) -> str:
+        """Reference path: one substitution over the whole text per rule."""
+        for i, compiled in enumerate(self.compiled):
+            rewritten, n = compiled.subn(self.replacements[i], text)
+            counts[i] += n
+            if rewritten != text:
+                changed[i] = True
+            text = rewritten
+        return text
+
+
+class FusedRuleGroup(RuleGroup):
+    """Applies consecutive literal stages with one scan of the document.
+
+    Every rule is folded into one regex: a gate that stops wherever some rule
+    matches, plus one optional named lookahead per rule that records its span
+    (the dispatch table maps group names back to rules). The candidates are
+    clustered, and each cluster's neighbourhood is rewritten by replaying the
+    rules in order on that short slice only, so precedence and cascades
+    (one rule's output feeding a later rule) behave exactly as if every rule
+    had run over the whole text.
+
+    Correctness rests on the rules being bounded: a match can't be longer
+    than its pattern, and can't look further than its lookaround reach
+    beyond itself. Each slice carries a margin wide enough that any match
+    the edits could create or destroy lies inside it; if a replayed rule
+    gets too close to the slice edge anyway, the group falls back to the
+    sequential path. tests/test_clean_slop_engine.py checks both paths, and
+    the original stage-by-stage cleaner, on a fixed corpus.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str, str]]):
+        super().__init__(rules)
+        self.source = self._build_gate() + ''.join(
+            f'(?=(?P<r{i}>{pattern}))?' for i, (pattern, _, _) in enumerate(rules))
+        self.prefilter_source = self._build_prefilter()
+        REGISTRY.register(self.source, re.IGNORECASE, 'clean_slop')
+        if self.prefilter_source is not None:
+            REGISTRY.register(self.prefilter_source, 0, 'clean_slop')
+        self._group_ids = None
+        
+        # A match spans at most its pattern length and looks at most reach
+        # characters past either end, so an edit can only create or destroy
+        # matches within guard characters of it. Slices keep candidates a
+        # further pattern length inside the guard, leaving room for cascades.
+        reach = max(_lookaround_reach(pattern) for pattern, _, _ in rules)
+        longest = max(len(pattern) for pattern, _, _ in rules)
+        self.guard = longest + reach
+        self.margin = self.guard + longest
+
+    def _build_gate(self) -> str:
+        """Build the lookahead that accepts offsets where any rule matches."""
+        # Test the shared leading \b once, then branch on the next letter
+        # (a one-level trie), so most offsets are rejected almost immediately
+        by_head = defaultdict(list)
+        unfactored = []
+        others = []
+        for pattern, _, _ in self.rules:
+            if not pattern.startswith('\\b') or _has_top_level_alternation(pattern):
+                others.append(pattern)
+                continue
+            tail = pattern[2:]
+            if tail[:1].isalpha() and tail[1:2] not in ('?', '*', '+', '{'):
+                by_head[tail[0].lower()].append(tail[1:])
+            else:
+                unfactored.append(tail)
+        
+        branches = [f'{head}(?:{"|".join(tails)})' for head, tails in by_head.items()]
+        branches.extend(f'(?:{tail})' for tail in unfactored)
+        alternatives = [f'\\b(?:{"|".join(branches)})'] if branches else []
+        alternatives.extend(f'(?:{p})' for p in others)
+        return f'(?=(?:{"|".join(alternatives)}))'
+
+    @property
+    def regex(self) -> re.Pattern:
+        return REGISTRY.get(self.source, re.IGNORECASE)
+
+    @property
+    def group_ids(self) -> List[int]:
+        """Group number of each rule's lookahead in the combined regex."""
+        if self._group_ids is None:
+            self._group_ids = [self.regex.groupindex[f'r{i}'] for i in range(len(self.rules))]
+        return self._group_ids
+
+    @property
+    def prefilter(self) -> Optional[re.Pattern]:
+        if self.prefilter_source is None:
+            return None
+        return REGISTRY.get(self.prefilter_source)
+
+    def _build_prefilter(self) -> Optional[str]:
+        """Build a case-sensitive scan for lowercased text, if the rules allow it.
+
+        Without IGNORECASE the regex engine can skip ahead to the next
+        possible first character, which makes the scan several times faster.
+        Leading word-boundary assertions are dropped, so it finds a superset
+        of the candidate offsets; each hit is confirmed with the full regex.
+        """
+        if any(pattern != pattern.lower() for pattern, _, _ in self.rules):
+            return None
+        by_head = defaultdict(list)
+        others = []
+        for pattern, _, _ in self.rules:
+            tail = pattern[2:] if pattern.startswith('\\b') else pattern
+            if (tail[:1].isalpha() and tail[1:2] not in ('?', '*', '+', '{')
+                    and not _has_top_level_alternation(tail)):
+                by_head[tail[0]].append(tail[1:])
+            else:
+                others.append(tail)
+        branches = [f'{head}(?:{"|".join(tails)})' for head, tails in by_head.items()]
+        branches.extend(f'(?:{p})' for p in others)
+        return '|'.join(branches)
+
+    def _candidates(self, text: str):
+        """Yield a match of the full regex at every offset where some rule matches."""
+        lower = text.lower()
+        if (self.prefilter is None or len(lower) != len(text)
+                or CASE_FOLD_EXCEPTIONS.search(text)):
+            yield from self.regex.finditer(text)
+            return
+        search = self.prefilter.search
+        confirm = self.regex.match
+        pos = 0
+        while True:
+            hit = search(lower, pos)
+            if hit is None:
+                return
+            pos = hit.start()
+            m = confirm(text, pos)
+            if m:
+                yield m
+            pos += 1
+
+    def apply(self, text: str, counts: List[int], changed: List[bool]) -> str:
+        """Rewrite text, adding per-rule replacement counts and change flags."""
+        clusters = self._clusters(text)
+        if not clusters:
+            return text
+        
+        slice_counts = [0] * len(self.rules)
+        slice_changed = [False] * len(self.rules)
+        pieces = []
+        prev = 0
+        for lo, hi, found in clusters:
+            # Rewritable slice [a, b), plus read-only context so that every
+            # match inside the slice sees the same neighbours as in the full text
+            a = max(0, lo - self.margin)
+            b = min(len(text), hi + self.margin)
+            ca = max(0, a - self.guard)
+            cb = min(len(text), b + self.guard)
+            # No guard is needed at the real ends of the text
+            left = self.guard if a > 0 else 0
+            right = self.guard if b < len(text) else 0
+            rewritten = self._replay(text[ca:cb], a - ca, cb - b, left, right, found,
+                                     slice_counts, slice_changed)
+            if rewritten is None:
+                return self.apply_sequential(text, counts, changed)
+            pieces.append(text[prev:a])
+            pieces.append(rewritten)
+            prev = b
+        pieces.append(text[prev:])
+        
+        for i in range(len(self.rules)):
+            counts[i] += slice_counts[i]
+            changed[i] = changed[i] or slice_changed[i]
+        return ''.join(pieces)
+
+    def _clusters(self, text: str) -> List[list]:
+        """Group candidates whose slices would overlap.
+
+        Returns [start, end, rules] entries, where rules is the set of rule
+        indices with a candidate in the cluster.
+        """
+        clusters = []
+        group_ids = self.group_ids
+        gap = 2 * self.margin
+        for m in self._candidates(text):
+            regs = m.regs
+            start = m.start()
+            found = [i for i, g in enumerate(group_ids) if regs[g][0] >= 0]
+            end = max(regs[group_ids[i]][1] for i in found)
+            if clusters and start < clusters[-1][1] + gap:
+                cluster = clusters[-1]
+                if end > cluster[1]:
+                    cluster[1] = end
+                cluster[2].update(found)
+            else:
+                clusters.append([start, end, set(found)])
+        return clusters
+
+    def _replay(self, chunk: str, head: int, tail: int, left: int, right: int, found: set,
+                counts: List[int], changed: List[bool]) -> Optional[str]:
+        """Run every rule in order over chunk[head:-tail] and return that slice.
+
+        Returns None if a match lands within the left or right guard, where
+        it could interact with text outside the slice.
+        """
+        edited = False
+        for i, compiled in enumerate(self.compiled):
+            # Until the slice is edited, only rules with candidates can match
+            if not edited and i not in found:
+                continue
+            stop = len(chunk) - tail
+            pieces = []
+            prev = 0
+            for m in compiled.finditer(chunk, head):
+                start = m.start()
+                if start >= stop:
+                    break
+                if start < head + left or m.end() > stop - right:
+                    return None
+                pieces.append(chunk[prev:start])
+                pieces.append(self.replacements[i])
+                prev = m.end()
+            if pieces:
+                pieces.append(chunk[prev:])
+                rewritten = ''.join(pieces)
+                counts[i] += len(pieces) // 2
+                if rewritten != chunk:
+                    changed[i] = True
+                    edited = True
+                chunk = rewritten
+        return chunk[head:len(chunk) - tail]
+
+
+class RewriteEngine:
+    """Runs the cleaning stages, fusing runs of bounded literal stages.
+
+    Stages containing open-ended patterns (the meta-commentary rules use
+    ``.*?``) can't be replayed on a slice, so they run sequentially and act
+    as barriers between fused groups.
+    """
+
+    def __init__(self, stages: List[List[Tuple[str, str, str]]]):
+        self.groups = []
+        pending = []
+        for rules in stages:
+            if all(_is_bounded(pattern) and '\\' not in replacement
+                   for pattern, replacement, _ in rules):
+                pending.extend(rules)
+                continue
+            if pending:
+                self.groups.append(FusedRuleGroup(pending))
+                pending = []
+            self.groups.append(RuleGroup(rules))
+        if pending:
+            self.groups.append(FusedRuleGroup(pending))
+
+    def rewrite(self, text: str, fused: bool = True,
+                profiler: Optional[Profiler] = None) -> Tuple[str, List[str], Counter]:
+        """Return the rewritten text, change messages and per-rule replacement counts.
+        
+        With a profiler, each rule group is measured as one stage.
+        """
+        changes = []
+        rule_counts = Counter()
+        for number, group in enumerate(self.groups, 1):
+            counts = [0] * len(group.rules)
+            changed = [False] * len(group.rules)
+            apply = group.apply if fused else group.apply_sequential
+            if profiler is not None:
+                kind = 'fused' if fused and isinstance(group, FusedRuleGroup) else 'sequential'
+                name = f"rules_{number} ({kind}, {len(group.rules)} rules)"
+                text = measure(profiler, name, apply, text, counts, changed)
+            else:
+                text = apply(text, counts, changed)
+            for (pattern, _, message), n, did_change in zip(group.rules, counts, changed):
+                if n:
+                    rule_counts[pattern] += n
+                if did_change:
+                    changes.append(message)
+        return text, changes, rule_counts
+
+
+ENGINE = RewriteEngine(CLEANING_STAGES)
+
+
+# Name shown in reports for text that did not come from a file
+TEXT_LABEL = '<text>'
+
+
+def decode_text(text: Union[str, bytes]) -> str:
+    """Return text as str; bytes are decoded as UTF-8 with newlines translated like a file read."""
+    if isinstance(text, bytes):
+        return text.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    return text
 
 
 class SlopCleaner:
-    def __init__(self, filepath: str, aggressive: bool = False):
-        self.filepath = Path(filepath)
+    def __init__(self, filepath: str = None, aggressive: bool = False,
+                 packs: Optional[List[PatternPack]] = None, language: str = 'en',
+                 profiler: Optional[Profiler] = None, text: Union[str, bytes, None] = None):
+        """packs: loaded pattern packs whose replacements run after the built-in stages.
+        
+        language ('en', 'pt' or 'auto' to detect it) adds the bundled packs
+        for that language. With a profiler (see profiling.py), loading and
+        every cleaning stage are measured. When text (str or UTF-8 bytes)
+        is given, nothing is read from disk, filepath only labels the
+        output, and save() needs an explicit output path.
+        """
+        if filepath is None and text is None:
+            raise ValueError("SlopCleaner needs a filepath or a text")
+        self.filepath = Path(filepath if filepath is not None else TEXT_LABEL)
         self.aggressive = aggressive
-        self.text = self._load_file()
+        self.profiler = profiler
+        self.in_memory = text is not None
+        if text is None:
+            self.text = measure(profiler, 'load', self._load_file)
+        else:
+            self.text = measure(profiler, 'load', decode_text, text)
+        self.language = measure(profiler, 'language', resolve_language, language, self.text)
+        self.packs = language_packs(self.language, packs, PACKS_DIR)
         self.changes_made = []
-        
+        self.rule_counts = Counter()
+        # aggressive flag -> (cleaned text, change log, per-rule counts)
+        self._cleaned = {}
+        
+    @classmethod
+    def from_text(cls, text: Union[str, bytes], name: str = TEXT_LABEL, **options) -> 'SlopCleaner':
+        """Cleaner for text already in memory; name stands in for the file name."""
+        return cls(name, text=text, **options)
+    
     def _load_file(self) -> str:
         """Load and return file contents."""
         with open(self.filepath, 'r', encoding='utf-8') as f:
             return f.read()
     
     def clean(self) -> str:
-        """Apply all cleaning operations and return cleaned text."""
-        cleaned = self.text
-        
-        # Apply cleaning operations in order
-        cleaned = self._remove_high_risk_phrases(cleaned)
-        cleaned = self._simplify_wordy_phrases(cleaned)
-        cleaned = self._remove_meta_commentary(cleaned)
-        cleaned = self._reduce_hedging(cleaned)
-        cleaned = self._clean_buzzwords(cleaned)
-        cleaned = self._fix_redundant_qualifiers(cleaned)
-        cleaned = self._remove_empty_intensifiers(cleaned)
+        """Apply all cleaning operations and return cleaned text.
+
+        The result and change log are memoized per aggressive setting, so
+        preview() followed by save() cleans the text only once.
+        """
+        if self.aggressive in self._cleaned:
+            cleaned, changes, rule_counts = self._cleaned[self.aggressive]
+            self.changes_made = list(changes)
+            self.rule_counts = Counter(rule_counts)
+            return cleaned
+        
+        # Apply the replacement stages in order, fused where possible
+        cleaned, changes, rule_counts = ENGINE.rewrite(self.text, profiler=self.profiler)
+        self.changes_made = changes
+        self.rule_counts = rule_counts
+        
+        # Pattern pack replacements, one scan per pack
+        for pack in self.packs:
+            cleaned = measure(self.profiler, f'pack ({pack.name})', self._apply_pack, pack, cleaned)
         
         if self.aggressive:
-            cleaned = self._aggressive_cleanup(cleaned)
+            cleaned = measure(self.profiler, 'aggressive', self._aggressive_cleanup, cleaned)
         
         # Clean up spacing issues created by deletions
-        cleaned = self._normalize_spacing(cleaned)
+        cleaned = measure(self.profiler, 'spacing', self._normalize_spacing, cleaned)
         
+        self._cleaned[self.aggressive] = (cleaned, list(self.changes_made), Counter(self.rule_counts))
         return cleaned
     
-    def _remove_high_risk_phrases(self, text: str) -> str:
-        """Remove or replace high-risk AI phrases."""
-        replacements = {
-            r'\b(?:delve|dive deep) into\b': '',
-            r'\bunpack\b(?! (?:the|a|an))': 'examine',  # Keep "unpack the box"
-            r'\bnavigate the complexit(?:y|ies) of\b': 'handle',
-            r'\bin the ever-evolving landscape of\b': 'in',
-            r'\bin today\'s fast-paced world,?\b': '',
-            r'\bin today\'s digital age,?\b': '',
-            r'\bat the end of the day,?\b': 'ultimately',
-            r'\bit\'s important to note that\b': '',
-            r'\bit\'s worth noting that\b': '',
-        }
-        
-        for pattern, replacement in replacements.items():
-            old_text = text
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-            if text != old_text:
-                self.changes_made.append(f"Removed/replaced: {pattern}")
-        
-        return text
-    
-    def _simplify_wordy_phrases(self, text: str) -> str:
-        """Replace wordy phrases with simpler alternatives."""
-        replacements = {
-            r'\bin order to\b': 'to',
-            r'\bdue to the fact that\b': 'because',
-            r'\bat this point in time\b': 'now',
-            r'\bfor the purpose of\b': 'for',
-            r'\bhas the ability to\b': 'can',
-            r'\bis able to\b': 'can',
-            r'\bin spite of the fact that\b': 'although',
-            r'\btake into consideration\b': 'consider',
-            r'\bmake a decision\b': 'decide',
-            r'\bconduct an investigation\b': 'investigate',
-            r'\bin the event that\b': 'if',
-            r'\bprior to\b': 'before',
-            r'\bsubsequent to\b': 'after',
-        }
-        
-        for pattern, replacement in replacements.items():
-            old_text = text
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-            if text != old_text:
-                self.changes_made.append(f"Simplified: '{pattern}' → '{replacement}'")
-        
-        return text
-    
-    def _remove_meta_commentary(self, text: str) -> str:
-        """Remove meta-commentary about the document itself."""
-        patterns = [
-            r'In this (?:article|post|document|section|guide),? (?:we will|I will|we|I) .*?[.!]\s*',
-            r'As we (?:explore|examine|discuss|delve into) .*?,?\s',
-            r'Let\'s take a (?:closer )?look at .*?[.!]\s*',
-            r'Now that we\'ve covered .*?,?\s',
-            r'Before we proceed,?\s.*?[.!]\s*',
-        ]
-        
-        for pattern in patterns:
-            old_text = text
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-            if text != old_text:
-                self.changes_made.append(f"Removed meta-commentary")
-        
-        return text
-    
-    def _reduce_hedging(self, text: str) -> str:
-        """Reduce excessive hedging language."""
-        replacements = {
-            r'\bmay or may not\b': 'may',
-            r'\bcould potentially\b': 'could',
-            r'\bmight possibly\b': 'might',
-            r'\bit appears that\b': '',
-            r'\bit seems that\b': '',
-            r'\bone could argue that\b': '',
-            r'\bsome might say that\b': '',
-            r'\bto a certain extent,?\b': '',
-            r'\bgenerally speaking,?\b': '',
-        }
-        
-        for pattern, replacement in replacements.items():
-            old_text = text
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-            if text != old_text:
-                self.changes_made.append(f"Reduced hedging: {pattern}")
-        
-        return text
-    
-    def _clean_buzzwords(self, text: str) -> str:
-        """Replace or remove corporate buzzwords."""
-        replacements = {
-            r'\bleverag(?:e|ing)\b': 'use',
-            r'\butiliz(?:e|ing)\b': 'use',
-            r'\bsynergistic\b': 'cooperative',
-            r'\bparadigm shift\b': 'major change',
-            r'\bgame-changer\b': 'significant',
-            r'\bnext-generation\b': 'new',
-            r'\bworld-class\b': 'excellent',
-            r'\bbest-in-class\b': 'excellent',
-            r'\bcutting-edge\b': 'advanced',
-        }
-        
-        for pattern, replacement in replacements.items():
-            old_text = text
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-            if text != old_text:
-                self.changes_made.append(f"Replaced buzzword: {pattern}")
-        
-        return text
-    
-    def _fix_redundant_qualifiers(self, text: str) -> str:
-        """Remove redundant qualifiers."""
-        patterns = [
-            r'\bcompletely finish(?:ed)?\b',
-            r'\babsolutely essential\b',
-            r'\btotally unique\b',
-            r'\bvery unique\b',
-            r'\bpast history\b',
-            r'\bfuture plans\b',
-            r'\bend result\b',
-            r'\bfinal outcome\b',
-        ]
-        
-        replacements = {
-            r'\bcompletely finish(?:ed)?\b': 'finished',
-            r'\babsolutely essential\b': 'essential',
-            r'\btotally unique\b': 'unique',
-            r'\bvery unique\b': 'unique',
-            r'\bpast history\b': 'history',
-            r'\bfuture plans\b': 'plans',
-            r'\bend result\b': 'result',
-            r'\bfinal outcome\b': 'outcome',
-        }
-        
-        for pattern, replacement in replacements.items():
-            old_text = text
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-            if text != old_text:
-                self.changes_made.append(f"Fixed redundant qualifier: {pattern}")
-        
-        return text
-    
-    def _remove_empty_intensifiers(self, text: str) -> str:
-        """Remove overused empty intensifiers."""
-        # Only remove in specific contexts where they're clearly filler
-        patterns = [
-            r'\breally important\b',
-            r'\bvery important\b',
-            r'\bquite literally\b',
-            r'\bactually,?\s(?!not|the|a)\b',  # Remove filler "actually"
-        ]
-        
-        replacements = {
-            r'\breally important\b': 'important',
-            r'\bvery important\b': 'important',
-            r'\bquite literally\b': 'literally',
-            r'\bactually,?\s(?!not|the|a)\b': '',
-        }
-        
-        for pattern, replacement in replacements.items():
-            old_text = text
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-            if text != old_text:
-                self.changes_made.append(f"Removed empty intensifier")
-        
+    def _apply_pack(self, pack: PatternPack, text: str) -> str:
+        """Apply a pattern pack's replacements and log them like the built-in rules."""
+        text, counts = pack.phrases.replace(text, pack.replacements)
+        for phrase_id in sorted(counts):
+            phrase = pack.phrases.phrases[phrase_id]
+            replacement = pack.replacements[phrase_id]
+            self.rule_counts[phrase] += counts[phrase_id]
+            if replacement:
+                self.changes_made.append(f"Replaced ({pack.name}): '{phrase}' → '{replacement}'")
+            else:
+                self.changes_made.append(f"Removed ({pack.name}): {phrase}")
         return text
     
     def _aggressive_cleanup(self, text: str) -> str:
         """More aggressive cleanup - may change meaning slightly."""
-        # Remove more transition words at sentence starts
-        text = re.sub(r'^However,\s', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^Furthermore,\s', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^Moreover,\s', '', text, flags=re.MULTILINE)
-        
-        # Remove "It is X that" constructions
-        text = re.sub(r'\bIt is (?:important|crucial|essential|vital) (?:that|to)\b', '', text, flags=re.IGNORECASE)
+        for pattern, flags, replacement in AGGRESSIVE_RULES:
+            text = REGISTRY.get(pattern, flags).sub(replacement, text)
         
         self.changes_made.append("Applied aggressive cleanup")
         return text
     
     def _normalize_spacing(self, text: str) -> str:
         """Clean up spacing issues from deletions."""
-        # Fix multiple spaces
-        text = re.sub(r' {2,}', ' ', text)
-        
-        # Fix space before punctuation
-        text = re.sub(r' +([.,;:!?])', r'\1', text)
-        
-        # Fix multiple blank lines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        
-        # Fix spaces at start of sentences after deletions
-        text = re.sub(r'([.!?])\s+([a-z])', lambda m: m.group(1) + ' ' + m.group(2).upper(), text)
-        
-        # Fix orphaned commas
-        text = re.sub(r',\s*,', ',', text)
+        for pattern, flags, replacement in SPACING_RULES:
+            text = REGISTRY.get(pattern, flags).sub(replacement, text)
         
         return text.strip()
     
-    def save(self, output_path: str = None):
-        """Save cleaned text to file."""
+    def write(self, output_path: str = None) -> Tuple[Path, Optional[Path]]:
+        """Write the cleaned text without printing; returns (output path, backup path or None)."""
         cleaned = self.clean()
         
+        backup_path = None
         if output_path is None:
+            if self.in_memory:
+                raise ValueError("in-memory text has no file to overwrite; give an output path")
             # Create backup and overwrite original
             backup_path = self.filepath.with_suffix(self.filepath.suffix + '.backup')
             self.filepath.rename(backup_path)
             output_path = self.filepath
-            print(f"✅ Created backup: {backup_path}")
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(cleaned)
+        return Path(output_path), backup_path
+    
+    def save(self, output_path: str = None):
+        """Save cleaned text to file."""
+        output_path, backup_path = self.write(output_path)
         
+        if backup_path is not None:
+            print(f"✅ Created backup: {backup_path}")
         print(f"✅ Saved cleaned text to: {output_path}")
         print(f"\n📊 Changes made: {len(self.changes_made)}")
         
@@ -269,13 +636,42 @@ class SlopCleaner:
             for category, count in change_counts.items():
                 print(f"  • {category}: {count} instance(s)")
     
-    def preview(self, context_lines: int = 2):
-        """Preview changes without saving."""
+    def diff(self, context_lines: int = 2) -> str:
+        """Unified diff from the original to the cleaned text."""
+        return ''.join(difflib.unified_diff(
+            self.text.splitlines(keepends=True), self.clean().splitlines(keepends=True),
+            fromfile=str(self.filepath), tofile=f'{self.filepath} (cleaned)', n=context_lines))
+    
+    def to_dict(self, text: str = 'cleaned') -> Dict:
+        """Return the cleanup as a JSON-serializable record.
+        
+        text selects what the record carries besides the change log:
+        'cleaned' (the cleaned text), 'diff' (a unified diff) or 'none'.
+        """
+        cleaned = self.clean()
+        record = {
+            'file': str(self.filepath),
+            'language': self.language,
+            'changed': cleaned != self.text,
+            'change_count': len(self.changes_made),
+            'changes': list(self.changes_made),
+            'rule_counts': dict(self.rule_counts),
+        }
+        if text == 'cleaned':
+            record['cleaned'] = cleaned
+        elif text == 'diff':
+            record['diff'] = self.diff()
+        if self.profiler is not None:
+            record['timing'] = self.profiler.to_dict()
+        return record
+    
+    def preview(self, context_lines: int = 2, save_hint: bool = True) -> bool:
+        """Preview changes without saving; return whether there is anything to change."""
         cleaned = self.clean()
         
         if cleaned == self.text:
             print("✅ No changes needed - text is already clean!")
-            return
+            return False
         
         print(f"\n{'='*70}")
         print(f"Preview of changes for: {self.filepath.name}")
@@ -300,42 +696,160 @@ class SlopCleaner:
             print(f"... and more changes (showing first {max_changes_to_show})")
         
         print(f"\n📊 Total changes: {len(self.changes_made)}")
-        print("\nRun with --save to apply changes")
+        if save_hint:
+            print("\nRun with --save to apply changes")
+        return True
+    
+    def review(self, output_path: str = None,
+               confirm: Callable[[str], bool] = None) -> bool:
+        """Preview changes, ask for confirmation, then save; the text is cleaned once."""
+        if not self.preview(save_hint=False):
+            return False
+        
+        confirm = confirm or ask_yes_no
+        if not confirm("\nApply these changes?"):
+            print("No changes saved.")
+            return False
+        
+        self.save(output_path)
+        return True
+
+
+def clean_text(text: Union[str, bytes], aggressive: bool = False, **options) -> str:
+    """Clean in-memory text and return the result; options go to SlopCleaner (packs, language)."""
+    return SlopCleaner.from_text(text, aggressive=aggressive, **options).clean()
+
+
+def ask_yes_no(question: str) -> bool:
+    """Prompt on the terminal; anything but an explicit yes declines."""
+    try:
+        answer = input(f"{question} [y/N] ")
+    except EOFError:
+        return False
+    return answer.strip().lower() in ('y', 'yes')
+
+
+def stream_records(filepaths: List[str], save: bool, text: str, **options):
+    """Clean each file and print its JSON record as soon as it is done (NDJSON)."""
+    for filepath in filepaths:
+        try:
+            cleaner = SlopCleaner(filepath, **options)
+            record = cleaner.to_dict(text=text)
+            if save and record['changed']:
+                output_path, backup_path = cleaner.write()
+                record['saved'] = str(output_path)
+                record['backup'] = str(backup_path)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            record = {'file': filepath, 'error': str(e)}
+        print(json.dumps(record, ensure_ascii=False), flush=True)
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python clean_slop.py <file> [options]")
-        print("\nOptions:")
-        print("  --save           Save changes (creates backup)")
-        print("  --output FILE    Save to different file")
-        print("  --aggressive     More aggressive cleanup")
-        print("  --preview        Preview changes without saving (default)")
+    parser = argparse.ArgumentParser(
+        description='Removes common AI slop patterns from text files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python clean_slop.py article.md
+  python clean_slop.py article.md --save --aggressive
+  python clean_slop.py article.md --output clean.md
+  python clean_slop.py article.md --interactive
+  python clean_slop.py drafts/*.md --ndjson --diff
+  python clean_slop.py --stdin < draft.md > clean.md
+  python clean_slop.py perfil.md --pack packs/pt-br.json --save
+  python clean_slop.py curriculo.tex --lang pt
+  python clean_slop.py article.md --timing
+        """
+    )
+    parser.add_argument('inputs', nargs='*', metavar='file',
+                        help='Files to clean (several need --ndjson)')
+    parser.add_argument('--save', action='store_true', help='Save changes (creates backup)')
+    parser.add_argument('--output', metavar='FILE', help='Save to a different file (implies --save)')
+    parser.add_argument('--aggressive', action='store_true', help='More aggressive cleanup')
+    parser.add_argument('--preview', action='store_true',
+                        help='Preview changes without saving (the default for files)')
+    parser.add_argument('--interactive', action='store_true', help='Preview, confirm, then save')
+    parser.add_argument('--pack', action='append', default=[], metavar='FILE',
+                        help="Also apply a JSON/TOML pattern pack's replacements (repeatable)")
+    parser.add_argument('--lang', choices=('auto',) + LANGUAGES, default='auto',
+                        help='Text language; selects the bundled pattern packs (default: detect)')
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Print one JSON record per file (changes, rule counts, cleaned text)')
+    parser.add_argument('--diff', action='store_true',
+                        help='With --ndjson, put a unified diff in the record instead of the text')
+    parser.add_argument('--stdin', action='store_true',
+                        help='Clean the text piped on stdin and write it to stdout')
+    parser.add_argument('--timing', action='store_true',
+                        help='Show time, regex calls and allocations per cleaning stage')
+    parser.add_argument('--profile', action='store_true',
+                        help='Run under cProfile and print the busiest functions to stderr')
+    args = parser.parse_args()
+    
+    files = args.inputs
+    if args.stdin and (files or args.save or args.interactive):
+        parser.error('--stdin cannot be combined with input files, --save or --interactive')
+    if not files and not args.stdin:
+        parser.print_usage()
         sys.exit(1)
+    if args.ndjson and (args.interactive or args.output or args.timing):
+        parser.error('--ndjson cannot be combined with --interactive, --output or --timing')
+    if args.diff and not args.ndjson:
+        parser.error('--diff needs --ndjson')
+    if len(files) > 1 and not args.ndjson:
+        parser.error('several input files need --ndjson')
     
-    filepath = sys.argv[1]
+    if not args.ndjson and not args.stdin:
+        filepath = files[0]
+        if not Path(filepath).exists():
+            print(f"Error: File '{filepath}' not found")
+            sys.exit(1)
     
-    if not Path(filepath).exists():
-        print(f"Error: File '{filepath}' not found")
+    save_mode = args.save or args.output is not None
+    text = 'diff' if args.diff else 'cleaned'
+    try:
+        packs = load_packs(args.pack)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load pattern pack: {e}", file=sys.stderr)
         sys.exit(1)
     
-    aggressive = '--aggressive' in sys.argv
-    save_mode = '--save' in sys.argv
-    output_file = None
+    if args.ndjson and not args.stdin:
+        stream_records(files, save_mode, text, aggressive=args.aggressive, packs=packs, language=args.lang)
+        return
     
-    if '--output' in sys.argv:
-        output_idx = sys.argv.index('--output')
-        if output_idx + 1 < len(sys.argv):
-            output_file = sys.argv[output_idx + 1]
-            save_mode = True
+    try:
+        profiler = Profiler() if args.timing else None
+        options = dict(aggressive=args.aggressive, packs=packs, language=args.lang, profiler=profiler)
+        if args.stdin:
+            cleaner = SlopCleaner.from_text(sys.stdin.buffer.read(), '<stdin>', **options)
+        else:
+            cleaner = SlopCleaner(filepath, **options)
+    except (ValueError, UnicodeDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
     
-    cleaner = SlopCleaner(filepath, aggressive=aggressive)
+    if args.stdin and not (args.output or args.preview):
+        # Pipe mode: only the cleaned text (or its record) goes to stdout
+        if args.ndjson:
+            record = cleaner.to_dict(text=text)
+            sys.stdout.buffer.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+        else:
+            cleaned = cleaner.clean()
+            sys.stdout.buffer.write((cleaned + '\n' if cleaned else '').encode('utf-8'))
+        sys.stdout.flush()
+        if profiler is not None:
+            print(profiler.format_table(), file=sys.stderr)
+        return
     
-    if save_mode:
-        cleaner.save(output_file)
+    if args.interactive:
+        cleaner.review(args.output)
+    elif save_mode:
+        cleaner.save(args.output)
     else:
         cleaner.preview()
+    
+    if profiler is not None:
+        print(profiler.format_table())
 
 
 if __name__ == '__main__':
-    main()
+    run_main(main)
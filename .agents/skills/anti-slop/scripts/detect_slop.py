@@ -4,11 +4,28 @@ AI Slop Detector - Analyzes text files for common AI-generated content patterns.
 """
 
 import re
+import os
 import sys
+import glob
+import json
+import heapq
+import argparse
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Tuple, Optional, Union
 from collections import defaultdict
+from collections.abc import Mapping, Sequence
 
+from pattern_packs import LANGUAGES, PatternPack, load_packs, language_packs, resolve_language
+from pattern_registry import REGISTRY
+from profiling import Profiler, measure, run_main
+from result_cache import ResultCache
+
+# This skill's bundled pattern packs (pattern_packs.language_packs)
+PACKS_DIR = Path(__file__).resolve().parent.parent / 'packs'
 
 # High-risk phrases that nearly always indicate AI slop
 HIGH_RISK_PHRASES = [
@@ -78,59 +95,453 @@ HEDGE_WORDS = [
 ]
 
 
+# Meta-commentary announced in the first lines ("In this post we will...")
+OPENING_META = r'in this .+ (?:will|we)'
+REGISTRY.register(OPENING_META, re.IGNORECASE, 'detect_slop')
+
+# Phrase categories in reporting order
+PATTERN_CATEGORIES = [
+    ('high_risk', HIGH_RISK_PHRASES),
+    ('medium_risk', MEDIUM_RISK_PHRASES),
+    ('buzzwords', BUZZWORDS),
+    ('meta_commentary', META_COMMENTARY),
+    ('hedging', HEDGE_WORDS),
+]
+
+# Slop score points per finding; pattern packs may override or add categories
+CATEGORY_WEIGHTS = {
+    'high_risk': 15,
+    'medium_risk': 8,
+    'buzzwords': 5,
+    'meta_commentary': 10,
+    'hedging': 6,
+}
+STRUCTURE_WEIGHT = 20
+
+
+class PhraseMatcher:
+    """Matches every phrase category in a single scan of the document.
+
+    All patterns are folded into one regex: a lookahead gate that only stops
+    at offsets where some pattern matches, followed by one optional named
+    lookahead per pattern that records its span. The gate is factored by
+    leading character (a one-level trie) so most offsets are rejected after
+    a single comparison. Each hit is then mapped back to its line through a
+    sorted index of line start offsets.
+    
+    Patterns are registered at construction and compiled on the first
+    find(), so a run answered from the result cache never compiles them.
+    """
+
+    def __init__(self, categories: List[Tuple[str, List[str]]]):
+        self.categories = [name for name, _ in categories]
+        # (category, pattern index within category, pattern)
+        self.entries = []
+        for name, patterns in categories:
+            for idx, pattern in enumerate(patterns):
+                REGISTRY.register(pattern, re.IGNORECASE, 'detect_slop')
+                self.entries.append((name, idx, pattern))
+        
+        self.source = self._build_gate() + ''.join(
+            f'(?=(?P<p{i}>{p}))?' for i, (_, _, p) in enumerate(self.entries))
+        REGISTRY.register(self.source, re.IGNORECASE, 'detect_slop')
+        self._group_ids = None
+    
+    @property
+    def regex(self) -> re.Pattern:
+        return REGISTRY.get(self.source, re.IGNORECASE)
+    
+    @property
+    def group_ids(self) -> List[int]:
+        """Group number of each pattern's lookahead in the combined regex."""
+        if self._group_ids is None:
+            self._group_ids = [self.regex.groupindex[f'p{i}'] for i in range(len(self.entries))]
+        return self._group_ids
+
+    def _build_gate(self) -> str:
+        """Build the lookahead that accepts offsets where any pattern matches."""
+        by_head = defaultdict(list)
+        others = []
+        for _, _, pattern in self.entries:
+            head = self._literal_head(pattern)
+            if head:
+                by_head[head].append(pattern[1:])
+            else:
+                others.append(pattern)
+        
+        branches = [f'{re.escape(head)}(?:{"|".join(tails)})' for head, tails in by_head.items()]
+        branches.extend(f'(?:{p})' for p in others)
+        return f'(?=(?:{"|".join(branches)}))'
+
+    @staticmethod
+    def _literal_head(pattern: str) -> str:
+        """Return the pattern's leading literal character, if it can be factored out."""
+        if len(pattern) < 2 or not (pattern[0].isalnum() or pattern[0] in " '-"):
+            return ''
+        if pattern[1] in '?*+{':
+            return ''
+        # A top-level alternation would bind the head to its first branch only
+        depth = 0
+        escaped = False
+        for ch in pattern:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch in '([':
+                depth += 1
+            elif ch in ')]':
+                depth -= 1
+            elif ch == '|' and depth == 0:
+                return ''
+        return pattern[0].lower()
+
+    @staticmethod
+    def line_starts(text: str) -> array:
+        """Return the offset at which each line of text begins."""
+        starts = array('l', [0])
+        pos = text.find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = text.find('\n', pos + 1)
+        return starts
+
+    def find(self, text: str, lines: List[str]) -> 'FindingsStore':
+        """Return a store of every hit, ordered as a line-by-line scan would."""
+        store = FindingsStore(self.categories, text, lines, self.line_starts(text))
+        self.scan(store)
+        store.sort()
+        return store
+    
+    def scan(self, store: 'FindingsStore'):
+        """Add every hit in the store's text to it, unsorted."""
+        text, lines, starts = store.text, store.lines, store.starts
+        category_ids = {name: i for i, name in enumerate(store.categories)}
+        # Like re.finditer, a pattern may not match again inside its last hit
+        next_allowed = [0] * len(self.entries)
+        group_ids = self.group_ids
+        
+        for m in self.regex.finditer(text):
+            regs = m.regs
+            for i, group in enumerate(group_ids):
+                start, end = regs[group]
+                if start < 0 or start < next_allowed[i]:
+                    continue
+                category, idx, pattern = self.entries[i]
+                line_no = bisect_right(starts, start)
+                line = lines[line_no - 1]
+                line_start = starts[line_no - 1]
+                if end > line_start + len(line):
+                    # Crossed a newline; retry the pattern confined to its line
+                    local = REGISTRY.get(pattern, re.IGNORECASE).match(line, start - line_start)
+                    if not local:
+                        continue
+                    end = line_start + local.end()
+                next_allowed[i] = end if end > start else start + 1
+                store.add(category_ids[category], idx, line_no, start, end)
+
+
+class FindingsStore:
+    """Phrase hits held as parallel integer columns.
+    
+    Each row is one hit: category id, pattern index within the category,
+    line number, and start/end offsets into the text. The line text and the
+    matched string are sliced from the document only when a finding is
+    materialized for a report, so a line with several hits is not copied
+    once per hit.
+    """
+    
+    COLUMNS = [('category', 'B'), ('pattern', 'H'), ('line', 'l'), ('start', 'l'), ('end', 'l')]
+    
+    def __init__(self, categories: List[str], text: str, lines: List[str],
+                 starts: Optional[array] = None):
+        self.categories = categories
+        self.text = text
+        self.lines = lines
+        self._starts = starts
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode))
+        # Category name -> (first row, stop row), valid after sort()
+        self.bounds = {}
+    
+    @classmethod
+    def from_columns(cls, categories: List[str], text: str, lines: List[str],
+                     columns: Dict[str, List[int]]) -> 'FindingsStore':
+        """Rebuild a sorted store from to_columns() output (e.g. a cache entry)."""
+        store = cls(categories, text, lines)
+        for name, _ in cls.COLUMNS:
+            getattr(store, name).extend(columns[name])
+        store._index()
+        return store
+    
+    def to_columns(self) -> Dict[str, List[int]]:
+        """Return the columns as plain lists for JSON."""
+        return {name: getattr(self, name).tolist() for name, _ in self.COLUMNS}
+    
+    def __len__(self) -> int:
+        return len(self.line)
+    
+    @property
+    def starts(self) -> array:
+        """Offset at which each line begins (computed on first use)."""
+        if self._starts is None:
+            self._starts = PhraseMatcher.line_starts(self.text)
+        return self._starts
+    
+    def add(self, category_id: int, pattern_id: int, line_no: int, start: int, end: int):
+        """Append one hit; call sort() once all hits are added."""
+        self.category.append(category_id)
+        self.pattern.append(pattern_id)
+        self.line.append(line_no)
+        self.start.append(start)
+        self.end.append(end)
+    
+    def sort(self):
+        """Order rows by category, then line, pattern and position."""
+        category, line, pattern, start = self.category, self.line, self.pattern, self.start
+        order = sorted(range(len(self)), key=lambda r: (category[r], line[r], pattern[r], start[r]))
+        for name, typecode in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, array(typecode, [column[r] for r in order]))
+        self._index()
+    
+    def _index(self):
+        """Record the row range of each category (rows are grouped by category)."""
+        self.bounds = {}
+        first = 0
+        for category_id, name in enumerate(self.categories):
+            stop = bisect_right(self.category, category_id, first)
+            self.bounds[name] = (first, stop)
+            first = stop
+    
+    def rows(self, category: str) -> range:
+        """Row numbers holding the given category's hits."""
+        return range(*self.bounds.get(category, (0, 0)))
+    
+    def count(self, category: str) -> int:
+        return len(self.rows(category))
+    
+    def finding(self, row: int) -> Dict:
+        """Materialize one row in the dict form used by reports and JSON."""
+        line_no = self.line[row]
+        start = self.start[row]
+        return {
+            'line': line_no,
+            'text': self.lines[line_no - 1].strip(),
+            'match': self.text[start:self.end[row]],
+            'position': start - self.starts[line_no - 1]
+        }
+
+
+class CategoryFindings(Sequence):
+    """Read-only list view of one category's hits, materialized per access."""
+    
+    def __init__(self, store: FindingsStore, category: str):
+        self.store = store
+        self._rows = store.rows(category)
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.finding(row) for row in self._rows[index]]
+        return self.store.finding(self._rows[index])
+    
+    def __repr__(self) -> str:
+        return f'CategoryFindings({list(self)!r})'
+
+
+class FindingsView(Mapping):
+    """Dict-shaped view of a detector's findings: category -> list of finding dicts.
+    
+    Phrase categories are served lazily from a FindingsStore; 'structure'
+    holds the document-level issue dicts. to_dict() returns plain lists.
+    """
+    
+    def __init__(self, store: FindingsStore, structure: List[Dict]):
+        self.store = store
+        self.structure = structure
+        # Non-empty categories are listed first, as in the original dict output
+        names = store.categories + ['structure']
+        self._keys = sorted(names, key=lambda name: not len(self[name]))
+    
+    def __getitem__(self, category: str):
+        if category == 'structure':
+            return self.structure
+        if category not in self.store.categories:
+            raise KeyError(category)
+        return CategoryFindings(self.store, category)
+    
+    def __iter__(self):
+        return iter(self._keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def to_dict(self) -> Dict[str, List[Dict]]:
+        """Materialize every category as a list of finding dicts."""
+        return {category: list(items) for category, items in self.items()}
+
+
+MATCHER = PhraseMatcher(PATTERN_CATEGORIES)
+
+
+def category_weights(packs: List[PatternPack]) -> Dict[str, float]:
+    """Built-in category weights, overridden or extended by the packs in order.
+    
+    Raises ValueError if a pack adds a category without giving its weight.
+    """
+    weights = dict(CATEGORY_WEIGHTS)
+    for pack in packs:
+        for category, weight in pack.weights.items():
+            if weight is not None:
+                weights[category] = weight
+            elif category not in weights:
+                raise ValueError(f"pattern pack '{pack.name}': new category '{category}' needs a weight")
+    return weights
+
+
+# Name shown in reports for text that did not come from a file
+TEXT_LABEL = '<text>'
+
+
+def decode_text(text: Union[str, bytes]) -> str:
+    """Return text as str; bytes are decoded as UTF-8 with newlines translated like a file read."""
+    if isinstance(text, bytes):
+        return text.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
 class SlopDetector:
-    def __init__(self, filepath: str):
-        self.filepath = Path(filepath)
-        self.text = self._load_file()
+    def __init__(self, filepath: str = None, cache: Optional[ResultCache] = None,
+                 packs: Optional[List[PatternPack]] = None, language: str = 'en',
+                 profiler: Optional[Profiler] = None, text: Union[str, bytes, None] = None):
+        """packs: loaded pattern packs whose categories add to the built-in ones.
+        
+        language ('en', 'pt' or 'auto' to detect it) adds the bundled packs
+        for that language. With a profiler (see profiling.py), loading and
+        each analysis stage are measured and analyze() adds a 'timing' entry.
+        When text (str or UTF-8 bytes) is given, nothing is read from disk
+        and filepath only labels the reports.
+        """
+        if filepath is None and text is None:
+            raise ValueError("SlopDetector needs a filepath or a text")
+        self.filepath = Path(filepath if filepath is not None else TEXT_LABEL)
+        self.profiler = profiler
+        if text is None:
+            self.text = measure(profiler, 'load', self._load_file)
+        else:
+            self.text = measure(profiler, 'load', decode_text, text)
         self.lines = self.text.split('\n')
-        self.findings = defaultdict(list)
+        self.language = measure(profiler, 'language', resolve_language, language, self.text)
+        self.packs = language_packs(self.language, packs, PACKS_DIR)
+        self.weights = category_weights(self.packs)
+        self.categories = list(self.weights)
+        self.store = FindingsStore(self.categories, self.text, self.lines)
+        self.structure = []
+        self.cache = cache
+        self._results = None
         
+    @classmethod
+    def from_text(cls, text: Union[str, bytes], name: str = TEXT_LABEL, **options) -> 'SlopDetector':
+        """Detector for text already in memory; name stands in for the file name."""
+        return cls(name, text=text, **options)
+    
     def _load_file(self) -> str:
         """Load and return file contents."""
         with open(self.filepath, 'r', encoding='utf-8') as f:
             return f.read()
     
-    def _find_patterns(self, patterns: List[str], category: str):
-        """Find all occurrences of patterns in text."""
-        for i, line in enumerate(self.lines, 1):
-            for pattern in patterns:
-                matches = re.finditer(pattern, line, re.IGNORECASE)
-                for match in matches:
-                    self.findings[category].append({
-                        'line': i,
-                        'text': line.strip(),
-                        'match': match.group(),
-                        'position': match.start()
-                    })
+    @property
+    def findings(self) -> FindingsView:
+        """Findings by category, as lists of dicts materialized on access."""
+        return FindingsView(self.store, self.structure)
+    
+    def _find_patterns(self):
+        """Find all occurrences of the phrase categories in one pass (plus one per pack)."""
+        if not self.packs:
+            self.store = MATCHER.find(self.text, self.lines)
+            return
+        store = FindingsStore(self.categories, self.text, self.lines)
+        MATCHER.scan(store)
+        self._find_pack_phrases(store)
+        store.sort()
+        self.store = store
+    
+    def _find_pack_phrases(self, store: FindingsStore):
+        """Add pack phrase hits; their pattern ids follow the built-in patterns of each category."""
+        category_ids = {name: i for i, name in enumerate(self.categories)}
+        next_id = {name: len(patterns) for name, patterns in PATTERN_CATEGORIES}
+        starts = store.starts
+        for pack in self.packs:
+            bases = {category: next_id.get(category, 0) for category in pack.categories}
+            for phrase_id, start, end in pack.phrases.finditer(self.text):
+                category = pack.phrase_category[phrase_id]
+                store.add(category_ids[category], bases[category] + pack.phrase_rank[phrase_id],
+                          bisect_right(starts, start), start, end)
+            for category in pack.categories:
+                next_id[category] = bases[category] + pack.phrase_category.count(category)
     
     def analyze(self) -> Dict:
-        """Run all analyses and return findings."""
+        """Run all analyses and return findings.
+        
+        The result is computed once per detector (or taken from the cache when
+        one is set) and returned unchanged on later calls. Its 'findings' entry
+        is a FindingsView; use to_dict() for a JSON-serializable record.
+        """
+        if self._results is None:
+            if self.cache is not None:
+                # Cache entries hold the compact columns, not the finding dicts
+                empty = self.store
+                record = self.cache.fetch(self.text, self.cache_options(), self._record)
+                if self.store is empty:
+                    # Cache hit: nothing was analyzed, rebuild the store
+                    self.store = FindingsStore.from_columns(
+                        self.categories, self.text, self.lines, record['columns'])
+                    self.structure = record['structure']
+                score = record['score']
+            else:
+                score = self._analyze()
+            
+            self._results = {
+                'findings': self.findings,
+                'score': score,
+                'summary': self._generate_summary(score)
+            }
+            if self.profiler is not None:
+                self._results['timing'] = self.profiler.to_dict()
+        return self._results
+    
+    def cache_options(self) -> Dict:
+        """Options that change the result, for the cache key."""
+        return {'packs': [pack.digest for pack in self.packs]} if self.packs else {}
+    
+    def _analyze(self) -> int:
+        """Fill the findings and return the slop score."""
+        self.structure = []
+        
         # Find pattern categories
-        self._find_patterns(HIGH_RISK_PHRASES, 'high_risk')
-        self._find_patterns(MEDIUM_RISK_PHRASES, 'medium_risk')
-        self._find_patterns(BUZZWORDS, 'buzzwords')
-        self._find_patterns(META_COMMENTARY, 'meta_commentary')
-        self._find_patterns(HEDGE_WORDS, 'hedging')
+        measure(self.profiler, 'phrase_patterns', self._find_patterns)
         
         # Analyze document structure
-        self._analyze_structure()
+        measure(self.profiler, 'structure', self._analyze_structure)
         
         # Calculate overall score
-        score = self._calculate_slop_score()
-        
-        return {
-            'findings': dict(self.findings),
-            'score': score,
-            'summary': self._generate_summary(score)
-        }
+        return measure(self.profiler, 'score', self._calculate_slop_score)
+    
+    def _record(self) -> Dict:
+        """Analyze and return the compact, JSON-serializable form stored in the cache."""
+        score = self._analyze()
+        return {'columns': self.store.to_columns(), 'structure': self.structure, 'score': score}
     
     def _analyze_structure(self):
         """Analyze document-level structure for slop patterns."""
         # Check for meta-commentary in opening
         if len(self.lines) > 0:
             first_para = ' '.join(self.lines[:5])
-            if re.search(r'in this .+ (?:will|we)', first_para, re.IGNORECASE):
-                self.findings['structure'].append({
+            if REGISTRY.get(OPENING_META, re.IGNORECASE).search(first_para):
+                self.structure.append({
                     'issue': 'Opening meta-commentary',
                     'description': 'Document starts with meta-commentary instead of content'
                 })
@@ -141,14 +552,16 @@ class SlopDetector:
                       'nevertheless', 'consequently', 'therefore']
         
         for line in self.lines:
-            line = line.strip()
-            if line and any(line.lower().startswith(t) for t in transitions):
+            line = line.strip().lower()
+            if line and (any(line.startswith(t) for t in transitions) or
+                         any(pack.transitions.match_prefix(line) is not None for pack in self.packs)):
                 transition_starters += 1
         
-        if len(self.lines) > 0:
-            transition_ratio = transition_starters / len([l for l in self.lines if l.strip()])
+        non_empty_lines = len([l for l in self.lines if l.strip()])
+        if non_empty_lines > 0:
+            transition_ratio = transition_starters / non_empty_lines
             if transition_ratio > 0.3:
-                self.findings['structure'].append({
+                self.structure.append({
                     'issue': 'Excessive transitions',
                     'description': f'{transition_ratio:.0%} of paragraphs start with transition words'
                 })
@@ -158,12 +571,9 @@ class SlopDetector:
         score = 0
         
         # Weight different categories
-        score += len(self.findings['high_risk']) * 15
-        score += len(self.findings['medium_risk']) * 8
-        score += len(self.findings['buzzwords']) * 5
-        score += len(self.findings['meta_commentary']) * 10
-        score += len(self.findings['hedging']) * 6
-        score += len(self.findings['structure']) * 20
+        for category in self.categories:
+            score += self.store.count(category) * self.weights[category]
+        score += len(self.structure) * STRUCTURE_WEIGHT
         
         # Normalize by document length (per 1000 words)
         word_count = len(self.text.split())
@@ -183,6 +593,28 @@ class SlopDetector:
         else:
             return "💀 Severe slop detected - Document heavily relies on generic AI patterns"
     
+    def to_dict(self, findings: bool = True) -> Dict:
+        """Return the analysis as a JSON-serializable record.
+        
+        findings=False leaves out the finding dicts and keeps only the counts.
+        """
+        results = self.analyze()
+        record = {
+            'file': str(self.filepath),
+            'score': results['score'],
+            'summary': results['summary'],
+            'counts': {category: len(items) for category, items in results['findings'].items()}
+        }
+        if findings:
+            record['findings'] = results['findings'].to_dict()
+        if 'timing' in results:
+            record['timing'] = results['timing']
+        return record
+    
+    def to_json(self, indent: int = None) -> str:
+        """Return the analysis record as a JSON string."""
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+    
     def print_report(self, verbose: bool = False):
         """Print a formatted report of findings."""
         results = self.analyze()
@@ -239,6 +671,16 @@ class SlopDetector:
                     print(f"  Line {f['line']}: '{f['match']}'")
             print()
         
+        # Categories added by pattern packs
+        for category in self.categories[len(MATCHER.categories):]:
+            if findings[category]:
+                print(f"📦 {category.replace('_', ' ').upper()} ({len(findings[category])} found):")
+                for f in findings[category][:5 if not verbose else None]:
+                    print(f"  Line {f['line']}: '{f['match']}' in: {f['text'][:60]}...")
+                if len(findings[category]) > 5 and not verbose:
+                    print(f"  ... and {len(findings[category]) - 5} more")
+                print()
+        
         # Recommendations
         if results['score'] > 20:
             print("💡 RECOMMENDATIONS:")
@@ -255,22 +697,290 @@ class SlopDetector:
             print()
 
 
+# File types picked up when a directory is given in batch mode
+BATCH_EXTENSIONS = ['.md', '.txt', '.tex']
+
+
+def collect_files(inputs: List[str], extensions: List[str],
+                  missing: Optional[List[str]] = None) -> List[Path]:
+    """Expand files, directories and glob patterns into a sorted, de-duplicated list.
+    
+    Inputs that name no existing path (or globs that match nothing) are
+    appended to missing when it is given.
+    """
+    found = set()
+    for item in inputs:
+        if glob.has_magic(item):
+            candidates = [Path(p) for p in glob.glob(item, recursive=True)]
+        else:
+            candidates = [Path(item)]
+        if missing is not None and not any(c.exists() for c in candidates):
+            missing.append(item)
+        for candidate in candidates:
+            if candidate.is_dir():
+                found.update(p for p in candidate.rglob('*')
+                             if p.is_file() and p.suffix.lower() in extensions)
+            elif candidate.is_file():
+                found.add(candidate)
+    return sorted(found)
+
+
+def make_cache() -> ResultCache:
+    """Result cache for this tool, versioned by its source files (rules, packs and regexes)."""
+    here = Path(__file__).resolve().parent
+    version = ResultCache.source_version(here / 'detect_slop.py', here / 'pattern_packs.py',
+                                         here / 'pattern_registry.py')
+    return ResultCache('detect_slop', version)
+
+
+@lru_cache(maxsize=8)
+def _worker_packs(paths: Tuple[str, ...]) -> List[PatternPack]:
+    """Pattern packs loaded once per worker process."""
+    return load_packs(list(paths))
+
+
+def analyze_file(filepath: str, use_cache: bool = True, findings: bool = True,
+                 packs: Tuple[str, ...] = (), language: str = 'en') -> Dict:
+    """Analyze one file and return a JSON-serializable record (pool worker).
+    
+    With findings=False the record keeps only the per-category counts.
+    packs holds pattern pack paths (loaded once per worker); with
+    language='auto' each file's language is detected separately.
+    """
+    try:
+        detector = SlopDetector(filepath, cache=make_cache() if use_cache else None,
+                                packs=_worker_packs(tuple(packs)), language=language)
+        return detector.to_dict(findings=findings)
+    except (OSError, UnicodeDecodeError) as e:
+        return {'file': filepath, 'error': str(e)}
+
+
+def analyze_text(text: Union[str, bytes], name: str = TEXT_LABEL, findings: bool = True,
+                 **options) -> Dict:
+    """Analyze in-memory text and return the same record analyze_file() gives for a file.
+    
+    options go to SlopDetector (cache, packs, language, profiler).
+    """
+    return SlopDetector.from_text(text, name, **options).to_dict(findings=findings)
+
+
+def iter_batch(files: List[Path], workers: int = None, use_cache: bool = True,
+               findings: bool = True, packs: Tuple[str, ...] = (), language: str = 'en',
+               ordered: bool = True) -> Iterator[Dict]:
+    """Analyze files across a process pool, yielding each record as it is ready.
+    
+    ordered=True yields in input order (a record waits for the files before
+    it); ordered=False yields every record as soon as its file is done.
+    """
+    paths = [str(p) for p in files]
+    worker = partial(analyze_file, use_cache=use_cache, findings=findings, packs=tuple(packs),
+                     language=language)
+    if workers == 1 or len(paths) < 2:
+        for path in paths:
+            yield worker(path)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if ordered:
+            chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+            yield from pool.map(worker, paths, chunksize=chunksize)
+        else:
+            for future in as_completed([pool.submit(worker, path) for path in paths]):
+                yield future.result()
+
+
+def run_batch(files: List[Path], workers: int = None, use_cache: bool = True,
+              findings: bool = True, packs: Tuple[str, ...] = (), language: str = 'en') -> List[Dict]:
+    """Analyze files across a process pool; records come back in input order."""
+    return list(iter_batch(files, workers, use_cache, findings, packs, language))
+
+
+def format_batch_report(records: List[Dict]) -> str:
+    """Format an aggregate report over per-file batch records."""
+    categories = [name for name, _ in PATTERN_CATEGORIES] + ['structure']
+    analyzed = [r for r in records if 'error' not in r]
+    failed = [r for r in records if 'error' in r]
+    # Categories added by pattern packs, in first-seen order
+    for r in analyzed:
+        categories.extend(c for c in r['counts'] if c not in categories)
+    
+    report = []
+    report.append("=" * 70)
+    report.append(f"AI Slop Batch Report: {len(records)} file(s)")
+    report.append("=" * 70)
+    report.append("")
+    
+    for r in analyzed:
+        report.append(f"{r['score']:>4}/100  {r['file']}")
+    for r in failed:
+        report.append(f"   ERROR  {r['file']}: {r['error']}")
+    
+    if analyzed:
+        totals = {c: sum(r['counts'].get(c, 0) for r in analyzed) for c in categories}
+        mean_score = sum(r['score'] for r in analyzed) / len(analyzed)
+        flagged = [r for r in analyzed if r['score'] >= 40]
+        
+        report.append("")
+        report.append(f"Mean Slop Score: {mean_score:.1f}/100")
+        report.append(f"Files at High or Severe slop (>= 40): {len(flagged)}")
+        report.append("")
+        report.append("Findings by category:")
+        for category in categories:
+            report.append(f"  {category:<16} {totals[category]:>6}")
+    
+    report.append("")
+    return "\n".join(report)
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python detect_slop.py <file> [--verbose]")
-        print("Analyzes text files for AI-generated content patterns")
+    parser = argparse.ArgumentParser(
+        description='Analyzes text files for AI-generated content patterns',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python detect_slop.py article.md --verbose
+  python detect_slop.py article.md --json
+  python detect_slop.py data/output/markdown/ data/output/latex/
+  python detect_slop.py "profile/*.md" --workers 4 --jsonl results.jsonl
+  python detect_slop.py data/output/ --ndjson | jq .score
+  python detect_slop.py --files-from changed.txt
+  pandoc -t plain post.docx | python detect_slop.py --stdin --json
+  python detect_slop.py perfil.md --pack packs/pt-br.json
+  python detect_slop.py curriculo.tex --lang pt
+  python detect_slop.py article.md --timing
+  python detect_slop.py article.md --profile
+  python detect_slop.py --cache-stats
+        """
+    )
+    parser.add_argument('inputs', nargs='*', help='Files, directories or glob patterns')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show every finding')
+    parser.add_argument('--json', action='store_true', help='Print a single file\'s analysis as JSON')
+    parser.add_argument('--stdin', action='store_true',
+                        help='Analyze the text piped on stdin instead of files')
+    parser.add_argument('--files-from', metavar='LIST',
+                        help="Read additional paths from LIST, one per line ('-' for stdin)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for batch mode (default: CPU count)')
+    parser.add_argument('--jsonl', metavar='FILE',
+                        help="Write one JSON record per file to FILE ('-' for stdout), in path order")
+    parser.add_argument('--ndjson', action='store_true',
+                        help='Stream one JSON record per file to stdout as each file finishes (no report)')
+    parser.add_argument('--pack', action='append', default=[], metavar='FILE',
+                        help='Add phrases from a JSON/TOML pattern pack (repeatable)')
+    parser.add_argument('--lang', choices=('auto',) + LANGUAGES, default='auto',
+                        help='Text language; selects the bundled pattern packs (default: detect per file)')
+    parser.add_argument('--timing', action='store_true',
+                        help='Measure time, regex calls and allocations per stage (bypasses the cache)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Run under cProfile and print the busiest functions to stderr')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the on-disk result cache')
+    parser.add_argument('--cache-stats', action='store_true',
+                        help='Show result cache statistics and exit')
+    args = parser.parse_args()
+    
+    if args.cache_stats:
+        print(make_cache().format_stats())
+        return
+    
+    inputs = list(args.inputs)
+    if args.files_from:
+        source = sys.stdin if args.files_from == '-' else open(args.files_from, encoding='utf-8')
+        with source:
+            inputs.extend(line.strip() for line in source if line.strip())
+    
+    if args.stdin and (inputs or args.files_from or args.jsonl or args.ndjson):
+        parser.error('--stdin reads one text; it cannot be combined with files, --files-from, --jsonl or --ndjson')
+    if not inputs and not args.stdin:
+        parser.print_usage()
         sys.exit(1)
     
-    filepath = sys.argv[1]
-    verbose = '--verbose' in sys.argv or '-v' in sys.argv
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.ndjson and (args.json or args.jsonl or args.timing):
+        parser.error('--ndjson cannot be combined with --json, --jsonl or --timing')
     
-    if not Path(filepath).exists():
-        print(f"Error: File '{filepath}' not found")
+    try:
+        packs = load_packs(args.pack)
+        category_weights(packs)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load pattern pack: {e}", file=sys.stderr)
         sys.exit(1)
     
-    detector = SlopDetector(filepath)
-    detector.print_report(verbose=verbose)
+    # Piped text and a single plain file keep the detailed single-document report
+    if args.stdin or (len(inputs) == 1 and not args.jsonl and not args.ndjson
+                      and not glob.has_magic(inputs[0]) and not Path(inputs[0]).is_dir()):
+        profiler = Profiler() if args.timing else None
+        cache = None if args.no_cache or args.timing else make_cache()
+        options = dict(cache=cache, packs=packs, language=args.lang, profiler=profiler)
+        if args.stdin:
+            try:
+                detector = SlopDetector.from_text(sys.stdin.buffer.read(), '<stdin>', **options)
+            except UnicodeDecodeError as e:
+                print(f"Error: stdin is not valid UTF-8: {e}", file=sys.stderr)
+                sys.exit(1)
+        else:
+            filepath = inputs[0]
+            if not Path(filepath).exists():
+                print(f"Error: File '{filepath}' not found")
+                sys.exit(1)
+            detector = SlopDetector(filepath, **options)
+        if args.json:
+            print(detector.to_json(indent=2))
+        else:
+            detector.print_report(verbose=args.verbose)
+            if profiler is not None:
+                print(profiler.format_table())
+        return
+    
+    if args.timing:
+        parser.error('--timing analyzes a single file; use --profile for batch runs')
+    if args.json:
+        parser.error('--json prints a single document; use --jsonl - for one JSON record per file')
+    
+    missing = []
+    files = collect_files(inputs, BATCH_EXTENSIONS, missing)
+    for item in missing:
+        print(f"Error: File '{item}' not found", file=sys.stderr)
+    if not files:
+        print("Error: No matching files found")
+        sys.exit(1)
+    # Missing inputs are reported as error records too, so they show up in every output
+    missing_records = sorted(({'file': item, 'error': 'not found'} for item in missing),
+                             key=lambda record: Path(record['file']))
+    
+    # NDJSON: records leave in completion order, each flushed as soon as it is ready
+    if args.ndjson:
+        for record in missing_records:
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+        for record in iter_batch(files, workers=args.workers, use_cache=not args.no_cache,
+                                 packs=tuple(args.pack), language=args.lang, ordered=False):
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+        if missing:
+            sys.exit(1)
+        return
+    
+    # The aggregate report needs only counts; findings travel back for --jsonl
+    out = None
+    if args.jsonl:
+        out = sys.stdout if args.jsonl == '-' else open(args.jsonl, 'w', encoding='utf-8')
+    records = []
+    batch = iter_batch(files, workers=args.workers, use_cache=not args.no_cache,
+                       findings=bool(args.jsonl), packs=tuple(args.pack), language=args.lang)
+    # Both are sorted by path, so merging keeps --jsonl in path order
+    for record in heapq.merge(batch, missing_records, key=lambda record: Path(record['file'])):
+        records.append(record)
+        if out is not None:
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+    if out is not None and out is not sys.stdout:
+        out.close()
+    
+    if args.jsonl != '-':
+        print(format_batch_report(records))
+    if missing:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
-    main()
+    run_main(main)
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Pattern Packs: Phrase Lists Loaded from JSON or TOML Files
+
+A pack extends the built-in phrase lists without editing the scripts.
+Each tool reads the sections it knows and ignores the rest:
+
+    {
+      "name": "pt-br",
+      "language": "pt",
+      "categories": {                                   # detect_slop / clean_slop
+        "high_risk": {
+          "weight": 15,                                 # slop score points per hit
+          "phrases": ["é importante ressaltar que"],
+          "replacements": {"no mundo atual,": ""}       # clean_slop; keys are phrases too
+        }
+      },
+      "transitions": ["além disso"],                    # ai_detector: sentence openers
+      "abstract_phrases": ["diversos aspectos"],        # ai_detector: placeholder phrases
+      "academic_words": ["metodologia"]                 # text_analyzer: academic vocabulary
+    }
+
+The same structure can be written as TOML (Python 3.11+). Phrases are
+literal text, matched case-insensitively as whole words; spaces in a
+phrase match any run of spaces or tabs. Where phrases overlap, the
+longest one starting leftmost wins.
+
+Every phrase list is compiled into a PhraseIndex: the phrases are folded
+into a character trie, and the trie is written out as one regular
+expression that branches one character at a time. The regex engine walks
+that trie in C, so matching cost depends on the length of the phrases,
+not on how many there are. The built pack (phrase tables and regex
+sources) is stored in marshal format in the shared cache directory under
+the hash of the pack file, so packs are parsed and rebuilt only when the
+file changes.
+
+Packs also carry per-language phrase lists. detect_language() tells
+English from Portuguese by counting common function words in the first
+few kilobytes of a text (one regex pass, well under a millisecond), and
+language_packs() adds the packs bundled in a skill's packs/ directory
+for that language.
+
+The same module ships with the anti-slop and humanize-academic-writing
+skills; keep the two copies identical
+(tests/test_shared_modules.py fails when they differ). Either copy may be
+the one imported (the daemon puts both scripts directories on sys.path),
+so each tool passes its own skill's packs directory to language_packs()
+instead of relying on this file's location.
+"""
+
+import os
+import re
+import json
+import marshal
+import hashlib
+import tempfile
+from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+from pattern_registry import REGISTRY
+from result_cache import DEFAULT_CACHE_DIR
+
+
+# Bump when the built index layout or the regex construction changes
+INDEX_FORMAT = 1
+
+# Longest phrase accepted; the trie regex nests one group per character
+MAX_PHRASE_LENGTH = 200
+
+# Packs shipped with the skill this copy belongs to (scripts/../packs);
+# tools pass their own skill's directory instead, see language_packs()
+BUNDLED_PACKS_DIR = Path(__file__).resolve().parent.parent / 'packs'
+
+# Supported languages; the first is the default
+LANGUAGES = ('en', 'pt')
+
+# Characters of a text sampled by detect_language()
+DETECT_SAMPLE = 4096
+
+# Frequent function words that do not occur in the other language
+STOPWORDS = {
+    'en': ['the', 'and', 'of', 'to', 'is', 'are', 'was', 'were', 'that', 'this', 'with', 'for',
+           'it', 'be', 'by', 'on', 'have', 'has', 'from', 'which', 'not', 'we', 'they', 'will'],
+    'pt': ['de', 'que', 'não', 'uma', 'um', 'para', 'com', 'os', 'da', 'dos', 'das', 'na', 'nas',
+           'em', 'é', 'são', 'pelo', 'pela', 'também', 'está', 'foi', 'ao', 'mais', 'como', 'ou',
+           'seu', 'sua', 'mas', 'já'],
+}
+_STOPWORD_LANGUAGE = {word: language for language, words in STOPWORDS.items() for word in words}
+_STOPWORD_SOURCE = '(?<!\\w)(?:' + '|'.join(sorted(_STOPWORD_LANGUAGE, key=len, reverse=True)) + ')(?!\\w)'
+REGISTRY.register(_STOPWORD_SOURCE, 0, 'pattern_packs')
+
+_WHITESPACE = REGISTRY.get(r'\s+', owner='pattern_packs')
+
+
+def normalize_phrase(phrase: str) -> str:
+    """Lowercase a phrase and collapse its whitespace, as matches are looked up."""
+    return _WHITESPACE.sub(' ', phrase.strip().lower())
+
+
+def _trie_source(phrases: List[str]) -> str:
+    """Write a set of phrases as one trie-shaped regex (no boundaries)."""
+    root = {}
+    for phrase in phrases:
+        node = root
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    return _node_source(root)
+
+
+def _node_source(node: Dict) -> str:
+    """Emit the alternation for one trie node; ends of phrases make it optional."""
+    branches = []
+    for ch in sorted(key for key in node if key):
+        atom = '[ \\t]+' if ch == ' ' else re.escape(ch)
+        branches.append(atom + _node_source(node[ch]))
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else f'(?:{"|".join(branches)})'
+    if '' in node:
+        # Greedy, so the longer phrase is tried first
+        return f'(?:{body})?'
+    return body
+
+
+class PhraseIndex:
+    """A list of phrases compiled into one trie-shaped, case-insensitive regex."""
+
+    def __init__(self, phrases: List[str], source: Optional[str] = None):
+        """phrases must already be normalized; a phrase's id is its position."""
+        self.phrases = phrases
+        self.ids = {phrase: i for i, phrase in enumerate(phrases)}
+        if source is None:
+            source = f'(?<!\\w)(?:{_trie_source(phrases)})(?!\\w)' if phrases else ''
+        self.source = source
+        if source:
+            REGISTRY.register(source, re.IGNORECASE, 'pattern_packs')
+
+    @property
+    def regex(self) -> Optional[re.Pattern]:
+        return REGISTRY.get(self.source, re.IGNORECASE) if self.source else None
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[Tuple[int, int, int]]:
+        """Yield (phrase id, start, end) for each leftmost-longest, non-overlapping hit."""
+        if not self.source:
+            return
+        ids = self.ids
+        for m in self.regex.finditer(text, pos):
+            phrase_id = ids.get(normalize_phrase(m.group()))
+            if phrase_id is not None:
+                yield phrase_id, m.start(), m.end()
+
+    def match_prefix(self, text: str) -> Optional[int]:
+        """Id of the longest phrase that text starts with, or None."""
+        if not self.source:
+            return None
+        m = self.regex.match(text)
+        return self.ids.get(normalize_phrase(m.group())) if m else None
+
+    def replace(self, text: str, replacements: Dict[int, str]) -> Tuple[str, Dict[int, int]]:
+        """Substitute every hit whose phrase has a replacement; returns (text, hits per phrase id)."""
+        counts = {}
+        if not self.source or not replacements:
+            return text, counts
+        ids = self.ids
+
+        def substitute(m):
+            phrase_id = ids.get(normalize_phrase(m.group()))
+            if phrase_id not in replacements:
+                return m.group()
+            counts[phrase_id] = counts.get(phrase_id, 0) + 1
+            return replacements[phrase_id]
+
+        return self.regex.sub(substitute, text), counts
+
+    def counts(self, text: str) -> Dict[int, int]:
+        """Hits per phrase id."""
+        counts = {}
+        for phrase_id, _, _ in self.finditer(text):
+            counts[phrase_id] = counts.get(phrase_id, 0) + 1
+        return counts
+
+
+class PatternPack:
+    """A loaded pack: phrase tables plus their compiled indexes."""
+
+    def __init__(self, data: Dict, path: str = ''):
+        """Build from the plain dict produced by build_pack() (or read from the index cache)."""
+        self.path = path
+        self.name = data['name']
+        self.language = data['language']
+        self.digest = data['digest']
+        # Category name -> weight (None keeps the tool's built-in weight)
+        self.weights = dict(data['weights'])
+        self.categories = list(self.weights)
+        # Per phrase id: (category, rank within the category)
+        self.phrase_category = data['phrase_category']
+        self.phrase_rank = data['phrase_rank']
+        self.replacements = data['replacements']
+        self.phrases = PhraseIndex(data['phrases'], data['phrases_source'])
+        self.transitions = PhraseIndex(data['transitions'], data['transitions_source'])
+        self.abstract_phrases = PhraseIndex(data['abstract_phrases'], data['abstract_source'])
+        self.academic_words = frozenset(data['academic_words'])
+
+    def __repr__(self) -> str:
+        return f'PatternPack({self.name!r}, {len(self.phrases.phrases)} phrases)'
+
+
+def _phrase_list(value, where: str) -> List[str]:
+    """Validate and normalize a list of phrases, dropping duplicates."""
+    if not isinstance(value, list) or not all(isinstance(p, str) for p in value):
+        raise ValueError(f"{where} must be a list of strings")
+    phrases = []
+    seen = set()
+    for phrase in value:
+        normalized = normalize_phrase(phrase)
+        if not normalized:
+            raise ValueError(f"{where} contains an empty phrase")
+        if len(normalized) > MAX_PHRASE_LENGTH:
+            raise ValueError(f"{where}: phrase longer than {MAX_PHRASE_LENGTH} characters")
+        if normalized not in seen:
+            seen.add(normalized)
+            phrases.append(normalized)
+    return phrases
+
+
+def build_pack(raw: Dict, digest: str, default_name: str = 'pack') -> Dict:
+    """Validate a parsed pack file and build its index tables (plain types only)."""
+    if not isinstance(raw, dict):
+        raise ValueError("a pattern pack must be an object/table at the top level")
+    categories = raw.get('categories', {})
+    if not isinstance(categories, dict):
+        raise ValueError("'categories' must map category names to tables")
+
+    weights = {}
+    phrases, phrase_category, phrase_rank = [], [], []
+    replacements = {}
+    seen = {}
+    for category, spec in categories.items():
+        if not isinstance(spec, dict):
+            raise ValueError(f"category '{category}' must be a table")
+        weight = spec.get('weight')
+        if weight is not None and (not isinstance(weight, (int, float)) or weight < 0):
+            raise ValueError(f"category '{category}': weight must be a non-negative number")
+        weights[category] = weight
+        replace = spec.get('replacements', {})
+        if not isinstance(replace, dict) or not all(isinstance(v, str) for v in replace.values()):
+            raise ValueError(f"category '{category}': replacements must map phrases to strings")
+        listed = _phrase_list(spec.get('phrases', []), f"category '{category}' phrases")
+        listed_set = set(listed)
+        listed += [p for p in _phrase_list(list(replace), f"category '{category}' replacements")
+                   if p not in listed_set]
+        replace = {normalize_phrase(k): v for k, v in replace.items()}
+        for rank, phrase in enumerate(listed):
+            if phrase in seen:
+                raise ValueError(f"phrase '{phrase}' is listed in both '{seen[phrase]}' and '{category}'")
+            seen[phrase] = category
+            if phrase in replace:
+                replacements[len(phrases)] = replace[phrase]
+            phrases.append(phrase)
+            phrase_category.append(category)
+            phrase_rank.append(rank)
+
+    transitions = _phrase_list(raw.get('transitions', []), "'transitions'")
+    abstract = _phrase_list(raw.get('abstract_phrases', []), "'abstract_phrases'")
+    academic = raw.get('academic_words', [])
+    if not isinstance(academic, list) or not all(isinstance(w, str) for w in academic):
+        raise ValueError("'academic_words' must be a list of strings")
+
+    return {
+        'format': INDEX_FORMAT,
+        'name': str(raw.get('name', default_name)),
+        'language': str(raw.get('language', '')),
+        'digest': digest,
+        'weights': list(weights.items()),
+        'phrases': phrases,
+        'phrase_category': phrase_category,
+        'phrase_rank': phrase_rank,
+        'replacements': replacements,
+        'phrases_source': PhraseIndex(phrases).source,
+        'transitions': transitions,
+        'transitions_source': PhraseIndex(transitions).source,
+        'abstract_phrases': abstract,
+        'abstract_source': PhraseIndex(abstract).source,
+        'academic_words': sorted({w.strip().lower() for w in academic if w.strip()}),
+    }
+
+
+def _parse(path: Path, content: bytes) -> Dict:
+    """Parse pack file content as JSON or TOML, by extension."""
+    if path.suffix.lower() == '.toml':
+        if tomllib is None:
+            raise ValueError("TOML pattern packs need Python 3.11+ (tomllib); use JSON instead")
+        try:
+            return tomllib.loads(content.decode('utf-8'))
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"invalid TOML in pattern pack '{path}': {e}")
+    try:
+        return json.loads(content.decode('utf-8'))
+    except ValueError as e:
+        raise ValueError(f"invalid JSON in pattern pack '{path}': {e}")
+
+
+def load_pack(path: Union[str, Path], cache_dir: Union[str, Path] = None) -> PatternPack:
+    """Load a pack, reusing its built index from the cache while the file is unchanged.
+
+    Raises OSError if the file cannot be read and ValueError if it is not a
+    valid pack.
+    """
+    path = Path(path)
+    content = path.read_bytes()
+    digest = hashlib.sha256(f'{INDEX_FORMAT}\0'.encode() + content).hexdigest()[:16]
+    index_path = Path(cache_dir or DEFAULT_CACHE_DIR) / 'packs' / f'{digest}.idx'
+
+    try:
+        data = marshal.loads(index_path.read_bytes())
+        if data.get('format') == INDEX_FORMAT and data.get('digest') == digest:
+            return PatternPack(data, str(path))
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+
+    data = build_pack(_parse(path, content), digest, default_name=path.stem)
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=index_path.parent, suffix='.tmp')
+    except OSError:
+        # An unwritable cache only costs a rebuild next time
+        return PatternPack(data, str(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(marshal.dumps(data))
+        os.replace(tmp, index_path)
+    except OSError:
+        # Nothing else removes a partial temp file
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+    return PatternPack(data, str(path))
+
+
+def load_packs(paths: Optional[List[Union[str, Path]]]) -> List[PatternPack]:
+    """Load several packs, in order (later packs override earlier category weights)."""
+    return [load_pack(p) for p in paths or []]
+
+
+def normalize_language(language: str) -> str:
+    """'pt-BR', 'pt_br' and 'PT' all become 'pt'."""
+    return language.strip().lower().replace('_', '-').split('-')[0]
+
+
+def detect_language(text: str, sample: int = DETECT_SAMPLE) -> str:
+    """Guess the language of text from the function words in its first sample characters.
+
+    Returns the first entry of LANGUAGES when there is no clear majority.
+    """
+    hits = dict.fromkeys(LANGUAGES, 0)
+    for word in REGISTRY.get(_STOPWORD_SOURCE).findall(text[:sample].lower()):
+        hits[_STOPWORD_LANGUAGE[word]] += 1
+    best = max(LANGUAGES, key=lambda language: hits[language])
+    return best if hits[best] > hits[LANGUAGES[0]] else LANGUAGES[0]
+
+
+def resolve_language(language: Optional[str], text: str = '') -> str:
+    """Turn a language option ('auto', None, 'pt-BR', ...) into a supported code.
+
+    Raises ValueError for a language with no tokenization rules.
+    """
+    if not language or language == 'auto':
+        return detect_language(text)
+    code = normalize_language(language)
+    if code not in LANGUAGES:
+        raise ValueError(f"unsupported language '{language}' (supported: {', '.join(LANGUAGES)})")
+    return code
+
+
+@lru_cache(maxsize=None)
+def bundled_packs(language: str, packs_dir: Path = BUNDLED_PACKS_DIR) -> Tuple[PatternPack, ...]:
+    """Packs in packs_dir written for language, in file name order (loaded once per process)."""
+    if not packs_dir.is_dir():
+        return ()
+    found = []
+    for path in sorted(packs_dir.iterdir()):
+        if path.suffix.lower() in ('.json', '.toml') and normalize_language(path.stem) == language:
+            pack = load_pack(path)
+            if normalize_language(pack.language or path.stem) == language:
+                found.append(pack)
+    return tuple(found)
+
+
+def language_packs(language: str, packs: Optional[List[PatternPack]] = None,
+                   packs_dir: Union[str, Path] = BUNDLED_PACKS_DIR) -> List[PatternPack]:
+    """packs plus the packs in packs_dir for language, unless packs already cover that language.
+
+    packs_dir should be the calling skill's packs/ directory: the two
+    skills bundle different packs for the same language.
+    """
+    packs = list(packs or [])
+    if any(normalize_language(pack.language) == language for pack in packs if pack.language):
+        return packs
+    return list(bundled_packs(language, Path(packs_dir).resolve())) + packs
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Shared Registry of Compiled Regular Expressions
+
+Every pattern the analysis and cleanup scripts use is compiled through one
+registry instead of being handed to re.search/re.sub/re.findall as a
+string. The re module keeps only a small internal cache and clears it when
+it fills up, so scripts with hundreds of distinct patterns can end up
+recompiling them inside loops. Here each (pattern, flags) pair is compiled
+once per process, either on first use or all at once with warm(), and
+the patterns are shared by every stage and script loaded in the process
+(the text tools daemon loads both skills).
+
+Compile time is recorded per pattern; stats() and format_stats() report
+the startup cost.
+
+The same module ships with the anti-slop and humanize-academic-writing
+skills; keep the two copies identical (tests/test_shared_modules.py fails
+when they differ).
+"""
+
+import re
+import time
+from typing import Dict, Tuple
+
+
+class PatternRegistry:
+    """Compiles each (pattern, flags) pair at most once and records the cost."""
+
+    def __init__(self):
+        # (pattern, flags) -> owner label, in registration order
+        self.owners: Dict[Tuple[str, int], str] = {}
+        self.compiled: Dict[Tuple[str, int], re.Pattern] = {}
+        self.compile_seconds: Dict[Tuple[str, int], float] = {}
+
+    def register(self, pattern: str, flags: int = 0, owner: str = '') -> Tuple[str, int]:
+        """Declare a pattern without compiling it; returns its registry key."""
+        key = (pattern, flags)
+        if key not in self.owners or not self.owners[key]:
+            self.owners[key] = owner
+        return key
+
+    def get(self, pattern: str, flags: int = 0, owner: str = '') -> re.Pattern:
+        """Return the compiled pattern, compiling (and registering) it on first use."""
+        key = (pattern, flags)
+        compiled = self.compiled.get(key)
+        if compiled is None:
+            self.register(pattern, flags, owner)
+            start = time.perf_counter()
+            compiled = re.compile(pattern, flags)
+            self.compile_seconds[key] = time.perf_counter() - start
+            self.compiled[key] = compiled
+        return compiled
+
+    def warm(self) -> float:
+        """Compile every registered pattern now; returns the seconds spent.
+
+        Long-running processes (the text tools daemon) call this at startup
+        so no request pays for compilation.
+        """
+        start = time.perf_counter()
+        for pattern, flags in list(self.owners):
+            self.get(pattern, flags)
+        return time.perf_counter() - start
+
+    def stats(self) -> Dict:
+        """Registered and compiled counts plus compile time, overall and per owner."""
+        by_owner = {}
+        for key, owner in self.owners.items():
+            entry = by_owner.setdefault(owner or 'other', {'patterns': 0, 'compiled': 0, 'compile_ms': 0.0})
+            entry['patterns'] += 1
+            if key in self.compiled:
+                entry['compiled'] += 1
+                entry['compile_ms'] += self.compile_seconds[key] * 1000
+        for entry in by_owner.values():
+            entry['compile_ms'] = round(entry['compile_ms'], 3)
+        slowest = sorted(self.compile_seconds.items(), key=lambda item: item[1], reverse=True)[:5]
+        return {
+            'patterns': len(self.owners),
+            'compiled': len(self.compiled),
+            'compile_ms': round(sum(self.compile_seconds.values()) * 1000, 3),
+            'by_owner': by_owner,
+            'slowest': [{'pattern': _preview(pattern), 'flags': flags, 'owner': self.owners[(pattern, flags)],
+                         'compile_ms': round(seconds * 1000, 3)}
+                        for (pattern, flags), seconds in slowest],
+        }
+
+    def format_stats(self) -> str:
+        """Format stats() as a short report."""
+        s = self.stats()
+        lines = [
+            f"Patterns: {s['patterns']} registered, {s['compiled']} compiled",
+            f"Compile time: {s['compile_ms']:.2f} ms",
+        ]
+        for owner, entry in s['by_owner'].items():
+            lines.append(f"  {owner:<16} {entry['compiled']:>4}/{entry['patterns']:<4} {entry['compile_ms']:>8.2f} ms")
+        if s['slowest']:
+            lines.append("Slowest:")
+            for entry in s['slowest']:
+                lines.append(f"  {entry['compile_ms']:>8.2f} ms  {entry['pattern']}")
+        return "\n".join(lines)
+
+
+def _preview(pattern: str, width: int = 50) -> str:
+    """Shorten a pattern for display."""
+    return pattern if len(pattern) <= width else pattern[:width - 3] + '...'
+
+
+# The process-wide registry every script draws from
+REGISTRY = PatternRegistry()
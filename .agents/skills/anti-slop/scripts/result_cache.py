@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+On-Disk Result Cache for the Text Analysis Scripts
+
+Stores analysis results keyed by a hash of the text content, the tool's
+source version and the options that affect the result. Unchanged inputs
+return instantly on later runs. The cache is bounded by entry count and
+total size, evicting least recently used entries first.
+
+The same module ships with the anti-slop and humanize-academic-writing
+skills so each skill stays self-contained; keep the two copies identical
+(tests/test_shared_modules.py fails when they differ).
+Both default to the same cache directory, so statistics cover every tool.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    'TEXT_ANALYSIS_CACHE',
+    Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'text-analysis'
+))
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Compact the append-only hit/miss log once it grows past this size
+STATS_LOG_LIMIT = 256 * 1024
+
+# Eviction trims the cache to this fraction of its bounds, so the next full
+# scan is only needed after roughly a tenth of max_entries more puts
+EVICT_LOW_WATER = 0.9
+
+# Entry count and bytes per cache directory, as of this process's last scan
+# plus the entries it has written since. Other processes writing to the same
+# directory are only seen at the next scan.
+_usage: Dict[Path, List[int]] = {}
+
+
+class ResultCache:
+    """Content-addressed, size-bounded LRU cache of analysis results."""
+
+    def __init__(self, tool: str, version: str, directory: Union[str, Path] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.tool = tool
+        self.version = version
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def source_version(*paths: Union[str, Path]) -> str:
+        """Derive a tool version from its source files, so edits invalidate entries."""
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(Path(path).read_bytes())
+        return digest.hexdigest()[:16]
+
+    def key(self, content: Union[str, Iterable[str]], options: Dict = None) -> str:
+        """Hash text (or an iterable of text chunks) together with tool, version and options."""
+        digest = hashlib.sha256()
+        header = json.dumps([self.tool, self.version, options or {}], sort_keys=True)
+        digest.update(header.encode('utf-8'))
+        digest.update(b'\0')
+        chunks = [content] if isinstance(content, str) else content
+        for chunk in chunks:
+            digest.update(chunk.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / 'entries' / key[:2] / f'{key}.json'
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            self._record('m')
+            return None
+        self._record('h')
+        return result
+
+    def put(self, key: str, result: Dict):
+        """Store a result and evict old entries if the cache is over its bounds."""
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        except OSError:
+            # A read-only or full cache directory must never break analysis
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+                size = f.tell()
+            os.replace(tmp, path)
+        except BaseException as error:
+            # Eviction only sees *.json entries, so a left-over temp file would stay forever
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            if isinstance(error, OSError):
+                return
+            raise
+        usage = _usage.get(self.directory)
+        if usage is None:
+            self._evict()
+            return
+        # Overwriting an existing entry overcounts, which only brings the next scan forward
+        usage[0] += 1
+        usage[1] += size
+        if usage[0] > self.max_entries or usage[1] > self.max_bytes:
+            self._evict()
+
+    def fetch(self, content: Union[str, Iterable[str]], options: Dict,
+              compute: Callable[[], Dict]) -> Dict:
+        """Return the cached result for content, computing and storing it on a miss.
+        
+        A computed result is round-tripped through JSON before it is returned,
+        so a miss has the same shape as a later hit (lists instead of tuples,
+        string keys instead of integer ones).
+        """
+        key = self.key(content, options)
+        result = self.get(key)
+        if result is None:
+            result = json.loads(json.dumps(compute(), ensure_ascii=False))
+            self.put(key, result)
+        return result
+
+    def _entries(self):
+        """Yield (mtime, size, path) for every stored entry."""
+        root = self.directory / 'entries'
+        if not root.is_dir():
+            return
+        for path in root.glob('*/*.json'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            yield st.st_mtime, st.st_size, path
+
+    def _evict(self):
+        """Scan the entries and, when over either bound, drop least recently used ones.
+        
+        Entries are dropped until the cache is within EVICT_LOW_WATER of both
+        bounds. put() only calls this when its running usage estimate for the
+        directory crosses a bound, so puts cost O(1) amortized instead of a
+        scan each.
+        """
+        entries = sorted(self._entries())
+        count = len(entries)
+        total = sum(size for _, size, _ in entries)
+        if count > self.max_entries or total > self.max_bytes:
+            max_count = max(1, int(self.max_entries * EVICT_LOW_WATER))
+            max_total = int(self.max_bytes * EVICT_LOW_WATER)
+            for _, size, path in entries:
+                if count <= max_count and total <= max_total:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                count -= 1
+                total -= size
+        _usage[self.directory] = [count, total]
+
+    def _record(self, event: str):
+        """Append a hit ('h') or miss ('m') for this tool to the stats log."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Small O_APPEND writes are atomic, so concurrent workers don't clash
+            fd = os.open(self.directory / 'stats.log', os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, f'{self.tool} {event}\n'.encode('utf-8'))
+            finally:
+                os.close(fd)
+            if os.path.getsize(self.directory / 'stats.log') > STATS_LOG_LIMIT:
+                self._compact_stats()
+        except OSError:
+            pass
+
+    def _read_stats(self) -> Dict[str, Dict[str, int]]:
+        """Merge compacted counters with the pending log."""
+        counters = {}
+        try:
+            with open(self.directory / 'stats.json', 'r', encoding='utf-8') as f:
+                counters = json.load(f)
+        except (OSError, ValueError):
+            pass
+        try:
+            with open(self.directory / 'stats.log', 'r', encoding='utf-8') as f:
+                for line in f:
+                    tool, _, event = line.strip().rpartition(' ')
+                    if tool and event in ('h', 'm'):
+                        tool_counts = counters.setdefault(tool, {'hits': 0, 'misses': 0})
+                        tool_counts['hits' if event == 'h' else 'misses'] += 1
+        except OSError:
+            pass
+        return counters
+
+    def _compact_stats(self):
+        """Fold the stats log into stats.json and start a new log."""
+        counters = self._read_stats()
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(counters, f)
+        os.replace(tmp, self.directory / 'stats.json')
+        # Events appended between the read and this truncation are dropped;
+        # the counters are advisory, so that is acceptable
+        os.truncate(self.directory / 'stats.log', 0)
+
+    def stats(self) -> Dict:
+        """Return entry count, size and per-tool hit rates for the cache directory."""
+        entries = list(self._entries())
+        counters = self._read_stats()
+        tools = {}
+        for tool, counts in sorted(counters.items()):
+            lookups = counts['hits'] + counts['misses']
+            tools[tool] = dict(counts, hit_rate=round(counts['hits'] / lookups, 3) if lookups else 0)
+        hits = sum(c['hits'] for c in counters.values())
+        lookups = hits + sum(c['misses'] for c in counters.values())
+        return {
+            'directory': str(self.directory),
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': hits,
+            'misses': lookups - hits,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0,
+            'tools': tools
+        }
+
+    def format_stats(self) -> str:
+        """Format cache statistics as a readable report."""
+        s = self.stats()
+        report = []
+        report.append("=" * 70)
+        report.append("ANALYSIS RESULT CACHE")
+        report.append("=" * 70)
+        report.append(f"Directory: {s['directory']}")
+        report.append(f"Entries: {s['entries']} / {s['max_entries']}")
+        report.append(f"Size: {s['bytes'] / 1024:.1f} KiB / {s['max_bytes'] / 1024:.0f} KiB")
+        report.append(f"Hit Rate: {s['hit_rate']:.1%} ({s['hits']} hits, {s['misses']} misses)")
+        if s['tools']:
+            report.append("")
+            report.append(f"{'Tool':<20} {'Hits':>10} {'Misses':>10} {'Hit Rate':>10}")
+            for tool, c in s['tools'].items():
+                report.append(f"{tool:<20} {c['hits']:>10} {c['misses']:>10} {c['hit_rate']:>10.1%}")
+        report.append("=" * 70)
+        return "\n".join(report)
@@ -10,14 +10,139 @@ Detects common patterns that indicate AI-generated academic writing:
 - Mechanical paragraph patterns
 """
 
-import re
 import sys
 import json
+import math
+import zlib
+import random
 import argparse
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import Counter
-from typing import List, Dict, Tuple
+from itertools import accumulate
+from fractions import Fraction
+from pathlib import Path
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional, TextIO, Union
 import statistics
 
+from tokenization import (
+    TokenizedDocument, SENTENCE_SPLIT, PARAGRAPH_SENTENCE_SPLIT, WORD_PATTERN, PASSIVE_PATTERNS
+)
+from pattern_registry import REGISTRY
+from profiling import Profiler, measure, run_main
+from result_cache import ResultCache
+from pattern_packs import (
+    DETECT_SAMPLE, LANGUAGES, PatternPack, load_packs, language_packs, resolve_language
+)
+from lexical_diversity import DIVERSITY_MEASURES, MATTR_WINDOW, mattr, mtld
+
+# This skill's bundled pattern packs (pattern_packs.language_packs)
+PACKS_DIR = Path(__file__).resolve().parent.parent / 'packs'
+
+# Sentences per heatmap window (--window)
+WINDOW_SENTENCES = 10
+
+# (low, moderate) bounds of each vocabulary diversity measure: below the
+# first is low diversity, below the second moderate
+DIVERSITY_BANDS = {
+    'ttr': (0.40, 0.50),
+    'mattr': (0.70, 0.78),
+    'mtld': (50, 72),
+}
+
+
+def _diversity_ladder(measure: str) -> Tuple:
+    """Score ladder of a vocabulary diversity measure, from its DIVERSITY_BANDS."""
+    low, moderate = DIVERSITY_BANDS[measure]
+    return ('<', [(low, 0.8, 'low_diversity'), (moderate, 0.5, 'moderate_diversity')], (0.2, 'good_diversity'))
+
+
+# Score ladder of each metric: (comparison, steps, fallback). The first
+# step whose bound the value passes ('<' or '>') gives the score and
+# issue; the fallback applies when none does. batch_scoring.py builds its
+# array path from the same table.
+METRIC_LADDERS = {
+    'sentence_uniformity': ('<', [(0.25, 0.8, 'high_uniformity'),
+                                  (0.35, 0.5, 'moderate_uniformity')], (0.1, 'good_variation')),
+    'transition_overuse': ('>', [(25, 0.9, 'excessive_transitions'),
+                                 (15, 0.6, 'high_transitions'),
+                                 (8, 0.3, 'moderate_transitions')], (0.1, 'appropriate_transitions')),
+    'abstract_language': ('>', [(2.0, 0.9, 'excessive_abstraction'),
+                                (1.0, 0.6, 'high_abstraction'),
+                                (0.5, 0.3, 'moderate_abstraction')], (0.1, 'appropriate_specificity')),
+    'vocabulary_diversity': _diversity_ladder('ttr'),
+    'vocabulary_mattr': _diversity_ladder('mattr'),
+    'vocabulary_mtld': _diversity_ladder('mtld'),
+    'passive_voice': ('>', [(50, 0.7, 'excessive_passive'),
+                            (35, 0.5, 'high_passive'),
+                            (20, 0.2, 'moderate_passive')], (0.1, 'appropriate_voice_mix')),
+    'paragraph_patterns': ('>', [(0.3, 0.7, 'repetitive_openings'),
+                                 (0.15, 0.4, 'some_repetition')], (0.1, 'varied_openings')),
+}
+
+# Weight of each metric in the overall score
+METRIC_WEIGHTS = {
+    'sentence_uniformity': 0.25,
+    'transition_overuse': 0.20,
+    'abstract_language': 0.20,
+    'vocabulary_diversity': 0.15,
+    'passive_voice': 0.10,
+    'paragraph_patterns': 0.10
+}
+
+# Fewest sentences (uniformity), words (diversity) or paragraphs
+# (openings) a metric needs; below them it scores 0
+METRIC_MINIMUMS = {
+    'sentence_uniformity': 3,
+    'vocabulary_diversity': 10,
+    'vocabulary_mattr': 10,
+    'vocabulary_mtld': 10,
+    'paragraph_patterns': 3,
+}
+
+
+def ladder_score(metric: str, value: float) -> Tuple[float, str]:
+    """Score and issue of a metric value on its METRIC_LADDERS entry."""
+    comparison, steps, fallback = METRIC_LADDERS[metric]
+    for bound, score, issue in steps:
+        if (value < bound) if comparison == '<' else (value > bound):
+            return score, issue
+    return fallback
+
+
+def weighted_score(metrics: Dict) -> float:
+    """Overall AI probability score (0-1): the METRIC_WEIGHTS sum of the metric scores."""
+    total = 0
+    for key, weight in METRIC_WEIGHTS.items():
+        if key in metrics and 'score' in metrics[key]:
+            total += metrics[key]['score'] * weight
+    return total
+
+
+def build_results(metrics: Dict, text_stats: Dict, overall_score: float) -> Dict:
+    """Combine metric results and their overall score into the result dict."""
+    # Determine AI probability level
+    if overall_score > 0.7:
+        probability = 'Very High'
+        recommendation = 'Text shows strong AI patterns. Significant rewriting recommended.'
+    elif overall_score > 0.5:
+        probability = 'High'
+        recommendation = 'Text shows multiple AI patterns. Rewriting recommended.'
+    elif overall_score > 0.35:
+        probability = 'Moderate'
+        recommendation = 'Text shows some AI patterns. Selective rewriting recommended.'
+    else:
+        probability = 'Low'
+        recommendation = 'Text appears relatively natural. Minor adjustments may help.'
+    
+    return {
+        'overall_score': round(overall_score, 3),
+        'probability': probability,
+        'recommendation': recommendation,
+        'metrics': metrics,
+        'text_stats': text_stats
+    }
+
 
 class AIDetector:
     """Detects AI writing patterns in academic text."""
@@ -43,48 +168,87 @@ class AIDetector:
         'is', 'are', 'was', 'were', 'been', 'be', 'being'
     ]
     
-    def __init__(self, text: str):
-        """Initialize with text to analyze."""
-        self.text = text
-        self.paragraphs = self._split_paragraphs()
-        self.sentences = self._split_sentences()
-        
-    def _split_paragraphs(self) -> List[str]:
-        """Split text into paragraphs."""
-        paragraphs = [p.strip() for p in self.text.split('\n\n') if p.strip()]
-        if not paragraphs:
-            # If no double newlines, treat whole text as one paragraph
-            paragraphs = [self.text.strip()]
-        return paragraphs
-    
-    def _split_sentences(self) -> List[str]:
-        """Split text into sentences."""
-        # Simple sentence splitter (improved regex)
-        sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', self.text)
-        return [s.strip() for s in sentences if s.strip()]
+    # Simple passive detection: "be" verbs + past participle patterns
+    PASSIVE_PATTERNS = PASSIVE_PATTERNS
+    
+    # Diversity measure that scores vocabulary in the overall score
+    diversity = 'ttr'
+    
+    def __init__(self, text: Union[str, TokenizedDocument], cache: Optional[ResultCache] = None,
+                 near_duplicates: bool = False, packs: Optional[List[PatternPack]] = None,
+                 language: str = 'en', profiler: Optional[Profiler] = None, diversity: str = 'ttr'):
+        """Initialize with text (or an already tokenized document) to analyze.
+        
+        Tokenization is deferred until a metric needs it, so a cache hit in
+        analyze() never tokenizes the text. With near_duplicates, paragraph
+        openings are grouped by MinHash similarity instead of an exact
+        20-character prefix. Pattern packs (see pattern_packs.py) add
+        transitions and abstract phrases to the built-in lists.
+        
+        language ('en', 'pt' or 'auto' to detect it) selects the tokenization
+        rules and adds the bundled packs for that language; a tokenized
+        document keeps its own language.
+        
+        With a profiler (see profiling.py), tokenization and each metric are
+        measured and analyze() adds a 'timing' entry to the results.
+        
+        diversity ('ttr', 'mattr' or 'mtld') picks the vocabulary measure of
+        the overall score. Raw TTR falls as texts get longer; the other two
+        are length-robust and are added to the metrics as
+        'vocabulary_mattr' or 'vocabulary_mtld', next to the TTR entry.
+        """
+        if diversity not in DIVERSITY_MEASURES:
+            raise ValueError(f"unknown diversity measure '{diversity}' "
+                             f"(expected one of: {', '.join(DIVERSITY_MEASURES)})")
+        self._source = text
+        self._doc = None
+        self.cache = cache
+        self.diversity = diversity
+        self.near_duplicates = near_duplicates
+        self.profiler = profiler
+        if isinstance(text, TokenizedDocument):
+            self.language = text.language
+        else:
+            self.language = measure(profiler, 'language', resolve_language, language, text)
+        self.packs = language_packs(self.language, packs, PACKS_DIR)
+    
+    @property
+    def doc(self) -> TokenizedDocument:
+        if self._doc is None:
+            self._doc = TokenizedDocument.of(self._source, self.language)
+        return self._doc
+    
+    @property
+    def text(self) -> str:
+        return self._source if isinstance(self._source, str) else self._source.text
+    
+    @property
+    def paragraphs(self) -> List[str]:
+        return self.doc.paragraphs
+    
+    @property
+    def sentences(self) -> List[str]:
+        return self.doc.sentences
     
     def analyze_sentence_uniformity(self) -> Dict:
         """Detect if sentences have uniform length (AI pattern)."""
-        if len(self.sentences) < 3:
+        if len(self.sentences) < METRIC_MINIMUMS['sentence_uniformity']:
             return {'score': 0, 'details': 'Too few sentences to analyze'}
         
-        word_counts = [len(s.split()) for s in self.sentences]
+        word_counts = self.doc.sentence_word_counts
         avg_length = statistics.mean(word_counts)
         std_dev = statistics.stdev(word_counts) if len(word_counts) > 1 else 0
         
+        return self._uniformity_metric(avg_length, std_dev)
+    
+    @staticmethod
+    def _uniformity_metric(avg_length: float, std_dev: float) -> Dict:
+        """Score sentence length spread from its mean and standard deviation."""
         # Low variance indicates AI (variance < 20% of mean)
         variance_ratio = std_dev / avg_length if avg_length > 0 else 0
         
         # AI typically has variance_ratio < 0.3
-        if variance_ratio < 0.25:
-            score = 0.8
-            issue = 'high_uniformity'
-        elif variance_ratio < 0.35:
-            score = 0.5
-            issue = 'moderate_uniformity'
-        else:
-            score = 0.1
-            issue = 'good_variation'
+        score, issue = ladder_score('sentence_uniformity', variance_ratio)
         
         return {
             'score': score,
@@ -97,34 +261,36 @@ class AIDetector:
     
     def detect_transition_overuse(self) -> Dict:
         """Detect overuse of mechanical AI transition words."""
-        sentence_starts = [s.lower()[:50] for s in self.sentences]
-        
-        transition_count = 0
         found_transitions = []
         
-        for start in sentence_starts:
-            for trans in self.AI_TRANSITIONS:
-                if start.startswith(trans):
-                    transition_count += 1
-                    found_transitions.append(trans)
-                    break
+        for sentence in self.sentences:
+            transition = self._opening_transition(sentence)
+            if transition is not None:
+                found_transitions.append(transition)
         
+        return self._transition_metric(len(found_transitions), len(self.sentences), found_transitions)
+    
+    def _opening_transition(self, sentence: str) -> Optional[str]:
+        """The mechanical transition a sentence opens with, or None."""
+        start = sentence.lower()[:50]
+        for trans in self.AI_TRANSITIONS:
+            if start.startswith(trans):
+                return trans
+        for pack in self.packs:
+            phrase_id = pack.transitions.match_prefix(start)
+            if phrase_id is not None:
+                return pack.transitions.phrases[phrase_id]
+        return None
+    
+    @staticmethod
+    def _transition_metric(transition_count: int, sentence_count: int,
+                           found_transitions: List[str]) -> Dict:
+        """Score the share of sentences that open with a mechanical transition."""
         # Calculate percentage
-        transition_pct = (transition_count / len(self.sentences)) * 100 if self.sentences else 0
+        transition_pct = (transition_count / sentence_count) * 100 if sentence_count else 0
         
         # AI typically has >20% sentences starting with these
-        if transition_pct > 25:
-            score = 0.9
-            issue = 'excessive_transitions'
-        elif transition_pct > 15:
-            score = 0.6
-            issue = 'high_transitions'
-        elif transition_pct > 8:
-            score = 0.3
-            issue = 'moderate_transitions'
-        else:
-            score = 0.1
-            issue = 'appropriate_transitions'
+        score, issue = ladder_score('transition_overuse', transition_pct)
         
         return {
             'score': score,
@@ -137,7 +303,7 @@ class AIDetector:
     
     def detect_abstract_language(self) -> Dict:
         """Detect overuse of abstract placeholder phrases."""
-        text_lower = self.text.lower()
+        text_lower = self.doc.lower
         
         found_phrases = []
         total_count = 0
@@ -148,23 +314,22 @@ class AIDetector:
                 found_phrases.append((phrase, count))
                 total_count += count
         
+        for pack in self.packs:
+            for phrase_id, count in pack.abstract_phrases.counts(text_lower).items():
+                found_phrases.append((pack.abstract_phrases.phrases[phrase_id], count))
+                total_count += count
+        
+        return self._abstract_metric(found_phrases, total_count, self.doc.token_count)
+    
+    @staticmethod
+    def _abstract_metric(found_phrases: List[Tuple[str, int]], total_count: int,
+                         word_count: int) -> Dict:
+        """Score abstract phrase density per 100 words."""
         # Calculate density (phrases per 100 words)
-        word_count = len(self.text.split())
         density = (total_count / word_count) * 100 if word_count > 0 else 0
         
         # AI typically has density > 1.5
-        if density > 2.0:
-            score = 0.9
-            issue = 'excessive_abstraction'
-        elif density > 1.0:
-            score = 0.6
-            issue = 'high_abstraction'
-        elif density > 0.5:
-            score = 0.3
-            issue = 'moderate_abstraction'
-        else:
-            score = 0.1
-            issue = 'appropriate_specificity'
+        score, issue = ladder_score('abstract_language', density)
         
         return {
             'score': score,
@@ -177,63 +342,72 @@ class AIDetector:
     
     def calculate_vocabulary_diversity(self) -> Dict:
         """Calculate Type-Token Ratio (vocabulary diversity)."""
-        # Tokenize and clean
-        words = re.findall(r'\b[a-z]+\b', self.text.lower())
+        words = self.doc.words
         
-        if len(words) < 10:
+        return self._diversity_metric(len(set(words)), len(words))
+    
+    def calculate_mattr(self) -> Dict:
+        """Moving-average TTR over 50-word windows (length-robust diversity)."""
+        words = self.doc.words
+        return self._robust_diversity_metric('mattr', mattr(words), len(words))
+    
+    def calculate_mtld(self) -> Dict:
+        """MTLD: mean words per segment before the running TTR falls to 0.72."""
+        words = self.doc.words
+        return self._robust_diversity_metric('mtld', mtld(words), len(words))
+    
+    @staticmethod
+    def _robust_diversity_metric(measure: str, value: float, total_count: int) -> Dict:
+        """Score a MATTR or MTLD value on its METRIC_LADDERS entry."""
+        if total_count < METRIC_MINIMUMS[f'vocabulary_{measure}']:
             return {'score': 0, 'details': 'Too few words to analyze'}
         
-        unique_words = set(words)
-        ttr = len(unique_words) / len(words)
+        score, issue = ladder_score(f'vocabulary_{measure}', value)
         
-        # AI typically has TTR < 0.45 for academic text
-        if ttr < 0.40:
-            score = 0.8
-            issue = 'low_diversity'
-        elif ttr < 0.50:
-            score = 0.5
-            issue = 'moderate_diversity'
+        if measure == 'mattr':
+            details = f'MATTR ({MATTR_WINDOW}-word windows): {value:.3f} over {total_count} words'
         else:
-            score = 0.2
-            issue = 'good_diversity'
+            details = f'MTLD: {value:.1f} words per factor over {total_count} words'
+        return {
+            'score': score,
+            measure: round(value, 3),
+            'total_words': total_count,
+            'issue': issue,
+            'details': details
+        }
+    
+    @staticmethod
+    def _diversity_metric(unique_count: int, total_count: int) -> Dict:
+        """Score vocabulary diversity from unique and total word counts."""
+        if total_count < METRIC_MINIMUMS['vocabulary_diversity']:
+            return {'score': 0, 'details': 'Too few words to analyze'}
+        
+        ttr = unique_count / total_count
+        
+        # AI typically has TTR < 0.45 for academic text
+        score, issue = ladder_score('vocabulary_diversity', ttr)
         
         return {
             'score': score,
             'ttr': round(ttr, 3),
-            'unique_words': len(unique_words),
-            'total_words': len(words),
+            'unique_words': unique_count,
+            'total_words': total_count,
             'issue': issue,
-            'details': f'Type-Token Ratio: {ttr:.3f} ({len(unique_words)} unique / {len(words)} total)'
+            'details': f'Type-Token Ratio: {ttr:.3f} ({unique_count} unique / {total_count} total)'
         }
     
     def detect_passive_voice_overuse(self) -> Dict:
         """Detect excessive passive voice (common in AI academic writing)."""
-        # Simple passive detection: look for "be" verbs + past participle patterns
-        passive_patterns = [
-            r'\b(is|are|was|were|been|be|being)\s+\w+ed\b',
-            r'\b(is|are|was|were|been|be|being)\s+(shown|demonstrated|observed|found|noted|seen|considered|analyzed)\b'
-        ]
-        
-        passive_count = 0
-        for pattern in passive_patterns:
-            passive_count += len(re.findall(pattern, self.text.lower()))
-        
+        return self._passive_metric(self.doc.passive_count, len(self.sentences))
+    
+    @staticmethod
+    def _passive_metric(passive_count: int, sentence_count: int) -> Dict:
+        """Score passive constructions relative to the sentence count."""
         # Calculate percentage relative to total sentences
-        passive_pct = (passive_count / len(self.sentences)) * 100 if self.sentences else 0
+        passive_pct = (passive_count / sentence_count) * 100 if sentence_count else 0
         
         # AI often uses passive in >40% of sentences
-        if passive_pct > 50:
-            score = 0.7
-            issue = 'excessive_passive'
-        elif passive_pct > 35:
-            score = 0.5
-            issue = 'high_passive'
-        elif passive_pct > 20:
-            score = 0.2
-            issue = 'moderate_passive'
-        else:
-            score = 0.1
-            issue = 'appropriate_voice_mix'
+        score, issue = ladder_score('passive_voice', passive_pct)
         
         return {
             'score': score,
@@ -245,102 +419,283 @@ class AIDetector:
     
     def analyze_paragraph_patterns(self) -> Dict:
         """Detect repetitive paragraph opening patterns."""
-        if len(self.paragraphs) < 3:
+        if len(self.paragraphs) < METRIC_MINIMUMS['paragraph_patterns']:
             return {'score': 0, 'details': 'Too few paragraphs to analyze'}
         
         # Extract first sentence of each paragraph
-        para_starts = []
-        for para in self.paragraphs:
-            sentences = re.split(r'(?<=[.!?])\s+', para)
-            if sentences:
-                para_starts.append(sentences[0].lower()[:30])
-        
-        # Check for similar starts
-        similar_count = 0
-        for i in range(len(para_starts)):
-            for j in range(i + 1, len(para_starts)):
-                # Check if starts are very similar (first 20 chars)
-                if para_starts[i][:20] == para_starts[j][:20]:
-                    similar_count += 1
-        
-        similarity_ratio = similar_count / len(self.paragraphs) if self.paragraphs else 0
-        
-        if similarity_ratio > 0.3:
-            score = 0.7
-            issue = 'repetitive_openings'
-        elif similarity_ratio > 0.15:
-            score = 0.4
-            issue = 'some_repetition'
-        else:
-            score = 0.1
-            issue = 'varied_openings'
+        openings = [paragraph_opening(para) for para in self.paragraphs]
+        
+        if self.near_duplicates:
+            index = NearDuplicateIndex()
+            for opening in openings:
+                index.add(opening)
+            result = self._paragraph_metric(index.similar_pairs(), len(self.paragraphs))
+            result['mode'] = 'near_duplicate'
+            return result
+        
+        # Openings are similar when their first 20 characters match; every
+        # pair inside a group of c equal prefixes counts, c * (c - 1) / 2
+        prefixes = Counter(opening.lower()[:20] for opening in openings)
+        return self._paragraph_metric(count_pairs(prefixes.values()), len(self.paragraphs))
+    
+    @staticmethod
+    def _paragraph_metric(similar_count: int, paragraph_count: int) -> Dict:
+        """Score how many pairs of paragraphs share an opening."""
+        similarity_ratio = similar_count / paragraph_count if paragraph_count else 0
+        
+        score, issue = ladder_score('paragraph_patterns', similarity_ratio)
         
         return {
             'score': score,
             'similar_count': similar_count,
-            'total_paragraphs': len(self.paragraphs),
+            'total_paragraphs': paragraph_count,
             'issue': issue,
-            'details': f'{similar_count} similar paragraph openings detected among {len(self.paragraphs)} paragraphs'
+            'details': f'{similar_count} similar paragraph openings detected among {paragraph_count} paragraphs'
         }
     
-    def calculate_overall_score(self, metrics: Dict) -> float:
-        """Calculate overall AI probability score (0-1)."""
-        # Weight different metrics
-        weights = {
-            'sentence_uniformity': 0.25,
-            'transition_overuse': 0.20,
-            'abstract_language': 0.20,
-            'vocabulary_diversity': 0.15,
-            'passive_voice': 0.10,
-            'paragraph_patterns': 0.10
-        }
+    def calculate_overall_score(self, metrics: Dict, diversity: str = None) -> float:
+        """Calculate overall AI probability score (0-1).
         
-        weighted_score = 0
-        for key, weight in weights.items():
-            if key in metrics and 'score' in metrics[key]:
-                weighted_score += metrics[key]['score'] * weight
-        
-        return weighted_score
+        diversity ('ttr', 'mattr' or 'mtld'; default: the detector's) picks
+        which vocabulary entry of metrics gets the vocabulary weight; when
+        that entry is missing, the TTR entry is used.
+        """
+        diversity = diversity or self.diversity
+        key = 'vocabulary_diversity' if diversity == 'ttr' else f'vocabulary_{diversity}'
+        if key in metrics:
+            metrics = dict(metrics, vocabulary_diversity=metrics[key])
+        return weighted_score(metrics)
     
     def analyze(self) -> Dict:
-        """Run full analysis and return results."""
+        """Run full analysis and return results (from the cache when one is set)."""
+        if self.cache is not None:
+            results = self.cache.fetch(self.text, self.cache_options(), self._analyze)
+        else:
+            results = self._analyze()
+        if self.profiler is not None:
+            results = dict(results, timing=self.profiler.to_dict())
+        return results
+    
+    def cache_options(self) -> Dict:
+        """Options that change the result, for the cache key."""
+        options = {'near_duplicates': True} if self.near_duplicates else {}
+        if self.diversity != 'ttr':
+            options['diversity'] = self.diversity
+        if self.language != 'en':
+            options['language'] = self.language
+        if self.packs:
+            options['packs'] = [pack.digest for pack in self.packs]
+        return options
+    
+    def _analyze(self) -> Dict:
+        profiler = self.profiler
+        if profiler is not None:
+            # Tokenize up front so the first metric is not charged for it
+            measure(profiler, 'tokenize', lambda: self.doc)
         metrics = {
-            'sentence_uniformity': self.analyze_sentence_uniformity(),
-            'transition_overuse': self.detect_transition_overuse(),
-            'abstract_language': self.detect_abstract_language(),
-            'vocabulary_diversity': self.calculate_vocabulary_diversity(),
-            'passive_voice': self.detect_passive_voice_overuse(),
-            'paragraph_patterns': self.analyze_paragraph_patterns()
+            'sentence_uniformity': measure(profiler, 'sentence_uniformity', self.analyze_sentence_uniformity),
+            'transition_overuse': measure(profiler, 'transition_overuse', self.detect_transition_overuse),
+            'abstract_language': measure(profiler, 'abstract_language', self.detect_abstract_language),
+            'vocabulary_diversity': measure(profiler, 'vocabulary_diversity', self.calculate_vocabulary_diversity),
+            'passive_voice': measure(profiler, 'passive_voice', self.detect_passive_voice_overuse),
+            'paragraph_patterns': measure(profiler, 'paragraph_patterns', self.analyze_paragraph_patterns)
         }
+        if self.diversity == 'mattr':
+            metrics['vocabulary_mattr'] = measure(profiler, 'vocabulary_mattr', self.calculate_mattr)
+        elif self.diversity == 'mtld':
+            metrics['vocabulary_mtld'] = measure(profiler, 'vocabulary_mtld', self.calculate_mtld)
         
-        overall_score = self.calculate_overall_score(metrics)
-        
-        # Determine AI probability level
-        if overall_score > 0.7:
-            probability = 'Very High'
-            recommendation = 'Text shows strong AI patterns. Significant rewriting recommended.'
-        elif overall_score > 0.5:
-            probability = 'High'
-            recommendation = 'Text shows multiple AI patterns. Rewriting recommended.'
-        elif overall_score > 0.35:
-            probability = 'Moderate'
-            recommendation = 'Text shows some AI patterns. Selective rewriting recommended.'
-        else:
-            probability = 'Low'
-            recommendation = 'Text appears relatively natural. Minor adjustments may help.'
+        return self._build_results(metrics, {
+            'paragraphs': len(self.paragraphs),
+            'sentences': len(self.sentences),
+            'words': self.doc.token_count
+        })
+    
+    def _build_results(self, metrics: Dict, text_stats: Dict) -> Dict:
+        """Combine metric results into the overall assessment."""
+        return build_results(metrics, text_stats, self.calculate_overall_score(metrics))
+    
+    def _sentence_features(self) -> Dict:
+        """Per-sentence counts for the heatmap, as prefix sums over the sentences.
+        
+        Each list has one entry per sentence plus a leading 0, so the total
+        over sentences [i, j) is prefix[j] - prefix[i]. Words and paragraph
+        openings are kept as ranges/keys per sentence for the sliding counters.
+        """
+        doc = self.doc
+        count = len(doc.sentence_starts)
+        lengths = doc.sentence_word_counts
+        # Matches are assigned to the sentence they start in (offsets in doc.lower)
+        starts = doc.lower_offsets(doc.sentence_starts)
+        
+        def per_sentence(offsets) -> List[int]:
+            counts = [0] * count
+            for offset in offsets:
+                counts[max(0, bisect_right(starts, offset) - 1)] += 1
+            return counts
+        
+        abstract = []
+        for phrase in self.ABSTRACT_PHRASES:
+            # Non-overlapping hits, as str.count() finds them in detect_abstract_language
+            at = doc.lower.find(phrase)
+            while at != -1:
+                abstract.append(at)
+                at = doc.lower.find(phrase, at + len(phrase))
+        for pack in self.packs:
+            abstract.extend(start for _, start, _ in pack.abstract_phrases.finditer(doc.lower))
+        
+        word_starts = doc.word_spans[::2]
+        word_first = [bisect_left(word_starts, offset) for offset in starts[1:]]
+        
+        # Paragraph openings belong to the sentence their paragraph starts in
+        # (blank text has a paragraph but no sentence to hold it)
+        openings = [[] for _ in range(count)]
+        for paragraph, offset in zip(doc.paragraphs, doc.paragraph_starts) if count else ():
+            index = max(0, bisect_right(doc.sentence_starts, offset) - 1)
+            openings[index].append(paragraph_opening(paragraph).lower()[:20])
+        
+        def prefix(values) -> List[int]:
+            return list(accumulate(values, initial=0))
         
         return {
-            'overall_score': round(overall_score, 3),
-            'probability': probability,
-            'recommendation': recommendation,
-            'metrics': metrics,
-            'text_stats': {
-                'paragraphs': len(self.paragraphs),
-                'sentences': len(self.sentences),
-                'words': len(self.text.split())
+            'count': count,
+            'length': prefix(lengths),
+            'length_sq': prefix(n * n for n in lengths),
+            'transition': prefix(self._opening_transition(s) is not None for s in doc.sentences),
+            'abstract': prefix(per_sentence(abstract)),
+            'passive': prefix(per_sentence(doc.passive_starts())),
+            'paragraphs': prefix(len(keys) for keys in openings),
+            'word_bounds': [0] + word_first + [len(doc.words)],
+            'openings': openings,
+        }
+    
+    def heatmap(self, window: int = WINDOW_SENTENCES, step: int = 1) -> Dict:
+        """Score the six metrics over sliding windows of `window` sentences.
+        
+        Sentence lengths, transition openings, abstract phrases and passive
+        constructions are counted once per sentence into prefix sums, so each
+        window's counts cost O(1); unique words and repeated paragraph
+        openings are kept in counters that only add the entering and drop
+        the leaving sentences. The whole heatmap is linear in the length of
+        the document. Paragraph openings are compared by exact prefix, even
+        with near_duplicates.
+        
+        Returns the windows (sentence range, character span, six metric
+        scores and the overall score) and, for highlighting, a score per
+        sentence: the mean overall score of the windows that cover it.
+        Text without sentences has no windows.
+        """
+        if window < 1 or step < 1:
+            raise ValueError("window and step must be at least 1")
+        f = self._sentence_features()
+        count = f['count']
+        doc = self.doc
+        window = min(window, count) or 1
+        starts = list(range(0, count - window + 1, step)) if count else []
+        if starts and starts[-1] + window < count:
+            starts.append(count - window)
+        
+        # Sliding state: word counts, opening-prefix counts, and the derived
+        # unique-word and similar-pair totals
+        words = Counter()
+        openings = Counter()
+        state = {'unique': 0, 'similar': 0}
+        
+        def slide(i: int, sign: int):
+            for word in doc.words[f['word_bounds'][i]:f['word_bounds'][i + 1]]:
+                if sign > 0:
+                    state['unique'] += words[word] == 0
+                    words[word] += 1
+                else:
+                    words[word] -= 1
+                    state['unique'] -= words[word] == 0
+            for key in f['openings'][i]:
+                # A group of c equal openings has c * (c - 1) / 2 pairs
+                if sign > 0:
+                    state['similar'] += openings[key]
+                    openings[key] += 1
+                else:
+                    openings[key] -= 1
+                    state['similar'] -= openings[key]
+        
+        lo = hi = 0
+        windows = []
+        for start in starts:
+            end = min(start + window, count)
+            for i in range(lo, min(start, hi)):
+                slide(i, -1)
+            for i in range(max(start, hi), end):
+                slide(i, +1)
+            lo, hi = start, end
+            
+            def total(name: str) -> int:
+                return f[name][end] - f[name][start]
+            
+            n = end - start
+            length = total('length')
+            variance = (n * total('length_sq') - length * length) / (n * (n - 1)) if n > 1 else 0
+            paragraphs = total('paragraphs')
+            word_count = f['word_bounds'][end] - f['word_bounds'][start]
+            metrics = {
+                'sentence_uniformity': (self._uniformity_metric(length / n, variance ** 0.5)
+                                        if n >= METRIC_MINIMUMS['sentence_uniformity'] else {'score': 0}),
+                'transition_overuse': self._transition_metric(total('transition'), n, []),
+                'abstract_language': self._abstract_metric([], total('abstract'), length),
+                'vocabulary_diversity': self._diversity_metric(state['unique'], word_count),
+                'passive_voice': self._passive_metric(total('passive'), n),
+                'paragraph_patterns': (self._paragraph_metric(state['similar'], paragraphs)
+                                       if paragraphs >= METRIC_MINIMUMS['paragraph_patterns'] else {'score': 0}),
             }
+            windows.append({
+                'start': start,
+                'end': end,
+                'char_start': doc.sentence_starts[start],
+                'char_end': doc.sentence_ends[end - 1],
+                'score': round(self.calculate_overall_score(metrics), 3),
+                'metrics': {name: metric['score'] for name, metric in metrics.items()},
+            })
+        
+        # Mean over covering windows, by difference arrays over the sentences
+        score_delta = [0.0] * (count + 1)
+        cover_delta = [0] * (count + 1)
+        for w in windows:
+            score_delta[w['start']] += w['score']
+            score_delta[w['end']] -= w['score']
+            cover_delta[w['start']] += 1
+            cover_delta[w['end']] -= 1
+        sentence_scores = [round(s / c, 3) if c else 0
+                           for s, c in zip(accumulate(score_delta[:count]), accumulate(cover_delta[:count]))]
+        
+        return {
+            'window': window,
+            'step': step,
+            'sentences': count,
+            'windows': windows,
+            'sentence_scores': sentence_scores,
         }
     
+    def format_heatmap(self, heatmap: Dict, width: int = 40) -> str:
+        """Format heatmap() output as one bar per window."""
+        report = []
+        report.append("=" * 70)
+        report.append(f"AI PATTERN HEATMAP ({heatmap['sentences']} sentences, "
+                      f"windows of {heatmap['window']}, step {heatmap['step']})")
+        report.append("=" * 70)
+        report.append("")
+        for w in heatmap['windows']:
+            bar = '█' * round(w['score'] * width)
+            report.append(f"{w['start'] + 1:>5}-{w['end']:<5} {w['score']:>6.1%} {bar:<{width}} "
+                          f"{self._score_indicator(w['score'])}")
+        if heatmap['windows']:
+            worst = max(heatmap['windows'], key=lambda w: w['score'])
+            report.append("")
+            report.append(f"Highest: sentences {worst['start'] + 1}-{worst['end']} "
+                          f"({worst['score']:.1%}), characters {worst['char_start']}-{worst['char_end']}")
+            report.append("  " + ", ".join(f"{name} {score}" for name, score in worst['metrics'].items()))
+        report.append("")
+        report.append("=" * 70)
+        return "\n".join(report)
+    
     def format_report(self, results: Dict, detailed: bool = False) -> str:
         """Format analysis results as readable report."""
         report = []
@@ -395,8 +750,14 @@ class AIDetector:
         
         # Vocabulary Diversity
         m = metrics['vocabulary_diversity']
+        robust = metrics.get('vocabulary_mattr') or metrics.get('vocabulary_mtld')
+        if robust is not None:
+            # The length-robust measure is the one scored
+            ttr_details, m = m['details'], robust
         report.append(f"\n4. Vocabulary Diversity: {self._score_indicator(m['score'])}")
         report.append(f"   {m['details']}")
+        if robust is not None:
+            report.append(f"   Raw {ttr_details} (not scored)")
         if detailed and m['score'] > 0.5:
             report.append(f"   → Issue: Low vocabulary variety")
             report.append(f"   → Fix: Use more varied terminology, avoid word repetition")
@@ -432,6 +793,508 @@ class AIDetector:
             return "🟢 OK"
 
 
+def paragraph_opening(paragraph: str) -> str:
+    """Return the first sentence of a (stripped) paragraph."""
+    return PARAGRAPH_SENTENCE_SPLIT.split(paragraph, maxsplit=1)[0]
+
+
+def count_pairs(group_sizes: Iterable[int]) -> int:
+    """Number of unordered pairs within groups of the given sizes."""
+    return sum(c * (c - 1) // 2 for c in group_sizes)
+
+
+def _hash_coefficients(count: int, prime: int, seed: int) -> List[Tuple[int, int]]:
+    """Deterministic (a, b) pairs for the hash functions h(x) = (a*x + b) % prime."""
+    rng = random.Random(seed)
+    return [(rng.randrange(1, prime), rng.randrange(prime)) for _ in range(count)]
+
+
+class NearDuplicateIndex:
+    """Groups near-duplicate paragraph openings with MinHash and LSH banding.
+
+    Each opening is reduced to its first words, shingled into word n-grams
+    and summarized by a MinHash signature. The signature is cut into bands;
+    an opening is compared only with the first opening seen in each of its
+    band buckets and merged with it (union-find) when their signatures agree
+    on at least ``threshold`` of the positions, an estimate of the Jaccard
+    similarity of the shingle sets. Cost is linear in the number of openings.
+    """
+    
+    NUM_HASHES = 32
+    BANDS = 16
+    NGRAM = 2
+    OPENING_WORDS = 12
+    THRESHOLD = 0.5
+    
+    # Random affine hash functions modulo a Mersenne prime, seeded so that
+    # results are reproducible across runs
+    _PRIME = (1 << 61) - 1
+    _COEFFICIENTS = _hash_coefficients(NUM_HASHES, _PRIME, seed=20240601)
+    
+    def __init__(self, threshold: float = THRESHOLD):
+        self.threshold = threshold
+        self.parent = array('l')
+        self.signatures = []
+        # (band, band values) -> first opening placed in that bucket
+        self.buckets = {}
+    
+    @classmethod
+    def signature(cls, opening: str) -> Tuple[int, ...]:
+        """MinHash signature of the opening's word n-grams."""
+        words = WORD_PATTERN.findall(opening.lower())[:cls.OPENING_WORDS]
+        n = cls.NGRAM
+        shingles = {' '.join(words[i:i + n]) for i in range(max(1, len(words) - n + 1))}
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+        prime = cls._PRIME
+        return tuple(min((a * h + b) % prime for h in hashes) for a, b in cls._COEFFICIENTS)
+    
+    def add(self, opening: str):
+        """Index one opening, merging it with similar openings seen so far."""
+        self.add_signature(self.signature(opening))
+    
+    def add_signature(self, sig: Tuple[int, ...]):
+        """Index an opening by its precomputed signature."""
+        index = len(self.parent)
+        self.parent.append(index)
+        self.signatures.append(sig)
+        
+        rows = self.NUM_HASHES // self.BANDS
+        for band in range(self.BANDS):
+            key = (band, sig[band * rows:(band + 1) * rows])
+            first = self.buckets.setdefault(key, index)
+            if first != index and self._agreement(sig, self.signatures[first]) >= self.threshold:
+                self._union(first, index)
+    
+    @staticmethod
+    def _agreement(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+    
+    def _find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def _union(self, i: int, j: int):
+        ri, rj = self._find(i), self._find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+    
+    def similar_pairs(self) -> int:
+        """Pairs of openings within the same near-duplicate group."""
+        groups = Counter(self._find(i) for i in range(len(self.parent)))
+        return count_pairs(groups.values())
+
+
+def iter_paragraphs(stream: TextIO, block_size: int = 1 << 16) -> Iterator[str]:
+    """Yield the raw pieces of ``stream.read().split('\\n\\n')`` without reading it whole."""
+    buffer = ''
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        pieces = (buffer + block).split('\n\n')
+        buffer = pieces.pop()
+        yield from pieces
+    yield buffer
+
+
+class StreamingAIDetector:
+    """Bounded-memory counterpart of AIDetector for very large inputs.
+
+    Consumes the text paragraph by paragraph and keeps only running
+    accumulators, so memory is bounded by the largest paragraph (or the
+    largest sentence, when one spans several paragraphs) plus the
+    vocabulary. ``analyze()`` returns the same result dict as
+    ``AIDetector(text).analyze()``: English rules, built-in phrase lists
+    and TTR diversity. The metrics are scored by AIDetector's static
+    helpers, so both always apply the same ladders.
+    """
+    
+    AI_TRANSITIONS = AIDetector.AI_TRANSITIONS
+    ABSTRACT_PHRASES = AIDetector.ABSTRACT_PHRASES
+    PASSIVE_PATTERNS = AIDetector.PASSIVE_PATTERNS
+    
+    def __init__(self, paragraphs: Iterable[str], near_duplicates: bool = False):
+        """Initialize with an iterable of raw paragraphs (see iter_paragraphs)."""
+        self.source = paragraphs
+        self.near_duplicates = near_duplicates
+        self._analyzed = None
+        
+        # Sentence lengths: exact integer sums, so mean/stdev match statistics
+        self.sentence_count = 0
+        self.length_sum = 0
+        self.length_sq_sum = 0
+        
+        self.word_count = 0
+        self.transition_count = 0
+        self.found_transitions = []
+        self.abstract_counts = Counter()
+        self.vocabulary = set()
+        self.vocabulary_tokens = 0
+        self.passive_count = 0
+        self.paragraph_count = 0
+        self.opening_prefixes = Counter()
+        self.opening_index = NearDuplicateIndex() if near_duplicates else None
+        
+        # Open sentence: completed text plus the tail that may still split
+        self._pending = []
+        self._tail = ''
+    
+    @classmethod
+    def from_file(cls, stream: TextIO, block_size: int = 1 << 16,
+                  near_duplicates: bool = False) -> 'StreamingAIDetector':
+        """Create a detector that streams paragraphs from an open text file."""
+        return cls(iter_paragraphs(stream, block_size), near_duplicates=near_duplicates)
+    
+    def _consume(self):
+        """Drain the paragraph source into the accumulators."""
+        for index, raw in enumerate(self.source):
+            para = raw.strip()
+            if para:
+                self.paragraph_count += 1
+                opening = paragraph_opening(para)
+                if self.opening_index is not None:
+                    self.opening_index.add(opening)
+                else:
+                    self.opening_prefixes[opening.lower()[:20]] += 1
+            self._feed_sentences(raw if index == 0 else '\n\n' + raw)
+        
+        self._add_sentence(''.join(self._pending) + self._tail)
+        self._pending = []
+        self._tail = ''
+        
+        if not self.paragraph_count:
+            # Mirrors AIDetector treating blank text as one empty paragraph
+            self.paragraph_count = 1
+            if self.opening_index is not None:
+                self.opening_index.add('')
+    
+    def _feed_sentences(self, chunk: str):
+        """Split newly read text into sentences, holding back the open one."""
+        scan = self._tail + chunk
+        last = 0
+        for m in SENTENCE_SPLIT.finditer(scan):
+            self._pending.append(scan[last:m.start()])
+            self._add_sentence(''.join(self._pending))
+            self._pending = []
+            last = m.end()
+        
+        # Keep the last non-space character and trailing whitespace: a later
+        # chunk may still complete a split point there
+        rest = scan[last:]
+        stripped = rest.rstrip()
+        if stripped:
+            self._pending.append(rest[:len(stripped) - 1])
+            self._tail = rest[len(stripped) - 1:]
+        else:
+            self._tail = rest
+    
+    def _add_sentence(self, sentence: str):
+        """Fold one sentence into the running accumulators."""
+        sentence = sentence.strip()
+        if not sentence:
+            return
+        
+        words = len(sentence.split())
+        self.sentence_count += 1
+        self.length_sum += words
+        self.length_sq_sum += words * words
+        self.word_count += words
+        
+        lower = sentence.lower()
+        start = lower[:50]
+        for trans in self.AI_TRANSITIONS:
+            if start.startswith(trans):
+                self.transition_count += 1
+                self.found_transitions.append(trans)
+                break
+        
+        for phrase in self.ABSTRACT_PHRASES:
+            count = lower.count(phrase)
+            if count:
+                self.abstract_counts[phrase] += count
+        
+        tokens = WORD_PATTERN.findall(lower)
+        self.vocabulary.update(tokens)
+        self.vocabulary_tokens += len(tokens)
+        
+        for pattern in self.PASSIVE_PATTERNS:
+            self.passive_count += len(REGISTRY.get(pattern).findall(lower))
+    
+    def _sentence_length_stats(self) -> Tuple[float, float]:
+        """Return (mean, stdev) of sentence lengths, as statistics would."""
+        n = self.sentence_count
+        total = self.length_sum
+        avg_length = total // n if total % n == 0 else total / n
+        if n < 2:
+            return avg_length, 0
+        variance = Fraction(n * self.length_sq_sum - total * total, n * (n - 1))
+        return avg_length, math.sqrt(variance)
+    
+    def analyze(self) -> Dict:
+        """Consume the input once and return the same result dict as AIDetector."""
+        if self._analyzed is None:
+            self._consume()
+            self._analyzed = self._results()
+        return self._analyzed
+    
+    def _results(self) -> Dict:
+        """Build the result dict from the accumulators."""
+        if self.sentence_count < METRIC_MINIMUMS['sentence_uniformity']:
+            uniformity = {'score': 0, 'details': 'Too few sentences to analyze'}
+        else:
+            uniformity = AIDetector._uniformity_metric(*self._sentence_length_stats())
+        
+        found_phrases = [(phrase, self.abstract_counts[phrase])
+                         for phrase in self.ABSTRACT_PHRASES if self.abstract_counts[phrase]]
+        
+        if self.paragraph_count < METRIC_MINIMUMS['paragraph_patterns']:
+            paragraphs = {'score': 0, 'details': 'Too few paragraphs to analyze'}
+        else:
+            if self.opening_index is not None:
+                paragraphs = AIDetector._paragraph_metric(
+                    self.opening_index.similar_pairs(), self.paragraph_count)
+                paragraphs['mode'] = 'near_duplicate'
+            else:
+                paragraphs = AIDetector._paragraph_metric(
+                    count_pairs(self.opening_prefixes.values()), self.paragraph_count)
+        
+        metrics = {
+            'sentence_uniformity': uniformity,
+            'transition_overuse': AIDetector._transition_metric(
+                self.transition_count, self.sentence_count, self.found_transitions),
+            'abstract_language': AIDetector._abstract_metric(
+                found_phrases, sum(self.abstract_counts.values()), self.word_count),
+            'vocabulary_diversity': AIDetector._diversity_metric(
+                len(self.vocabulary), self.vocabulary_tokens),
+            'passive_voice': AIDetector._passive_metric(self.passive_count, self.sentence_count),
+            'paragraph_patterns': paragraphs
+        }
+        
+        return build_results(metrics, {
+            'paragraphs': self.paragraph_count,
+            'sentences': self.sentence_count,
+            'words': self.word_count
+        }, weighted_score(metrics))
+
+
+class _BlockStats:
+    """Partial metrics of one block of paragraphs (see IncrementalAIDetector)."""
+    
+    def __init__(self, text: str, near_duplicates: bool):
+        doc = TokenizedDocument(text)
+        counts = doc.sentence_word_counts
+        self.sentence_count = len(counts)
+        self.length_sum = sum(counts)
+        self.length_sq_sum = sum(c * c for c in counts)
+        
+        self.transitions = []
+        for sentence in doc.sentences:
+            start = sentence.lower()[:50]
+            for trans in AIDetector.AI_TRANSITIONS:
+                if start.startswith(trans):
+                    self.transitions.append(trans)
+                    break
+        
+        self.abstract_counts = Counter()
+        for phrase in AIDetector.ABSTRACT_PHRASES:
+            count = doc.lower.count(phrase)
+            if count:
+                self.abstract_counts[phrase] = count
+        
+        self.words = Counter(doc.words)
+        self.word_total = len(doc.words)
+        self.passive_count = doc.passive_count
+        
+        openings = [paragraph_opening(para) for para in (p.strip() for p in text.split('\n\n')) if para]
+        self.paragraph_count = len(openings)
+        if near_duplicates:
+            self.prefixes = []
+            self.signatures = [NearDuplicateIndex.signature(o) for o in openings]
+        else:
+            self.prefixes = [opening.lower()[:20] for opening in openings]
+            self.signatures = []
+
+
+def _update_counter(total: Counter, part: Counter, sign: int):
+    """Add (sign=1) or remove (sign=-1) part from total, dropping zero counts."""
+    for key, count in part.items():
+        value = total[key] + sign * count
+        if value:
+            total[key] = value
+        else:
+            del total[key]
+
+
+_CAPITALS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+
+def _starts_block(piece: str) -> bool:
+    """Whether a sentence split always falls right before this paragraph."""
+    return piece.lstrip()[:1] in _CAPITALS
+
+
+def _ends_block(piece: str) -> bool:
+    """Whether a sentence split always falls right after this paragraph."""
+    return piece.rstrip()[-1:] in ('.', '!', '?')
+
+
+class IncrementalAIDetector(StreamingAIDetector):
+    """AIDetector that re-scores an edited text by re-analyzing only what changed.
+
+    The text is kept as a list of blocks: runs of paragraphs cut wherever a
+    paragraph ends with terminal punctuation and the next starts with a
+    capital, so no sentence, passive construction or phrase crosses a block
+    boundary. Each block holds its partial metrics (sentence lengths,
+    transition hits, abstract phrase and passive counts, word multiset,
+    paragraph openings) and the detector keeps their running totals.
+    
+    ``update(new_text)`` skips the blocks shared with the previous text at
+    both ends, re-analyzes only the changed blocks and one neighbour on each
+    side, and adjusts the totals. Results equal ``AIDetector(text).analyze()``
+    (tests/test_ai_detector.py checks this on random edit sequences).
+    In near-duplicate mode the opening index is rebuilt from the stored
+    signatures, which is linear in the paragraph count but hashes nothing.
+    """
+    
+    SEPARATOR = '\n\n'
+    
+    def __init__(self, text: str, near_duplicates: bool = False):
+        """Initialize with the first version of the text."""
+        super().__init__((), near_duplicates=near_duplicates)
+        self.vocabulary = Counter()
+        self.abstract_counts = Counter()
+        self.blocks = []
+        self.block_stats = []
+        self._source = ''
+        self.reanalyzed_chars = 0
+        self._replace(0, 0, text)
+        self._source = text
+    
+    @property
+    def text(self) -> str:
+        return self._source
+    
+    def update(self, text: str) -> Dict:
+        """Replace the text with an edited version and return the new results."""
+        if text == self._source:
+            return self.analyze()
+        
+        old, sep = self._source, self.SEPARATOR
+        blocks = self.blocks
+        
+        # Unchanged blocks (with their separator) at the start...
+        head = pos = 0
+        while head < len(blocks) - 1:
+            end = pos + len(blocks[head])
+            if not (text.startswith(blocks[head], pos) and text.startswith(sep, end)):
+                break
+            pos = end + len(sep)
+            head += 1
+        
+        # ...and at the end, without overlapping the unchanged start
+        tail = 0
+        tail_len = 0
+        limit = min(len(old), len(text)) - pos
+        while tail < len(blocks) - head:
+            size = len(sep) + len(blocks[-1 - tail])
+            if tail_len + size > limit or not (
+                    text.endswith(blocks[-1 - tail], 0, len(text) - tail_len) and
+                    text.startswith(sep, len(text) - tail_len - size)):
+                break
+            tail_len += size
+            tail += 1
+        
+        # Re-split one unchanged neighbour on each side as well: the edit may
+        # add or remove the sentence split that separated it from the change
+        first = max(head - 1, 0)
+        stop = min(len(blocks) - tail + 1, len(blocks))
+        start = pos - (len(blocks[first]) + len(sep) if head else 0)
+        after = sum(len(sep) + len(b) for b in blocks[stop:])
+        
+        self._replace(first, stop, text[start:len(text) - after])
+        self._source = text
+        return self.analyze()
+    
+    def _replace(self, first: int, stop: int, region: str):
+        """Replace blocks[first:stop] with the blocks of region."""
+        for stats in self.block_stats[first:stop]:
+            self._account(stats, -1)
+        
+        new_blocks = []
+        pieces = region.split(self.SEPARATOR)
+        current = [pieces[0]]
+        for prev, piece in zip(pieces, pieces[1:]):
+            if _ends_block(prev) and _starts_block(piece):
+                new_blocks.append(self.SEPARATOR.join(current))
+                current = []
+            current.append(piece)
+        new_blocks.append(self.SEPARATOR.join(current))
+        
+        new_stats = [_BlockStats(block, self.near_duplicates) for block in new_blocks]
+        for stats in new_stats:
+            self._account(stats, 1)
+        
+        self.blocks[first:stop] = new_blocks
+        self.block_stats[first:stop] = new_stats
+        self.reanalyzed_chars = len(region)
+        self._analyzed = None
+    
+    def _account(self, stats: _BlockStats, sign: int):
+        """Add (sign=1) or remove (sign=-1) a block's partials from the totals."""
+        self.sentence_count += sign * stats.sentence_count
+        self.length_sum += sign * stats.length_sum
+        self.length_sq_sum += sign * stats.length_sq_sum
+        self.word_count += sign * stats.length_sum
+        self.transition_count += sign * len(stats.transitions)
+        self.vocabulary_tokens += sign * stats.word_total
+        self.passive_count += sign * stats.passive_count
+        self.paragraph_count += sign * stats.paragraph_count
+        _update_counter(self.abstract_counts, stats.abstract_counts, sign)
+        _update_counter(self.vocabulary, stats.words, sign)
+        _update_counter(self.opening_prefixes, Counter(stats.prefixes), sign)
+    
+    def analyze(self) -> Dict:
+        """Return the results for the current text, aggregating the block totals."""
+        if self._analyzed is None:
+            self.found_transitions = [t for stats in self.block_stats for t in stats.transitions]
+            if self.near_duplicates:
+                self.opening_index = NearDuplicateIndex()
+                for stats in self.block_stats:
+                    for sig in stats.signatures:
+                        self.opening_index.add_signature(sig)
+            
+            # Blank text counts as one empty paragraph, as in AIDetector
+            paragraphs = self.paragraph_count
+            self.paragraph_count = max(paragraphs, 1)
+            try:
+                self._analyzed = self._results()
+            finally:
+                self.paragraph_count = paragraphs
+        return self._analyzed
+
+
+def make_cache() -> ResultCache:
+    """Result cache for this tool, versioned by its source files."""
+    here = Path(__file__).resolve().parent
+    version = ResultCache.source_version(here / 'ai_detector.py', here / 'tokenization.py',
+                                         here / 'lexical_diversity.py', here / 'pattern_packs.py',
+                                         here / 'pattern_registry.py')
+    return ResultCache('ai_detector', version)
+
+
+def iter_file_chunks(path: str, block_size: int = 1 << 16) -> Iterator[str]:
+    """Yield a text file in blocks, for hashing without loading it whole."""
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            yield block
+
+
 def main():
     """Command-line interface."""
     # Set UTF-8 encoding for Windows console
@@ -449,17 +1312,120 @@ Examples:
   python ai_detector.py input.txt
   python ai_detector.py input.txt --detailed
   python ai_detector.py input.txt --json > results.json
+  python ai_detector.py thesis.txt --stream
+  python ai_detector.py input.txt --near-duplicates
+  python ai_detector.py thesis_chapter.txt --window 10
+  python ai_detector.py thesis.txt --diversity mattr
+  python ai_detector.py cover_letter.txt --window 5 --step 5 --json
+  python ai_detector.py artigo.txt --pack ../packs/pt-br.toml
+  python ai_detector.py artigo.txt --lang pt
+  python ai_detector.py input.txt --timing
+  python ai_detector.py input.txt --profile
+  python ai_detector.py --cache-stats
         """
     )
     
-    parser.add_argument('input_file', help='Text file to analyze')
+    parser.add_argument('input_file', nargs='?', help='Text file to analyze')
     parser.add_argument('--detailed', action='store_true', 
                        help='Show detailed analysis with fix suggestions')
     parser.add_argument('--json', action='store_true',
                        help='Output results as JSON')
+    parser.add_argument('--stream', action='store_true',
+                       help='Read the file paragraph by paragraph (bounded memory, for very large inputs; '
+                            'English text only)')
+    parser.add_argument('--window', type=int, metavar='N',
+                       help='Score sliding windows of N sentences (heatmap) instead of the whole text')
+    parser.add_argument('--step', type=int, default=1, metavar='S',
+                       help='Sentences between heatmap windows (default: 1)')
+    parser.add_argument('--diversity', choices=DIVERSITY_MEASURES, default='ttr',
+                       help='Vocabulary diversity measure for the overall score; mattr and mtld do not '
+                            'penalize long texts (default: ttr)')
+    parser.add_argument('--near-duplicates', action='store_true',
+                       help='Group paragraph openings by MinHash similarity, not just identical prefixes')
+    parser.add_argument('--pack', action='append', default=[], metavar='FILE',
+                       help='Load extra transitions and abstract phrases from a JSON/TOML pattern pack (repeatable)')
+    parser.add_argument('--lang', choices=('auto',) + LANGUAGES, default='auto',
+                       help='Text language: tokenization rules and bundled pattern packs (default: detect)')
+    parser.add_argument('--timing', action='store_true',
+                       help='Measure time, regex calls and allocations per metric (bypasses the cache)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Run under cProfile and print the busiest functions to stderr')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the on-disk result cache')
+    parser.add_argument('--cache-stats', action='store_true',
+                       help='Show result cache statistics and exit')
     
     args = parser.parse_args()
     
+    if args.cache_stats:
+        cache = make_cache()
+        print(json.dumps(cache.stats(), indent=2) if args.json else cache.format_stats())
+        return
+    
+    cache = None if args.no_cache else make_cache()
+    
+    if not args.input_file:
+        parser.error('the following arguments are required: input_file')
+    
+    if args.stream and (args.pack or args.diversity != 'ttr'):
+        parser.error('--pack and --diversity are not supported with --stream')
+    if args.stream and args.timing:
+        parser.error('--timing is not supported with --stream; use --profile')
+    if args.window is not None and (args.stream or args.timing):
+        parser.error('--window cannot be combined with --stream or --timing')
+    if args.window is not None and (args.window < 1 or args.step < 1):
+        parser.error('--window and --step must be at least 1')
+    
+    try:
+        packs = load_packs(args.pack)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load pattern pack: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.stream:
+        # The streaming detector has English rules only; detect from the opening text
+        try:
+            with open(args.input_file, 'r', encoding='utf-8') as f:
+                language = resolve_language(args.lang, f.read(DETECT_SAMPLE))
+        except FileNotFoundError:
+            print(f"Error: File '{args.input_file}' not found", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error reading file: {e}", file=sys.stderr)
+            sys.exit(1)
+        if language != 'en':
+            parser.error(f"--stream supports English text only, and the text language is '{language}'; "
+                         f"run without --stream")
+        
+        def analyze_stream():
+            with open(args.input_file, 'r', encoding='utf-8') as f:
+                return StreamingAIDetector.from_file(f, near_duplicates=args.near_duplicates).analyze()
+        
+        try:
+            if cache is not None:
+                options = {'stream': True, 'language': language}
+                if args.near_duplicates:
+                    options['near_duplicates'] = True
+                results = cache.fetch(iter_file_chunks(args.input_file), options, analyze_stream)
+            else:
+                results = analyze_stream()
+        except FileNotFoundError:
+            print(f"Error: File '{args.input_file}' not found", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error reading file: {e}", file=sys.stderr)
+            sys.exit(1)
+        
+        if not results['text_stats']['words']:
+            print("Error: Input file is empty", file=sys.stderr)
+            sys.exit(1)
+        
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            print(AIDetector('').format_report(results, detailed=args.detailed))
+        return
+    
     # Read input file
     try:
         with open(args.input_file, 'r', encoding='utf-8') as f:
@@ -476,7 +1442,21 @@ Examples:
         sys.exit(1)
     
     # Run analysis
-    detector = AIDetector(text)
+    profiler = Profiler() if args.timing else None
+    if profiler is not None:
+        cache = None
+    try:
+        detector = AIDetector(text, cache=cache, near_duplicates=args.near_duplicates, packs=packs,
+                              language=args.lang, profiler=profiler, diversity=args.diversity)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load pattern pack: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.window is not None:
+        heatmap = detector.heatmap(window=args.window, step=args.step)
+        print(json.dumps(heatmap, indent=2) if args.json else detector.format_heatmap(heatmap))
+        return
+    
     results = detector.analyze()
     
     # Output results
@@ -484,7 +1464,9 @@ Examples:
         print(json.dumps(results, indent=2))
     else:
         print(detector.format_report(results, detailed=args.detailed))
+        if profiler is not None:
+            print(profiler.format_table())
 
 
 if __name__ == '__main__':
-    main()
+    run_main(main)
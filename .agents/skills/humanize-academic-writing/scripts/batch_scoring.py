@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Batch AI-Pattern Scoring for Many Short Texts
+
+Scores a list of texts (headline or post variants, skill blurbs) with the
+same metrics, thresholds and weights as AIDetector (the METRIC_LADDERS,
+METRIC_MINIMUMS and METRIC_WEIGHTS tables in ai_detector.py), without
+building a detector and its result dicts per text. Each text is reduced to a handful
+of raw counts; the derived values (sentence-length mean and spread,
+transition percentage, abstract density, TTR, passive percentage), the
+threshold ladders and the weighted overall score are then computed once
+for the whole batch.
+
+NumPy is optional: with it installed the batch math runs as array
+operations and arrays are returned; without it the same values are
+computed per text and returned as lists.
+"""
+
+import sys
+import json
+import math
+import argparse
+from collections import Counter
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from tokenization import SENTENCE_SPLIT, WORD_PATTERN, PASSIVE_PATTERNS
+from ai_detector import (
+    AIDetector, NearDuplicateIndex, METRIC_LADDERS, METRIC_MINIMUMS, METRIC_WEIGHTS,
+    paragraph_opening, count_pairs
+)
+from pattern_registry import REGISTRY
+
+
+# Raw per-text counts, in column order
+COUNT_FIELDS = [
+    'sentences', 'length_sum', 'length_sq_sum', 'transitions', 'abstract_phrases',
+    'words', 'unique_tokens', 'tokens', 'passive', 'paragraphs', 'similar_openings'
+]
+
+# Derived value each scored metric's ladder is applied to (TTR stands for
+# vocabulary diversity, as in AIDetector's default)
+LADDER_VALUES = {
+    'sentence_uniformity': 'variance_ratio',
+    'transition_overuse': 'transition_pct',
+    'abstract_language': 'abstract_density',
+    'vocabulary_diversity': 'ttr',
+    'passive_voice': 'passive_pct',
+    'paragraph_patterns': 'similarity_ratio',
+}
+
+# Count that has to reach a metric's METRIC_MINIMUMS entry
+MINIMUM_COUNTS = {
+    'sentence_uniformity': 'sentences',
+    'vocabulary_diversity': 'tokens',
+    'paragraph_patterns': 'paragraphs',
+}
+
+_TRANSITIONS = tuple(AIDetector.AI_TRANSITIONS)
+_PASSIVE = [REGISTRY.get(pattern) for pattern in PASSIVE_PATTERNS]
+
+
+def text_counts(text: str, near_duplicates: bool = False) -> List[int]:
+    """Reduce one text to the raw counts every metric is derived from.
+
+    Tokenizes exactly as TokenizedDocument does, but keeps only counts.
+    """
+    lengths = []
+    transitions = 0
+    for piece in SENTENCE_SPLIT.split(text):
+        sentence = piece.strip()
+        if sentence:
+            lengths.append(len(sentence.split()))
+            # Only the first 50 characters are compared, as in AIDetector
+            if sentence[:50].lower().startswith(_TRANSITIONS):
+                transitions += 1
+
+    lower = text.lower()
+    words = WORD_PATTERN.findall(lower)
+    abstract = sum(lower.count(phrase) for phrase in AIDetector.ABSTRACT_PHRASES)
+    passive = sum(len(pattern.findall(lower)) for pattern in _PASSIVE)
+
+    paragraphs = [p.strip() for p in text.split('\n\n')]
+    openings = [paragraph_opening(para) for para in paragraphs if para] or [paragraph_opening(text.strip())]
+    if near_duplicates:
+        index = NearDuplicateIndex()
+        for opening in openings:
+            index.add(opening)
+        similar = index.similar_pairs()
+    else:
+        similar = count_pairs(Counter(o.lower()[:20] for o in openings).values())
+
+    total = sum(lengths)
+    return [
+        len(lengths), total, sum(n * n for n in lengths), transitions, abstract,
+        total, len(set(words)), len(words), passive, len(openings), similar
+    ]
+
+
+class BatchScorer:
+    """Scores many texts at once with AIDetector's metrics and weights."""
+
+    def __init__(self, near_duplicates: bool = False, use_numpy: bool = True):
+        """use_numpy=False forces the pure-Python path even when NumPy is installed."""
+        self.near_duplicates = near_duplicates
+        self.use_numpy = use_numpy and np is not None
+
+    def score(self, texts: Sequence[str]) -> Dict:
+        """Score texts; returns overall scores plus per-metric scores and values.
+
+        Result layout (arrays with NumPy, lists without):
+            overall_score: weighted score per text, rounded to 3 places as
+                AIDetector reports it
+            scores: metric name -> per-text metric score
+            values: derived value name -> per-text value (the figures in each
+                metric's details: avg_length, std_dev, variance_ratio,
+                transition_pct, abstract_density, ttr, passive_pct,
+                similarity_ratio)
+            counts: raw count name -> per-text count
+        """
+        rows = [text_counts(text, self.near_duplicates) for text in texts]
+        if self.use_numpy:
+            return self._score_arrays(rows)
+        return self._score_lists(rows)
+
+    @staticmethod
+    def _score_arrays(rows: List[List[int]]) -> Dict:
+        counts = np.array(rows, dtype=np.int64).reshape(len(rows), len(COUNT_FIELDS))
+        c = {name: counts[:, i] for i, name in enumerate(COUNT_FIELDS)}
+        n = c['sentences']
+
+        def ratio(num, den, scale=1.0):
+            """num / den * scale, 0 where den is 0 (as the detector's guards do)."""
+            out = np.zeros(len(num))
+            np.divide(num, den, out=out, where=den > 0)
+            return out * scale if scale != 1.0 else out
+
+        # Sample standard deviation from exact integer sums, as statistics.stdev
+        avg_length = ratio(c['length_sum'], n)
+        spread = n * c['length_sq_sum'] - c['length_sum'] ** 2
+        std_dev = np.sqrt(ratio(spread, n * (n - 1)))
+        variance_ratio = ratio(std_dev, avg_length)
+        transition_pct = ratio(c['transitions'], n, 100)
+        abstract_density = ratio(c['abstract_phrases'], c['words'], 100)
+        ttr = ratio(c['unique_tokens'], c['tokens'])
+        passive_pct = ratio(c['passive'], n, 100)
+        similarity_ratio = ratio(c['similar_openings'], c['paragraphs'])
+        values = {
+            'avg_length': avg_length, 'std_dev': std_dev, 'variance_ratio': variance_ratio,
+            'transition_pct': transition_pct, 'abstract_density': abstract_density,
+            'ttr': ttr, 'passive_pct': passive_pct, 'similarity_ratio': similarity_ratio,
+        }
+
+        # The detector's threshold ladders, as one np.select per metric
+        scores = {}
+        for name, value_name in LADDER_VALUES.items():
+            comparison, steps, (fallback, _) = METRIC_LADDERS[name]
+            compare = np.less if comparison == '<' else np.greater
+            value = values[value_name]
+            score = np.select([compare(value, bound) for bound, _, _ in steps],
+                              [step_score for _, step_score, _ in steps], fallback)
+            if name in MINIMUM_COUNTS:
+                score = np.where(c[MINIMUM_COUNTS[name]] < METRIC_MINIMUMS[name], 0.0, score)
+            scores[name] = score
+
+        # Summed in the detector's order so the floats match exactly
+        overall = np.zeros(len(rows))
+        for name, weight in METRIC_WEIGHTS.items():
+            overall = overall + scores[name] * weight
+
+        return {
+            'overall_score': np.round(overall, 3),
+            'scores': scores,
+            'values': values,
+            'counts': c,
+        }
+
+    @staticmethod
+    def _score_lists(rows: List[List[int]]) -> Dict:
+        detector = AIDetector('')
+        values = {name: [] for name in ['avg_length', 'std_dev', 'variance_ratio', 'transition_pct',
+                                        'abstract_density', 'ttr', 'passive_pct', 'similarity_ratio']}
+        scores = {name: [] for name in METRIC_WEIGHTS}
+        overall = []
+
+        for row in rows:
+            c = dict(zip(COUNT_FIELDS, row))
+            n = c['sentences']
+            avg_length = c['length_sum'] / n if n else 0
+            std_dev = math.sqrt((n * c['length_sq_sum'] - c['length_sum'] ** 2) / (n * (n - 1))) if n > 1 else 0
+            row_values = {
+                'avg_length': avg_length,
+                'std_dev': std_dev,
+                'variance_ratio': std_dev / avg_length if avg_length > 0 else 0,
+                'transition_pct': c['transitions'] / n * 100 if n else 0,
+                'abstract_density': c['abstract_phrases'] / c['words'] * 100 if c['words'] else 0,
+                'ttr': c['unique_tokens'] / c['tokens'] if c['tokens'] else 0,
+                'passive_pct': c['passive'] / n * 100 if n else 0,
+                'similarity_ratio': c['similar_openings'] / c['paragraphs'] if c['paragraphs'] else 0,
+            }
+
+            # The detector's own metric functions apply the threshold ladders
+            metrics = {
+                'sentence_uniformity': {'score': 0} if n < METRIC_MINIMUMS['sentence_uniformity'] else
+                    detector._uniformity_metric(avg_length, std_dev),
+                'transition_overuse': detector._transition_metric(c['transitions'], n, []),
+                'abstract_language': detector._abstract_metric([], c['abstract_phrases'], c['words']),
+                'vocabulary_diversity': detector._diversity_metric(c['unique_tokens'], c['tokens']),
+                'passive_voice': detector._passive_metric(c['passive'], n),
+                'paragraph_patterns': {'score': 0} if c['paragraphs'] < METRIC_MINIMUMS['paragraph_patterns'] else
+                    detector._paragraph_metric(c['similar_openings'], c['paragraphs']),
+            }
+
+            for name, value in row_values.items():
+                values[name].append(value)
+            for name in METRIC_WEIGHTS:
+                scores[name].append(metrics[name]['score'])
+            overall.append(round(detector.calculate_overall_score(metrics), 3))
+
+        return {
+            'overall_score': overall,
+            'scores': scores,
+            'values': values,
+            'counts': {name: [row[i] for row in rows] for i, name in enumerate(COUNT_FIELDS)},
+        }
+
+
+def score_texts(texts: Sequence[str], near_duplicates: bool = False) -> Dict:
+    """Score a batch of texts (see BatchScorer.score)."""
+    return BatchScorer(near_duplicates=near_duplicates).score(texts)
+
+
+def _to_lists(result: Dict) -> Dict:
+    """Convert a result's arrays to plain lists for JSON output."""
+    def convert(value):
+        if isinstance(value, dict):
+            return {k: convert(v) for k, v in value.items()}
+        return value.tolist() if hasattr(value, 'tolist') else list(value)
+    return convert(result)
+
+
+def main():
+    """Command-line interface."""
+    parser = argparse.ArgumentParser(
+        description='Score many short texts for AI writing patterns in one batch',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python batch_scoring.py headlines.txt
+  python batch_scoring.py variants.jsonl --jsonl --json > scores.json
+        """
+    )
+
+    parser.add_argument('input_file', help="Texts to score, one per line ('-' for stdin)")
+    parser.add_argument('--jsonl', action='store_true',
+                       help='Input lines are JSON objects with a "text" field')
+    parser.add_argument('--json', action='store_true',
+                       help='Output all score, value and count arrays as JSON')
+    parser.add_argument('--near-duplicates', action='store_true',
+                       help='Group paragraph openings by MinHash similarity, as in ai_detector.py')
+
+    args = parser.parse_args()
+
+    try:
+        source = sys.stdin if args.input_file == '-' else open(args.input_file, 'r', encoding='utf-8')
+        with source:
+            lines = [line.rstrip('\n') for line in source if line.strip()]
+        texts = [json.loads(line)['text'] for line in lines] if args.jsonl else lines
+    except FileNotFoundError:
+        print(f"Error: File '{args.input_file}' not found", file=sys.stderr)
+        sys.exit(1)
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Error: invalid JSON lines input: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not texts:
+        print("Error: Input file is empty", file=sys.stderr)
+        sys.exit(1)
+
+    result = score_texts(texts, near_duplicates=args.near_duplicates)
+
+    if args.json:
+        print(json.dumps(_to_lists(result), indent=2))
+        return
+
+    print(f"{'Score':>6}  Text")
+    print("-" * 70)
+    for score, text in zip(result['overall_score'], texts):
+        print(f"{float(score):>6.1%}  {text[:60]}")
+
+
+if __name__ == '__main__':
+    main()
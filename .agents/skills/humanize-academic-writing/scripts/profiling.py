@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Opt-in Instrumentation for the Analysis and Cleanup Scripts
+
+A Profiler passed to AIDetector, TextAnalyzer, SlopDetector or SlopCleaner
+records, for every metric or cleaning stage it runs:
+
+  ms           wall time
+  regex_calls  calls to compiled-pattern methods (search, match, sub,
+               finditer, findall, split, ...), counted through
+               sys.setprofile; None when another profiler is installed
+  alloc_bytes  peak memory allocated during the stage, from tracemalloc
+
+The hooks slow the measured code down (tracemalloc especially), so compare
+stages within one run rather than against untimed runs. Without a
+profiler, the classes take no measurements at all.
+
+run_main() runs a script's main() under cProfile when --profile is on the
+command line and prints the pstats summary to stderr.
+
+The same module ships with the anti-slop and humanize-academic-writing
+skills; keep the two copies identical
+(tests/test_shared_modules.py fails when they differ).
+"""
+
+import re
+import sys
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Functions listed by the --profile summary
+PROFILE_LIMIT = 25
+
+
+class Profiler:
+    """Wall time, regex calls and allocated bytes per named stage."""
+
+    def __init__(self, count_regex: bool = True, trace_memory: bool = True):
+        self.count_regex = count_regex
+        self.trace_memory = trace_memory
+        # (name, ms, regex calls, allocated bytes), in run order
+        self.stages: List[tuple] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Measure the enclosed block as one stage."""
+        calls = [0]
+
+        def count(frame, event, arg):
+            if event == 'c_call' and isinstance(getattr(arg, '__self__', None), re.Pattern):
+                calls[0] += 1
+
+        counting = self.count_regex and sys.getprofile() is None
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        if counting:
+            sys.setprofile(count)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if counting:
+                sys.setprofile(None)
+            alloc = None
+            if self.trace_memory:
+                alloc = max(0, tracemalloc.get_traced_memory()[1] - base)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages.append((name, elapsed * 1000, calls[0] if counting else None, alloc))
+
+    def to_dict(self) -> Dict:
+        """Stage measurements as a JSON-serializable dict."""
+        return {
+            'total_ms': round(sum(ms for _, ms, _, _ in self.stages), 3),
+            'stages': [{'stage': name, 'ms': round(ms, 3), 'regex_calls': calls, 'alloc_bytes': alloc}
+                       for name, ms, calls, alloc in self.stages],
+        }
+
+    def format_table(self) -> str:
+        """Stage measurements as a compact text table."""
+        if not self.stages:
+            return "Timing: no stages ran (result taken from the cache)"
+        width = max(24, max(len(name) for name, _, _, _ in self.stages))
+        lines = [f"{'Stage':<{width}} {'ms':>10} {'regex calls':>12} {'alloc KB':>10}",
+                 "-" * (width + 35)]
+        for name, ms, calls, alloc in self.stages:
+            calls_text = '-' if calls is None else str(calls)
+            alloc_text = '-' if alloc is None else f"{alloc / 1024:.1f}"
+            lines.append(f"{name:<{width}} {ms:>10.2f} {calls_text:>12} {alloc_text:>10}")
+        lines.append(f"{'total':<{width}} {sum(ms for _, ms, _, _ in self.stages):>10.2f}")
+        return "\n".join(lines)
+
+
+def measure(profiler: Optional[Profiler], name: str, func: Callable, *args):
+    """Call func(*args), as a stage of profiler when one is given."""
+    if profiler is None:
+        return func(*args)
+    with profiler.stage(name):
+        return func(*args)
+
+
+def run_main(main: Callable, argv: List[str] = None, limit: int = PROFILE_LIMIT):
+    """Run main(), under cProfile when --profile is among the arguments.
+
+    The stats (sorted by cumulative time) go to stderr, so --json output on
+    stdout stays parseable. main() must accept --profile itself.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if '--profile' not in argv:
+        return main()
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(main)
+    finally:
+        stats = pstats.Stats(profile, stream=sys.stderr)
+        stats.sort_stats('cumulative').print_stats(limit)
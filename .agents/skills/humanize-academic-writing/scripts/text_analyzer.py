@@ -9,13 +9,45 @@ Provides quantitative metrics on text quality:
 - Readability scores
 """
 
-import re
+import os
 import sys
+import json
 import argparse
 from collections import Counter
-from typing import List, Dict, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional, Union
+import heapq
 import statistics
 
+from tokenization import TokenizedDocument
+from result_cache import ResultCache
+from pattern_packs import LANGUAGES, PatternPack, load_packs, language_packs, resolve_language
+from profiling import Profiler, measure, run_main
+from lexical_diversity import MATTR_WINDOW, mattr, mtld
+
+# This skill's bundled pattern packs (pattern_packs.language_packs)
+PACKS_DIR = Path(__file__).resolve().parent.parent / 'packs'
+
+# Columns of the revision comparison matrix: (key, label, section, field, preference).
+# preference is 'high' or 'low' for the better direction, a (low, high) band
+# when values inside it are best, or None for metrics shown but not ranked.
+MATRIX_METRICS = [
+    ('mean_sentence_length', 'Mean len', 'sentence_stats', 'mean', (12, 22)),
+    ('sentence_length_stdev', 'Stdev', 'sentence_stats', 'stdev', 'high'),
+    ('type_token_ratio', 'TTR', 'vocabulary', 'type_token_ratio', None),
+    ('mattr', 'MATTR', 'vocabulary', 'mattr', 'high'),
+    ('lexical_density', 'Lex dens', 'vocabulary', 'lexical_density', None),
+    ('transition_density', 'Trans/100', 'transitions', 'density_per_100_words', 'low'),
+    ('passive_pct', 'Passive %', 'passive_voice', 'percentage', 'low'),
+]
+
+# Files read by the corpus mode
+CORPUS_EXTENSIONS = ['.txt', '.md', '.tex']
+# Distinct words a corpus word counter keeps when rare ones are pruned
+CORPUS_MAX_TERMS = 50_000
+
 
 class TextAnalyzer:
     """Analyzes text quality metrics."""
@@ -35,27 +67,71 @@ class TextAnalyzer:
         'source', 'specific', 'structure', 'theory', 'variable'
     }
     
-    def __init__(self, text: str):
-        """Initialize with text to analyze."""
-        self.text = text
-        self.sentences = self._split_sentences()
-        self.words = self._extract_words()
+    # Transition words by language and category
+    TRANSITION_WORDS = {
+        'en': {
+            'additive': ['moreover', 'furthermore', 'additionally', 'also', 'besides'],
+            'adversative': ['however', 'nevertheless', 'nonetheless', 'yet', 'still'],
+            'causal': ['therefore', 'thus', 'consequently', 'hence', 'accordingly'],
+            'sequential': ['first', 'second', 'finally', 'subsequently', 'meanwhile']
+        },
+        'pt': {
+            'additive': ['além disso', 'ademais', 'adicionalmente', 'também', 'outrossim'],
+            'adversative': ['no entanto', 'entretanto', 'contudo', 'todavia', 'porém'],
+            'causal': ['portanto', 'assim', 'consequentemente', 'logo', 'por isso'],
+            'sequential': ['primeiro', 'segundo', 'finalmente', 'posteriormente', 'enquanto isso']
+        }
+    }
+    
+    def __init__(self, text: Union[str, TokenizedDocument], cache: Optional[ResultCache] = None,
+                 packs: Optional[List[PatternPack]] = None, language: str = 'en',
+                 profiler: Optional[Profiler] = None):
+        """Initialize with text (or an already tokenized document) to analyze.
+        
+        Tokenization is deferred until a metric needs it, so a cache hit in
+        analyze() never tokenizes the text. Pattern packs (see
+        pattern_packs.py) add words to the academic vocabulary.
         
-    def _split_sentences(self) -> List[str]:
-        """Split text into sentences."""
-        sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', self.text)
-        return [s.strip() for s in sentences if s.strip()]
+        language ('en', 'pt' or 'auto' to detect it) selects the tokenization
+        rules, the transition words and the bundled packs for that language.
+        With a profiler (see profiling.py), tokenization and each metric are
+        measured and analyze() adds a 'timing' entry to the results.
+        """
+        self._source = text
+        self._doc = None
+        self.cache = cache
+        self.profiler = profiler
+        if isinstance(text, TokenizedDocument):
+            self.language = text.language
+        else:
+            self.language = measure(profiler, 'language', resolve_language, language, text)
+        self.packs = language_packs(self.language, packs, PACKS_DIR)
+        self.academic_words = self.ACADEMIC_WORDS.union(*(pack.academic_words for pack in self.packs))
+    
+    @property
+    def doc(self) -> TokenizedDocument:
+        if self._doc is None:
+            self._doc = TokenizedDocument.of(self._source, self.language)
+        return self._doc
     
-    def _extract_words(self) -> List[str]:
-        """Extract words (lowercase, alphabetic only)."""
-        return re.findall(r'\b[a-z]+\b', self.text.lower())
+    @property
+    def text(self) -> str:
+        return self._source if isinstance(self._source, str) else self._source.text
+    
+    @property
+    def sentences(self) -> List[str]:
+        return self.doc.sentences
+    
+    @property
+    def words(self) -> List[str]:
+        return self.doc.words
     
     def sentence_length_stats(self) -> Dict:
         """Calculate sentence length statistics."""
         if not self.sentences:
             return {'error': 'No sentences found'}
         
-        lengths = [len(s.split()) for s in self.sentences]
+        lengths = self.doc.sentence_word_counts
         
         return {
             'count': len(lengths),
@@ -91,7 +167,7 @@ class TextAnalyzer:
         unique_words = set(self.words)
         word_freq = Counter(self.words)
         
-        # Type-Token Ratio
+        # Type-Token Ratio; it falls as texts get longer, MATTR and MTLD do not
         ttr = len(unique_words) / len(self.words)
         
         # Lexical density (content words / total words)
@@ -106,6 +182,8 @@ class TextAnalyzer:
             'total_words': len(self.words),
             'unique_words': len(unique_words),
             'type_token_ratio': round(ttr, 3),
+            'mattr': round(mattr(self.words), 3),
+            'mtld': round(mtld(self.words), 1),
             'lexical_density': round(lexical_density, 3),
             'most_common': most_common
         }
@@ -115,10 +193,10 @@ class TextAnalyzer:
         if not self.words:
             return {'error': 'No words found'}
         
-        academic_word_count = sum(1 for w in self.words if w in self.ACADEMIC_WORDS)
+        academic_word_count = sum(1 for w in self.words if w in self.academic_words)
         academic_pct = (academic_word_count / len(self.words)) * 100 if self.words else 0
         
-        found_academic_words = [w for w in self.words if w in self.ACADEMIC_WORDS]
+        found_academic_words = [w for w in self.words if w in self.academic_words]
         freq = Counter(found_academic_words)
         
         return {
@@ -129,14 +207,9 @@ class TextAnalyzer:
     
     def transition_word_analysis(self) -> Dict:
         """Analyze transition word usage."""
-        transitions = {
-            'additive': ['moreover', 'furthermore', 'additionally', 'also', 'besides'],
-            'adversative': ['however', 'nevertheless', 'nonetheless', 'yet', 'still'],
-            'causal': ['therefore', 'thus', 'consequently', 'hence', 'accordingly'],
-            'sequential': ['first', 'second', 'finally', 'subsequently', 'meanwhile']
-        }
+        transitions = self.TRANSITION_WORDS[self.language]
         
-        text_lower = self.text.lower()
+        text_lower = self.doc.lower
         results = {}
         total_transitions = 0
         
@@ -156,14 +229,7 @@ class TextAnalyzer:
     
     def passive_voice_analysis(self) -> Dict:
         """Analyze passive voice usage."""
-        # Simple passive detection
-        passive_patterns = [
-            r'\b(is|are|was|were|been|be|being)\s+\w+ed\b',
-            r'\b(is|are|was|were|been|be|being)\s+(shown|demonstrated|observed|found|noted|seen|considered|analyzed)\b'
-        ]
-        
-        passive_count = sum(len(re.findall(pattern, self.text.lower())) 
-                           for pattern in passive_patterns)
+        passive_count = self.doc.passive_count
         
         passive_pct = (passive_count / len(self.sentences)) * 100 if self.sentences else 0
         
@@ -196,14 +262,34 @@ class TextAnalyzer:
         }
     
     def analyze(self) -> Dict:
-        """Run full analysis."""
+        """Run full analysis (from the cache when one is set)."""
+        if self.cache is not None:
+            results = self.cache.fetch(self.text, self.cache_options(), self._analyze)
+        else:
+            results = self._analyze()
+        if self.profiler is not None:
+            results = dict(results, timing=self.profiler.to_dict())
+        return results
+    
+    def cache_options(self) -> Dict:
+        """Options that change the result, for the cache key."""
+        options = {'language': self.language} if self.language != 'en' else {}
+        if self.packs:
+            options['packs'] = [pack.digest for pack in self.packs]
+        return options
+    
+    def _analyze(self) -> Dict:
+        profiler = self.profiler
+        if profiler is not None:
+            # Tokenize up front so the first metric is not charged for it
+            measure(profiler, 'tokenize', lambda: self.doc)
         return {
-            'sentence_stats': self.sentence_length_stats(),
-            'vocabulary': self.vocabulary_metrics(),
-            'academic_vocabulary': self.academic_vocabulary_usage(),
-            'transitions': self.transition_word_analysis(),
-            'passive_voice': self.passive_voice_analysis(),
-            'readability': self.readability_metrics()
+            'sentence_stats': measure(profiler, 'sentence_stats', self.sentence_length_stats),
+            'vocabulary': measure(profiler, 'vocabulary', self.vocabulary_metrics),
+            'academic_vocabulary': measure(profiler, 'academic_vocabulary', self.academic_vocabulary_usage),
+            'transitions': measure(profiler, 'transitions', self.transition_word_analysis),
+            'passive_voice': measure(profiler, 'passive_voice', self.passive_voice_analysis),
+            'readability': measure(profiler, 'readability', self.readability_metrics)
         }
     
     def format_report(self, results: Dict) -> str:
@@ -237,17 +323,19 @@ class TextAnalyzer:
         vocab = results['vocabulary']
         report.append(f"Total Words: {vocab['total_words']}")
         report.append(f"Unique Words: {vocab['unique_words']}")
-        report.append(f"Type-Token Ratio: {vocab['type_token_ratio']} ", end="")
         
         ttr = vocab['type_token_ratio']
         if ttr > 0.55:
-            report.append("(Excellent diversity)")
+            rating = "(Excellent diversity)"
         elif ttr > 0.45:
-            report.append("(Good diversity)")
+            rating = "(Good diversity)"
         elif ttr > 0.35:
-            report.append("(Moderate diversity)")
+            rating = "(Moderate diversity)"
         else:
-            report.append("(Low diversity - consider varying vocabulary)")
+            rating = "(Low diversity - consider varying vocabulary)"
+        report.append(f"Type-Token Ratio: {ttr} {rating}")
+        report.append(f"MATTR ({MATTR_WINDOW}-word windows): {vocab['mattr']} (length-robust TTR)")
+        report.append(f"MTLD: {vocab['mtld']} words per factor")
         
         report.append(f"Lexical Density: {vocab['lexical_density']}")
         report.append("")
@@ -305,10 +393,12 @@ class TextAnalyzer:
         return "\n".join(report)
     
     @staticmethod
-    def compare_texts(text1: str, text2: str) -> str:
+    def compare_texts(text1: Union[str, TokenizedDocument],
+                      text2: Union[str, TokenizedDocument],
+                      packs: Optional[List[PatternPack]] = None, language: str = 'en') -> str:
         """Compare two texts and show differences."""
-        analyzer1 = TextAnalyzer(text1)
-        analyzer2 = TextAnalyzer(text2)
+        analyzer1 = TextAnalyzer(text1, packs=packs, language=language)
+        analyzer2 = TextAnalyzer(text2, packs=packs, language=analyzer1.language)
         
         results1 = analyzer1.analyze()
         results2 = analyzer2.analyze()
@@ -335,6 +425,7 @@ class TextAnalyzer:
         v1 = results1['vocabulary']
         v2 = results2['vocabulary']
         report.append(f"{'Type-Token Ratio':<20} {v1['type_token_ratio']:>15.3f} {v2['type_token_ratio']:>15.3f} {v2['type_token_ratio']-v1['type_token_ratio']:>+15.3f}")
+        report.append(f"{'MATTR':<20} {v1['mattr']:>15.3f} {v2['mattr']:>15.3f} {v2['mattr']-v1['mattr']:>+15.3f}")
         report.append(f"{'Lexical Density':<20} {v1['lexical_density']:>15.3f} {v2['lexical_density']:>15.3f} {v2['lexical_density']-v1['lexical_density']:>+15.3f}")
         
         # Compare transitions
@@ -359,6 +450,441 @@ class TextAnalyzer:
         return "\n".join(report)
 
 
+def make_cache() -> ResultCache:
+    """Result cache for this tool, versioned by its source files."""
+    here = Path(__file__).resolve().parent
+    version = ResultCache.source_version(here / 'text_analyzer.py', here / 'tokenization.py',
+                                         here / 'lexical_diversity.py', here / 'pattern_packs.py',
+                                         here / 'pattern_registry.py')
+    return ResultCache('text_analyzer', version)
+
+
+class CorpusStats:
+    """Mergeable partial aggregates of the TextAnalyzer metrics over many documents.
+    
+    Every field is a count or a counter, so partials built by different
+    workers merge() into the same corpus statistics whatever the split.
+    Only the word counter grows with the corpus: once it holds more than
+    twice max_terms distinct words, the max_terms most frequent are kept.
+    Totals stay exact; after pruning the unique-word count and TTR are
+    lower bounds and the top-word counts may be slightly low.
+    """
+    
+    def __init__(self, max_terms: int = CORPUS_MAX_TERMS):
+        self.max_terms = max_terms
+        self.files = 0
+        self.errors: List[Tuple[str, str]] = []
+        self.languages = Counter()
+        # words per sentence -> number of sentences
+        self.sentence_lengths = Counter()
+        self.word_counts = Counter()
+        self.academic_counts = Counter()
+        self.transitions = Counter()
+        self.passive = 0
+        self.words = 0
+        self.content_words = 0
+        self.complex_words = 0
+        self.word_chars = 0
+        self.vocabulary_pruned = False
+    
+    def add(self, analyzer: TextAnalyzer):
+        """Add one document's counts."""
+        doc = analyzer.doc
+        words = doc.words
+        self.files += 1
+        self.languages[analyzer.language] += 1
+        self.sentence_lengths.update(doc.sentence_word_counts)
+        self.word_counts.update(words)
+        self.academic_counts.update(w for w in words if w in analyzer.academic_words)
+        self.transitions.update(analyzer.transition_word_analysis()['by_category'])
+        self.passive += doc.passive_count
+        self.words += len(words)
+        lengths = [len(w) for w in words]
+        self.word_chars += sum(lengths)
+        self.content_words += sum(1 for l in lengths if l > 3)
+        self.complex_words += sum(1 for l in lengths if l > 6)
+        self._bound()
+    
+    def merge(self, other: 'CorpusStats') -> 'CorpusStats':
+        """Add another partial's counts to this one and return it."""
+        self.files += other.files
+        self.errors.extend(other.errors)
+        self.languages.update(other.languages)
+        self.sentence_lengths.update(other.sentence_lengths)
+        self.word_counts.update(other.word_counts)
+        self.academic_counts.update(other.academic_counts)
+        self.transitions.update(other.transitions)
+        self.passive += other.passive
+        self.words += other.words
+        self.word_chars += other.word_chars
+        self.content_words += other.content_words
+        self.complex_words += other.complex_words
+        self.vocabulary_pruned |= other.vocabulary_pruned
+        self._bound()
+        return self
+    
+    def _bound(self):
+        # Pruning only past twice the limit keeps it from running on every document
+        if len(self.word_counts) > 2 * self.max_terms:
+            self.prune()
+    
+    def prune(self):
+        """Keep the max_terms most frequent words.
+        
+        The distinct-word count is lost with the dropped words, so summary()
+        reports unique_words and TTR from then on as lower bounds.
+        """
+        if len(self.word_counts) > self.max_terms:
+            self.word_counts = Counter(dict(self.most_common(self.word_counts, self.max_terms)))
+            self.vocabulary_pruned = True
+    
+    @staticmethod
+    def most_common(counter: Counter, n: int) -> List[Tuple[str, int]]:
+        """Counter.most_common with ties broken by word, so the order does not depend on the merge order."""
+        return heapq.nsmallest(n, counter.items(), key=lambda item: (-item[1], item[0]))
+    
+    def _sentence_stats(self) -> Dict:
+        """Sentence length statistics from the histogram (as sentence_length_stats computes them)."""
+        histogram = sorted(self.sentence_lengths.items())
+        count = sum(n for _, n in histogram)
+        if not count:
+            return {'error': 'No sentences found'}
+        total = sum(length * n for length, n in histogram)
+        squares = sum(length * length * n for length, n in histogram)
+        
+        def nth(index: int) -> int:
+            seen = 0
+            for length, n in histogram:
+                seen += n
+                if seen > index:
+                    return length
+        
+        middle = count // 2
+        median = nth(middle) if count % 2 else (nth(middle - 1) + nth(middle)) / 2
+        variance = (count * squares - total * total) / (count * (count - 1)) if count > 1 else 0
+        short = sum(n for length, n in histogram if length < 12)
+        long = sum(n for length, n in histogram if length > 22)
+        return {
+            'count': count,
+            'min': histogram[0][0],
+            'max': histogram[-1][0],
+            'mean': round(total / count, 2),
+            'median': round(median, 2),
+            'stdev': round(variance ** 0.5, 2),
+            'distribution': {
+                'short (<12 words)': short,
+                'short_pct': round(short / count * 100, 1),
+                'medium (12-22 words)': count - short - long,
+                'medium_pct': round((count - short - long) / count * 100, 1),
+                'long (>22 words)': long,
+                'long_pct': round(long / count * 100, 1)
+            }
+        }
+    
+    def summary(self) -> Dict:
+        """Corpus-level statistics, in the sections TextAnalyzer.analyze() uses.
+        
+        unique_words, type_token_ratio and most_common are computed from the
+        word counter; once it has been pruned the vocabulary section says so
+        in 'pruned' and 'note', since the exact distinct count is gone.
+        """
+        words = self.words
+        sentences = sum(self.sentence_lengths.values())
+        transitions = sum(self.transitions.values())
+        academic = sum(self.academic_counts.values())
+        vocabulary = {
+            'total_words': words,
+            'unique_words': len(self.word_counts),
+            'type_token_ratio': round(len(self.word_counts) / words, 3) if words else 0,
+            'lexical_density': round(self.content_words / words, 3) if words else 0,
+            'most_common': self.most_common(self.word_counts, 10),
+            'pruned': self.vocabulary_pruned
+        }
+        if self.vocabulary_pruned:
+            vocabulary['note'] = (f"unique_words and type_token_ratio are counted after pruning to the "
+                                  f"{self.max_terms} most frequent words, so they are lower bounds")
+        return {
+            'files': self.files,
+            'errors': [{'file': path, 'error': message} for path, message in sorted(self.errors)],
+            'languages': dict(sorted(self.languages.items())),
+            'sentence_stats': self._sentence_stats(),
+            'vocabulary': vocabulary,
+            'academic_vocabulary': {
+                'academic_word_count': academic,
+                'percentage': round(academic / words * 100, 2) if words else 0,
+                'top_academic_words': self.most_common(self.academic_counts, 10)
+            },
+            'transitions': {
+                'total_transitions': transitions,
+                'density_per_100_words': round(transitions / words * 100, 2) if words else 0,
+                'by_category': {category: self.transitions[category]
+                                for category in TextAnalyzer.TRANSITION_WORDS['en']}
+            },
+            'passive_voice': {
+                'passive_constructions': self.passive,
+                'per_sentence': round(self.passive / sentences, 2) if sentences else 0,
+                'percentage': round(self.passive / sentences * 100, 1) if sentences else 0
+            },
+            'readability': {
+                'avg_sentence_length': round(words / sentences, 2) if sentences else 0,
+                'avg_word_length': round(self.word_chars / words, 2) if words else 0,
+                'complex_words': self.complex_words,
+                'complex_word_pct': round(self.complex_words / words * 100, 1) if words else 0
+            }
+        }
+
+
+@lru_cache(maxsize=8)
+def _worker_packs(paths: Tuple[str, ...]) -> List[PatternPack]:
+    """Pattern packs loaded once per worker process."""
+    return load_packs(list(paths))
+
+
+def analyze_revision(text: str, use_cache: bool = True, packs: Tuple[str, ...] = (),
+                     language: str = 'en') -> Dict:
+    """Analyze one revision and return TextAnalyzer.analyze() results (pool worker)."""
+    analyzer = TextAnalyzer(text, cache=make_cache() if use_cache else None,
+                            packs=_worker_packs(tuple(packs)), language=language)
+    return analyzer.analyze()
+
+
+def _badness(value: Optional[float], preference) -> Optional[float]:
+    """Distance from the preferred end or band; lower is better, None is unranked."""
+    if value is None:
+        return None
+    if preference == 'high':
+        return -value
+    if preference == 'low':
+        return value
+    low, high = preference
+    return max(low - value, value - high, 0)
+
+
+def compare_revisions(texts: List[str], names: Optional[List[str]] = None, workers: int = None,
+                      use_cache: bool = True, packs: Tuple[str, ...] = (),
+                      language: str = 'en') -> Dict:
+    """Analyze N revisions once each, in parallel, and rank them metric by metric.
+    
+    packs holds pattern pack paths (loaded once per worker). The language
+    is resolved from the first revision, so all revisions are tokenized
+    the same way. Each revision is ranked per metric (1 is best, ties
+    share a rank) and overall by the mean of its ranks over the metrics
+    with a preference in MATRIX_METRICS; a metric a revision lacks
+    (e.g. no sentences) ranks it last. Revisions with the same mean rank
+    keep their input order in the ranking.
+    """
+    names = list(names) if names is not None else [f'Text {i}' for i in range(1, len(texts) + 1)]
+    if len(names) != len(texts):
+        raise ValueError("names and texts must have the same length")
+    language = resolve_language(language, texts[0] if texts else '')
+    worker = partial(analyze_revision, use_cache=use_cache, packs=tuple(packs), language=language)
+    workers = min(len(texts), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        analyses = [worker(text) for text in texts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            analyses = list(pool.map(worker, texts))
+    
+    revisions = []
+    for name, results in zip(names, analyses):
+        metrics = {key: results.get(section, {}).get(field)
+                   for key, _, section, field, _ in MATRIX_METRICS}
+        revisions.append({'name': name, 'metrics': metrics, 'ranks': {}})
+    
+    ranked_keys = [key for key, _, _, _, preference in MATRIX_METRICS if preference is not None]
+    for key, _, _, _, preference in MATRIX_METRICS:
+        if preference is None:
+            continue
+        scores = [_badness(r['metrics'][key], preference) for r in revisions]
+        known = sorted(s for s in scores if s is not None)
+        for revision, score in zip(revisions, scores):
+            # Competition ranking: 1 + the number of strictly better revisions
+            revision['ranks'][key] = (1 + sum(1 for s in known if s < score)
+                                      if score is not None else len(revisions))
+    for revision in revisions:
+        ranks = [revision['ranks'][key] for key in ranked_keys]
+        revision['mean_rank'] = round(sum(ranks) / len(ranks), 2)
+    
+    order = sorted(range(len(revisions)), key=lambda i: (revisions[i]['mean_rank'], i))
+    for position, i in enumerate(order, 1):
+        revisions[i]['rank'] = position
+    
+    return {
+        'language': language,
+        'metrics': [{'key': key, 'label': label, 'prefer': preference}
+                    for key, label, _, _, preference in MATRIX_METRICS],
+        'revisions': revisions,
+        'ranking': [revisions[i]['name'] for i in order],
+    }
+
+
+def format_matrix(comparison: Dict) -> str:
+    """Format compare_revisions() output as a metric matrix and a ranked table."""
+    revisions = comparison['revisions']
+    width = max([8] + [len(r['name']) for r in revisions])
+    columns = [(m['key'], m['label']) for m in comparison['metrics']]
+    
+    def cell(value) -> str:
+        return f"{'-':>10}" if value is None else f"{value:>10.2f}"
+    
+    report = []
+    report.append("=" * 70)
+    report.append(f"REVISION COMPARISON MATRIX ({len(revisions)} texts)")
+    report.append("=" * 70)
+    report.append("")
+    report.append(f"{'Revision':<{width}} " + " ".join(f"{label:>10}" for _, label in columns))
+    report.append("-" * (width + 11 * len(columns)))
+    for r in revisions:
+        report.append(f"{r['name']:<{width}} " + " ".join(cell(r['metrics'][key]) for key, _ in columns))
+    
+    preferences = []
+    for m in comparison['metrics']:
+        prefer = m['prefer']
+        if prefer is None:
+            preferences.append(f"{m['label']}: not ranked")
+        elif isinstance(prefer, str):
+            preferences.append(f"{m['label']}: {'higher' if prefer == 'high' else 'lower'} is better")
+        else:
+            preferences.append(f"{m['label']}: best within {prefer[0]}-{prefer[1]}")
+    report.append("")
+    report.append("Preferences: " + "; ".join(preferences))
+    
+    ranked = [(key, label) for key, label in columns if any(key in r['ranks'] for r in revisions)]
+    report.append("")
+    report.append("RANKING (mean rank over the ranked metrics, 1 = best)")
+    report.append("-" * 70)
+    report.append(f"{'#':>3}  {'Revision':<{width}} {'Mean':>6} " + " ".join(f"{label:>10}" for _, label in ranked))
+    for r in sorted(revisions, key=lambda r: r['rank']):
+        report.append(f"{r['rank']:>3}  {r['name']:<{width}} {r['mean_rank']:>6.2f} "
+                      + " ".join(f"{r['ranks'][key]:>10}" for key, _ in ranked))
+    
+    report.append("")
+    report.append("=" * 70)
+    return "\n".join(report)
+
+
+def collect_corpus_files(inputs: List[str]) -> List[Path]:
+    """Expand files and directories (searched recursively) into a sorted, de-duplicated list."""
+    found = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found.update(p for p in path.rglob('*')
+                         if p.is_file() and p.suffix.lower() in CORPUS_EXTENSIONS)
+        elif path.is_file():
+            found.add(path)
+    return sorted(found)
+
+
+def analyze_corpus_chunk(paths: List[str], packs: Tuple[str, ...] = (), language: str = 'auto',
+                         max_terms: int = CORPUS_MAX_TERMS) -> CorpusStats:
+    """Map step: the partial aggregates of a chunk of files (pool worker)."""
+    stats = CorpusStats(max_terms)
+    loaded = _worker_packs(tuple(packs))
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            stats.errors.append((path, str(e)))
+            continue
+        stats.add(TextAnalyzer(text, packs=loaded, language=language))
+    return stats
+
+
+def analyze_corpus(files: List[Path], workers: int = None, packs: Tuple[str, ...] = (),
+                   language: str = 'auto', max_terms: int = CORPUS_MAX_TERMS,
+                   chunk_size: int = None) -> CorpusStats:
+    """Map the files to partials across a process pool and reduce them into one CorpusStats.
+    
+    Files go to workers in chunks (one partial per chunk), and at most two
+    chunks per worker are in flight, so memory stays bounded by the number
+    of workers and max_terms rather than by the corpus size. With
+    language='auto' each file's language is detected separately.
+    """
+    paths = [str(p) for p in files]
+    workers = min(len(paths), workers or os.cpu_count() or 1)
+    chunk_size = chunk_size or max(1, min(64, len(paths) // (max(workers, 1) * 4)))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    mapper = partial(analyze_corpus_chunk, packs=tuple(packs), language=language, max_terms=max_terms)
+    
+    total = CorpusStats(max_terms)
+    if workers <= 1:
+        for chunk in chunks:
+            total.merge(mapper(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        total.merge(future.result())
+                pending.add(pool.submit(mapper, chunk))
+            for future in pending:
+                total.merge(future.result())
+    total.prune()
+    return total
+
+
+def format_corpus_report(summary: Dict) -> str:
+    """Format CorpusStats.summary() as a readable report."""
+    report = []
+    report.append("=" * 70)
+    report.append(f"CORPUS ANALYSIS REPORT ({summary['files']} files)")
+    report.append("=" * 70)
+    report.append("")
+    languages = ", ".join(f"{lang}: {n}" for lang, n in sorted(summary['languages'].items()))
+    report.append(f"Languages: {languages or '-'}")
+    for error in summary['errors']:
+        report.append(f"ERROR  {error['file']}: {error['error']}")
+    
+    stats = summary['sentence_stats']
+    report.append("")
+    report.append("SENTENCE STATISTICS")
+    report.append("-" * 70)
+    if 'error' in stats:
+        report.append(stats['error'])
+    else:
+        dist = stats['distribution']
+        report.append(f"Total Sentences: {stats['count']}")
+        report.append(f"Length Range: {stats['min']}-{stats['max']} words")
+        report.append(f"Mean / Median / Stdev: {stats['mean']} / {stats['median']} / {stats['stdev']} words")
+        report.append(f"Short / Medium / Long: {dist['short_pct']}% / {dist['medium_pct']}% / {dist['long_pct']}%")
+    
+    vocab = summary['vocabulary']
+    report.append("")
+    report.append("VOCABULARY")
+    report.append("-" * 70)
+    report.append(f"Total Words: {vocab['total_words']}")
+    bound = " (at least; rare words pruned)" if vocab['pruned'] else ""
+    report.append(f"Unique Words: {vocab['unique_words']}{bound}")
+    report.append(f"Type-Token Ratio: {vocab['type_token_ratio']}{bound}")
+    report.append(f"Lexical Density: {vocab['lexical_density']}")
+    report.append("Most Frequent Words:")
+    for word, count in vocab['most_common'][:10]:
+        report.append(f"  {word:15s} {count:7d}x")
+    
+    acad = summary['academic_vocabulary']
+    trans = summary['transitions']
+    passive = summary['passive_voice']
+    read = summary['readability']
+    report.append("")
+    report.append("STYLE")
+    report.append("-" * 70)
+    report.append(f"Academic Words: {acad['academic_word_count']} ({acad['percentage']}% of total)")
+    report.append(f"Transitions: {trans['total_transitions']} ({trans['density_per_100_words']} per 100 words)")
+    for category, count in trans['by_category'].items():
+        report.append(f"  {category.capitalize():15s} {count:7d}")
+    report.append(f"Passive Constructions: {passive['passive_constructions']} ({passive['percentage']}% of sentences)")
+    report.append(f"Average Word Length: {read['avg_word_length']} characters")
+    report.append(f"Complex Words: {read['complex_words']} ({read['complex_word_pct']}%)")
+    
+    report.append("")
+    report.append("=" * 70)
+    return "\n".join(report)
+
+
 def main():
     """Command-line interface."""
     parser = argparse.ArgumentParser(
@@ -368,51 +894,135 @@ def main():
 Examples:
   python text_analyzer.py input.txt
   python text_analyzer.py original.txt revised.txt --compare
+  python text_analyzer.py variants/*.md --matrix
+  python text_analyzer.py v1.txt v2.txt v3.txt --json --workers 4
+  python text_analyzer.py --corpus data/output/ --workers 8
+  python text_analyzer.py --corpus corpus/ --max-terms 20000 --json
+  python text_analyzer.py artigo.txt --pack ../packs/pt-br.toml
+  python text_analyzer.py artigo.txt --lang pt
+  python text_analyzer.py input.txt --timing
+  python text_analyzer.py input.txt --profile
+  python text_analyzer.py --cache-stats
         """
     )
     
-    parser.add_argument('input_file', help='Text file to analyze')
-    parser.add_argument('input_file2', nargs='?', help='Second text file for comparison')
+    parser.add_argument('input_files', nargs='*', metavar='input_file',
+                       help='Text file to analyze (two to compare, more for a comparison matrix)')
     parser.add_argument('--compare', action='store_true',
                        help='Compare two text files')
+    ranked = ', '.join(label for _, label, _, _, preference in MATRIX_METRICS if preference is not None)
+    unranked = ', '.join(label for _, label, _, _, preference in MATRIX_METRICS if preference is None)
+    matrix_help = (f'Compare any number of files in one metric matrix, ranked by the mean of their '
+                   f'ranks on {ranked} ({unranked}: shown, not ranked; ties keep the input order)')
+    parser.add_argument('--matrix', action='store_true',
+                       # argparse %-formats help strings, and 'Passive %' is a label
+                       help=matrix_help.replace('%', '%%'))
+    parser.add_argument('--json', action='store_true',
+                       help='Print the analysis (one file) or the comparison matrix (several) as JSON')
+    parser.add_argument('--corpus', action='store_true',
+                       help='Aggregate statistics over every .txt/.md/.tex file under the given paths')
+    parser.add_argument('--max-terms', type=int, default=CORPUS_MAX_TERMS, metavar='N',
+                       help=f'Distinct words kept by the corpus word counter (default: {CORPUS_MAX_TERMS})')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for the comparison matrix or corpus (default: CPU count)')
+    parser.add_argument('--pack', action='append', default=[], metavar='FILE',
+                       help='Add academic words from a JSON/TOML pattern pack (repeatable)')
+    parser.add_argument('--lang', choices=('auto',) + LANGUAGES, default='auto',
+                       help='Text language: tokenization rules and bundled pattern packs (default: detect)')
+    parser.add_argument('--timing', action='store_true',
+                       help='Measure time, regex calls and allocations per metric (bypasses the cache)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Run under cProfile and print the busiest functions to stderr')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the on-disk result cache')
+    parser.add_argument('--cache-stats', action='store_true',
+                       help='Show result cache statistics and exit')
     
     args = parser.parse_args()
     
-    # Read first file
-    try:
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            text1 = f.read()
-    except FileNotFoundError:
-        print(f"Error: File '{args.input_file}' not found", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"Error reading file: {e}", file=sys.stderr)
-        sys.exit(1)
+    if args.cache_stats:
+        print(make_cache().format_stats())
+        return
     
-    if not text1.strip():
-        print("Error: Input file is empty", file=sys.stderr)
-        sys.exit(1)
+    cache = None if args.no_cache or args.timing else make_cache()
     
-    # Comparison mode
-    if args.compare or args.input_file2:
-        if not args.input_file2:
-            print("Error: Two files required for comparison", file=sys.stderr)
+    if not args.input_files:
+        parser.error('the following arguments are required: input_file')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.max_terms < 1:
+        parser.error('--max-terms must be at least 1')
+    
+    if args.corpus:
+        if args.timing or args.matrix or args.compare:
+            parser.error('--corpus cannot be combined with --timing, --matrix or --compare')
+        files = collect_corpus_files(args.input_files)
+        if not files:
+            print("Error: No matching files found", file=sys.stderr)
             sys.exit(1)
-        
         try:
-            with open(args.input_file2, 'r', encoding='utf-8') as f:
-                text2 = f.read()
+            load_packs(args.pack)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot load pattern pack: {e}", file=sys.stderr)
+            sys.exit(1)
+        # Map: per-chunk partials in worker processes; reduce: merged here as they finish
+        stats = analyze_corpus(files, workers=args.workers, packs=tuple(args.pack), language=args.lang,
+                               max_terms=args.max_terms)
+        summary = stats.summary()
+        print(json.dumps(summary, indent=2, ensure_ascii=False) if args.json else format_corpus_report(summary))
+        return
+    
+    # Several files: the pairwise report for exactly two (as before), else the matrix
+    matrix = args.matrix or len(args.input_files) > 2 or (args.json and len(args.input_files) > 1)
+    if args.timing and len(args.input_files) > 1:
+        parser.error('--timing analyzes a single file')
+    
+    try:
+        packs = load_packs(args.pack)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load pattern pack: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    texts = []
+    for input_file in args.input_files:
+        try:
+            with open(input_file, 'r', encoding='utf-8') as f:
+                texts.append(f.read())
         except FileNotFoundError:
-            print(f"Error: File '{args.input_file2}' not found", file=sys.stderr)
+            print(f"Error: File '{input_file}' not found", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Error reading file: {e}", file=sys.stderr)
             sys.exit(1)
         
-        print(TextAnalyzer.compare_texts(text1, text2))
+        if not texts[-1].strip():
+            print(f"Error: Input file is empty: {input_file}", file=sys.stderr)
+            sys.exit(1)
+    
+    if matrix:
+        # Each revision is analyzed once, across worker processes
+        comparison = compare_revisions(texts, names=args.input_files, workers=args.workers,
+                                       use_cache=cache is not None, packs=tuple(args.pack),
+                                       language=args.lang)
+        print(json.dumps(comparison, indent=2, ensure_ascii=False) if args.json else format_matrix(comparison))
+    elif args.compare or len(texts) == 2:
+        if len(texts) != 2:
+            print("Error: Two files required for comparison", file=sys.stderr)
+            sys.exit(1)
+        
+        print(TextAnalyzer.compare_texts(texts[0], texts[1], packs=packs, language=args.lang))
     else:
         # Single file analysis
-        analyzer = TextAnalyzer(text1)
+        profiler = Profiler() if args.timing else None
+        analyzer = TextAnalyzer(texts[0], cache=cache, packs=packs, language=args.lang, profiler=profiler)
         results = analyzer.analyze()
-        print(analyzer.format_report(results))
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        else:
+            print(analyzer.format_report(results))
+            if profiler is not None:
+                print(profiler.format_table())
 
 
 if __name__ == '__main__':
-    main()
+    run_main(main)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Shared Tokenization for the Analysis Scripts
+
+Splits a text into paragraphs, sentences and words once, so that
+AIDetector and TextAnalyzer can run their full metric suites over the
+same document without re-tokenizing or re-lowercasing it.
+
+English keeps the original ASCII rules. Other languages (see TOKENIZERS)
+use Unicode rules: the text is NFC-normalized, words are runs of any
+letters, and a sentence may start with an accented capital or an opening
+quote, so "É" and "À" begin sentences and accented words stay whole.
+"""
+
+import unicodedata
+from array import array
+from typing import Iterable, List, Union
+
+from pattern_registry import REGISTRY
+from pattern_packs import resolve_language
+
+
+# Sentence boundary: terminal punctuation, whitespace, then a capital
+SENTENCE_SPLIT = REGISTRY.get(r'(?<=[.!?])\s+(?=[A-Z])', owner='tokenization')
+
+# Sentence boundary inside a paragraph, used for paragraph openings
+PARAGRAPH_SENTENCE_SPLIT = REGISTRY.get(r'(?<=[.!?])\s+', owner='tokenization')
+
+# Lowercase alphabetic words
+WORD_PATTERN = REGISTRY.get(r'\b[a-z]+\b', owner='tokenization')
+
+# Simple passive detection: "be" verbs + past participle patterns
+PASSIVE_PATTERNS = [
+    r'\b(is|are|was|were|been|be|being)\s+\w+ed\b',
+    r'\b(is|are|was|were|been|be|being)\s+(shown|demonstrated|observed|found|noted|seen|considered|analyzed)\b'
+]
+
+# Unicode sentence boundary: also '…', and an accented capital or opening quote
+UNICODE_SENTENCE_SPLIT = REGISTRY.get(r'(?<=[.!?…])\s+(?=["“«(]?[A-ZÀ-ÖØ-Þ])', owner='tokenization')
+
+# Words as runs of letters in any script, lowercase after text.lower()
+UNICODE_WORD_PATTERN = REGISTRY.get(r'\b[^\W\d_]+\b', owner='tokenization')
+
+# Portuguese passive: "ser" forms + regular or common irregular participle
+PT_PASSIVE_PATTERNS = [
+    r'\b(é|são|foi|foram|era|eram|será|serão|seria|seriam|sido|ser|sendo)\s+\w+(?:ad|id)[oa]s?\b',
+    r'\b(é|são|foi|foram|era|eram|será|serão|seria|seriam|sido|ser|sendo)\s+(feit|dit|vist|escrit|abert|post)[oa]s?\b'
+]
+
+for _pattern in PASSIVE_PATTERNS + PT_PASSIVE_PATTERNS:
+    REGISTRY.register(_pattern, 0, 'tokenization')
+
+# Language -> (sentence split, word pattern, passive patterns)
+TOKENIZERS = {
+    'en': (SENTENCE_SPLIT, WORD_PATTERN, PASSIVE_PATTERNS),
+    'pt': (UNICODE_SENTENCE_SPLIT, UNICODE_WORD_PATTERN, PT_PASSIVE_PATTERNS),
+}
+
+
+class TokenizedDocument:
+    """A text tokenized once into compact span arrays.
+
+    Sentence and paragraph spans are offsets into ``text`` (stripped, empty
+    pieces dropped); word spans are offsets into ``lower``, since lowercasing
+    can change the length of some characters.
+    """
+
+    def __init__(self, text: str, language: str = 'en'):
+        """Tokenize text into paragraphs, sentences and words.
+
+        language is a TOKENIZERS key, or 'auto' to detect it from the text.
+        """
+        self.language = resolve_language(language, text)
+        self._sentence_split, self._word_pattern, self._passive_patterns = TOKENIZERS[self.language]
+        if self.language != 'en' and not unicodedata.is_normalized('NFC', text):
+            text = unicodedata.normalize('NFC', text)
+        self.text = text
+        self.lower = text.lower()
+
+        self.sentence_starts = array('l')
+        self.sentence_ends = array('l')
+        self.sentence_word_counts = array('l')
+        self._split_sentences()
+
+        self.paragraph_starts = array('l')
+        self.paragraph_ends = array('l')
+        self._split_paragraphs()
+
+        self.words = self._word_pattern.findall(self.lower)
+        self.token_count = sum(self.sentence_word_counts)
+
+        self._sentences = None
+        self._paragraphs = None
+        self._word_spans = None
+        self._passive_count = None
+
+    @classmethod
+    def of(cls, source: Union[str, 'TokenizedDocument'], language: str = 'en') -> 'TokenizedDocument':
+        """Return source unchanged if already tokenized, else tokenize it."""
+        if isinstance(source, cls):
+            return source
+        return cls(source, language)
+
+    def _split_sentences(self):
+        """Record the stripped span and word count of every sentence."""
+        text = self.text
+        start = 0
+        for m in self._sentence_split.finditer(text):
+            self._add_sentence(start, m.start())
+            start = m.end()
+        self._add_sentence(start, len(text))
+
+    def _add_sentence(self, start: int, end: int):
+        piece = self.text[start:end]
+        stripped = piece.strip()
+        if not stripped:
+            return
+        start += len(piece) - len(piece.lstrip())
+        self.sentence_starts.append(start)
+        self.sentence_ends.append(start + len(stripped))
+        self.sentence_word_counts.append(len(stripped.split()))
+
+    def _split_paragraphs(self):
+        """Record the stripped span of every paragraph (blank-line separated)."""
+        text = self.text
+        start = 0
+        while True:
+            end = text.find('\n\n', start)
+            piece_end = len(text) if end == -1 else end
+            piece = text[start:piece_end]
+            stripped = piece.strip()
+            if stripped:
+                offset = start + len(piece) - len(piece.lstrip())
+                self.paragraph_starts.append(offset)
+                self.paragraph_ends.append(offset + len(stripped))
+            if end == -1:
+                break
+            start = end + 2
+
+        if not self.paragraph_starts:
+            # If no double newlines, treat whole text as one paragraph
+            offset = len(text) - len(text.lstrip())
+            self.paragraph_starts.append(offset)
+            self.paragraph_ends.append(offset + len(text.strip()))
+
+    @property
+    def sentences(self) -> List[str]:
+        """Sentence strings, materialized on first use."""
+        if self._sentences is None:
+            text = self.text
+            self._sentences = [text[s:e] for s, e in zip(self.sentence_starts, self.sentence_ends)]
+        return self._sentences
+
+    @property
+    def paragraphs(self) -> List[str]:
+        """Paragraph strings, materialized on first use."""
+        if self._paragraphs is None:
+            text = self.text
+            self._paragraphs = [text[s:e] for s, e in zip(self.paragraph_starts, self.paragraph_ends)]
+        return self._paragraphs
+
+    @property
+    def word_spans(self) -> array:
+        """Flat (start, end) offsets of each word in ``lower``, computed on first use."""
+        if self._word_spans is None:
+            spans = array('l')
+            for m in self._word_pattern.finditer(self.lower):
+                spans.extend(m.span())
+            self._word_spans = spans
+        return self._word_spans
+
+    @property
+    def passive_count(self) -> int:
+        """Number of passive constructions, shared by both analyzers."""
+        if self._passive_count is None:
+            self._passive_count = sum(len(REGISTRY.get(pattern).findall(self.lower))
+                                      for pattern in self._passive_patterns)
+        return self._passive_count
+
+    def passive_starts(self) -> List[int]:
+        """Sorted offsets in ``lower`` of the passive constructions passive_count counts."""
+        return sorted(m.start() for pattern in self._passive_patterns
+                      for m in REGISTRY.get(pattern).finditer(self.lower))
+
+    def lower_offsets(self, offsets: Iterable[int]) -> List[int]:
+        """Map increasing offsets in ``text`` to the same positions in ``lower``."""
+        offsets = list(offsets)
+        if len(self.lower) == len(self.text):
+            return offsets
+        # Some characters change length when lowercased; walk the pieces between offsets
+        mapped, previous, shift = [], 0, 0
+        for offset in offsets:
+            piece = self.text[previous:offset]
+            shift += len(piece.lower()) - len(piece)
+            mapped.append(offset + shift)
+            previous = offset
+        return mapped
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the Text Analysis Scripts
+
+Generates synthetic corpora at several sizes (from a LinkedIn post to a
+thesis) and slop-phrase densities, then times the public entry points of
+the anti-slop and humanize-academic-writing scripts. Records throughput
+in words/sec and peak memory (via tracemalloc), and writes the results as
+JSON so runs from different commits can be diffed with --compare. Also
+measures startup cost in a fresh interpreter: importing the four scripts
+and compiling every pattern in the shared registry.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+SKILLS = ROOT / '.agents' / 'skills'
+sys.path.insert(0, str(SKILLS / 'anti-slop' / 'scripts'))
+sys.path.insert(0, str(SKILLS / 'humanize-academic-writing' / 'scripts'))
+
+from ai_detector import AIDetector
+from text_analyzer import TextAnalyzer
+from detect_slop import SlopDetector
+from clean_slop import SlopCleaner
+
+
+SCHEMA_VERSION = 1
+
+# Corpus sizes in words
+SIZES = {
+    'post': 200,
+    'article': 2_000,
+    'chapter': 20_000,
+    'thesis': 100_000,
+}
+
+# Slop phrases inserted per 100 words
+DENSITIES = {
+    'clean': 0.0,
+    'typical': 2.0,
+    'heavy': 8.0,
+}
+
+FILLER_WORDS = """
+    team project data results users growth revenue pipeline model system
+    design review release launch customer market product process report
+    analysis feedback quality metric budget roadmap hiring interview role
+    skills experience manager engineer research survey study method sample
+    built shipped measured reduced improved led wrote tested planned owned
+    during after before across within through with for from into about
+    the a an our their this that each every some most many two three
+    weekly quarterly new small large early late clear simple direct fast
+""".split()
+
+SLOP_PHRASES = [
+    "delve into", "navigate the complexities of", "in today's fast-paced world,",
+    "it's important to note that", "at the end of the day,", "leverage",
+    "synergistic", "paradigm shift", "cutting-edge", "world-class", "utilize",
+    "in order to", "due to the fact that", "may or may not", "could potentially",
+    "it seems that", "generally speaking,", "very unique", "end result",
+    "really important", "Moreover,", "Furthermore,", "Additionally,",
+    "In conclusion,", "game-changer", "holistic approach", "robust",
+]
+
+
+def make_corpus(words: int, density: float, seed: int = 0) -> str:
+    """Generate roughly `words` words of prose with `density` slop phrases per 100 words."""
+    rng = random.Random(seed)
+    paragraphs = []
+    count = 0
+    while count < words:
+        sentences = []
+        for _ in range(rng.randint(3, 7)):
+            length = rng.randint(8, 30)
+            tokens = [rng.choice(FILLER_WORDS) for _ in range(length)]
+            # On average `density` of every 100 filler words become a phrase
+            for _ in range(length):
+                if density and rng.random() < density / 100:
+                    tokens[rng.randrange(length)] = rng.choice(SLOP_PHRASES)
+            sentence = ' '.join(tokens)
+            sentences.append(sentence[0].upper() + sentence[1:] + '.')
+            count += length
+            if count >= words:
+                break
+        paragraphs.append(' '.join(sentences))
+    return '\n\n'.join(paragraphs) + '\n'
+
+
+class Case:
+    """One corpus, available as text and as a file for the path-based tools."""
+
+    def __init__(self, size: str, density: str, directory: Path, seed: int):
+        self.size = size
+        self.density = density
+        self.text = make_corpus(SIZES[size], DENSITIES[density], seed)
+        self.words = len(self.text.split())
+        # Same size without slop, the "after" side of compare_texts
+        self.baseline = make_corpus(SIZES[size], 0.0, seed + 1)
+        self.path = directory / f'{size}-{density}.md'
+        self.path.write_text(self.text, encoding='utf-8')
+
+
+# name -> (callable, words processed per call)
+ENTRY_POINTS: Dict[str, tuple] = {
+    'AIDetector.analyze': (
+        lambda c: AIDetector(c.text).analyze(),
+        lambda c: c.words),
+    'TextAnalyzer.analyze': (
+        lambda c: TextAnalyzer(c.text).analyze(),
+        lambda c: c.words),
+    'TextAnalyzer.compare_texts': (
+        lambda c: TextAnalyzer.compare_texts(c.text, c.baseline),
+        lambda c: c.words + len(c.baseline.split())),
+    'SlopDetector.analyze': (
+        lambda c: SlopDetector(str(c.path)).analyze(),
+        lambda c: c.words),
+    'SlopCleaner.clean': (
+        lambda c: SlopCleaner(str(c.path)).clean(),
+        lambda c: c.words),
+}
+
+
+def measure(func: Callable[[], object], repeat: int, memory: bool) -> Dict:
+    """Time func `repeat` times, then run it once more under tracemalloc."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        # Traced separately: tracemalloc slows allocation-heavy code a lot
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'seconds_min': min(timings),
+        'seconds_median': statistics.median(timings),
+        'peak_kib': round(peak / 1024, 1) if peak is not None else None,
+    }
+
+
+# Runs in a fresh interpreter; prints import and pattern compile times as JSON
+STARTUP_PROBE = """
+import sys, json, time
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+import ai_detector, text_analyzer, detect_slop, clean_slop
+imported = time.perf_counter()
+from pattern_registry import REGISTRY
+REGISTRY.warm()
+print(json.dumps({{'import_ms': (imported - start) * 1000, 'compile_ms': REGISTRY.stats()['compile_ms'],
+                  'patterns': len(REGISTRY.owners)}}))
+"""
+
+
+def measure_startup(repeat: int) -> Dict:
+    """Time module imports and full pattern compilation in fresh interpreters (best of repeat)."""
+    probe = STARTUP_PROBE.format(paths=[str(SKILLS / 'humanize-academic-writing' / 'scripts'),
+                                        str(SKILLS / 'anti-slop' / 'scripts')])
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout))
+    return {
+        'import_ms': round(min(r['import_ms'] for r in runs), 2),
+        'pattern_compile_ms': round(min(r['compile_ms'] for r in runs), 2),
+        'patterns': runs[0]['patterns'],
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_suite(entries: List[str], sizes: List[str], densities: List[str],
+              repeat: int = 3, memory: bool = True, seed: int = 0,
+              progress: Callable[[str], None] = None) -> Dict:
+    """Run every selected entry point on every corpus and return the results document."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench-text-') as tmp:
+        for size in sizes:
+            for density in densities:
+                case = Case(size, density, Path(tmp), seed)
+                for name in entries:
+                    func, words = ENTRY_POINTS[name]
+                    if progress:
+                        progress(f"{name} on {size}/{density} ({case.words} words)")
+                    stats = measure(lambda: func(case), repeat, memory)
+                    processed = words(case)
+                    results.append({
+                        'entry': name,
+                        'size': size,
+                        'density': density,
+                        'words': processed,
+                        'phrases_per_100_words': DENSITIES[density],
+                        **stats,
+                        'words_per_sec': round(processed / stats['seconds_min']) if stats['seconds_min'] else None,
+                    })
+
+    return {
+        'schema': SCHEMA_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'seed': seed,
+        'startup': measure_startup(repeat),
+        'results': results,
+    }
+
+
+def format_report(doc: Dict) -> str:
+    """Format a results document as a readable table."""
+    report = []
+    report.append("=" * 70)
+    report.append("TEXT TOOLS BENCHMARK")
+    report.append("=" * 70)
+    report.append(f"Commit: {doc['commit'] or 'unknown'}  Python: {doc['python']}  Repeat: {doc['repeat']}")
+    startup = doc.get('startup')
+    if startup:
+        report.append(f"Startup: imports {startup['import_ms']:.1f} ms, compiling all "
+                      f"{startup['patterns']} patterns {startup['pattern_compile_ms']:.1f} ms")
+    report.append("")
+    report.append(f"{'Entry point':<27} {'Corpus':<16} {'Words':>7} {'Words/sec':>11} {'Peak KiB':>9}")
+    report.append("-" * 70)
+    for r in doc['results']:
+        peak = f"{r['peak_kib']:>9.0f}" if r['peak_kib'] is not None else f"{'-':>9}"
+        report.append(f"{r['entry']:<27} {r['size'] + '/' + r['density']:<16} "
+                      f"{r['words']:>7} {r['words_per_sec'] or 0:>11,} {peak}")
+    report.append("=" * 70)
+    return "\n".join(report)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Return a line per result whose throughput dropped by more than threshold."""
+    index = {(r['entry'], r['size'], r['density']): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        old = index.get((r['entry'], r['size'], r['density']))
+        if not old or not old['words_per_sec'] or not r['words_per_sec']:
+            continue
+        ratio = r['words_per_sec'] / old['words_per_sec']
+        if ratio < 1 - threshold:
+            regressions.append(f"{r['entry']} on {r['size']}/{r['density']}: "
+                               f"{old['words_per_sec']:,} -> {r['words_per_sec']:,} words/sec ({ratio - 1:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the text analysis and slop scripts on synthetic corpora',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/bench_text_tools.py
+  python scripts/bench_text_tools.py --quick
+  python scripts/bench_text_tools.py --json bench.json
+  python scripts/bench_text_tools.py --sizes thesis --entries SlopCleaner.clean
+  python scripts/bench_text_tools.py --json new.json --compare old.json
+        """
+    )
+
+    parser.add_argument('--entries', nargs='+', choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS),
+                        help='Entry points to time (default: all)')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES),
+                        help='Corpus sizes (default: all)')
+    parser.add_argument('--densities', nargs='+', choices=list(DENSITIES), default=list(DENSITIES),
+                        help='Slop phrase densities (default: all)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per measurement; the fastest is reported (default: 3)')
+    parser.add_argument('--quick', action='store_true',
+                        help='Only the post and article sizes, one timed run each')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the tracemalloc peak-memory run')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus generator seed')
+    parser.add_argument('--json', metavar='FILE',
+                        help="Write machine-readable results to FILE ('-' for stdout)")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='Compare throughput with an earlier --json file; exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Slowdown fraction counted as a regression (default: 0.10)')
+
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        print("Error: --repeat must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    sizes = args.sizes
+    repeat = args.repeat
+    if args.quick:
+        sizes = [s for s in sizes if s in ('post', 'article')] or ['post']
+        repeat = 1
+
+    baseline = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read baseline '{args.compare}': {e}", file=sys.stderr)
+            sys.exit(1)
+
+    doc = run_suite(args.entries, sizes, args.densities, repeat=repeat,
+                    memory=not args.no_memory, seed=args.seed,
+                    progress=lambda msg: print(f"  {msg}", file=sys.stderr))
+
+    if args.json == '-':
+        print(json.dumps(doc, indent=2))
+    else:
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(doc, f, indent=2)
+                f.write('\n')
+        print(format_report(doc))
+
+    if baseline is not None:
+        regressions = compare(baseline, doc, args.threshold)
+        out = sys.stderr if args.json == '-' else sys.stdout
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} regression(s) against {args.compare}:", file=out)
+            for line in regressions:
+                print(f"  • {line}", file=out)
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.compare}", file=out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Asyncio Scoring Service for Many Short Texts
+
+Scores texts with AIDetector.analyze and SlopDetector.analyze from
+asyncio code without blocking the event loop. Small texts are collected
+into batches (bounded by count and total characters), so dozens of
+headline or post variants cost one round trip, and several batches run at
+once on a pool of worker processes. Texts above a size threshold go to a
+separate process pool, so one huge document never delays the small ones.
+The number of requests in flight is bounded (callers wait for a slot),
+and each request has a timeout and a language ('auto' by default, as in
+the scripts).
+
+Used as a library:
+
+    async with ScoringService() as service:
+        results = await service.score_many(drafts, tool='ai')
+
+or as a JSON-lines filter, answering each request as soon as it is done:
+
+    python scripts/text_scoring_service.py < requests.jsonl > results.jsonl
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+ROOT = Path(__file__).resolve().parent.parent
+SKILLS = ROOT / '.agents' / 'skills'
+sys.path.insert(0, str(SKILLS / 'anti-slop' / 'scripts'))
+sys.path.insert(0, str(SKILLS / 'humanize-academic-writing' / 'scripts'))
+
+from ai_detector import AIDetector
+from detect_slop import SlopDetector
+from pattern_packs import resolve_language
+
+
+TOOLS = ('ai', 'slop')
+
+
+class ScoringError(Exception):
+    """A text could not be scored; the message comes from the worker."""
+
+
+def score_text(tool: str, text: str, language: str = 'auto') -> Dict:
+    """Score one text with the given tool (runs in a worker process)."""
+    if tool == 'ai':
+        return AIDetector(text, language=language).analyze()
+    if tool == 'slop':
+        results = SlopDetector.from_text(text, language=language).analyze()
+        return dict(results, findings=results['findings'].to_dict())
+    raise ValueError(f"unknown tool '{tool}' (expected one of: {', '.join(TOOLS)})")
+
+
+def score_batch(jobs: List[Tuple[str, str, str]]) -> List[Tuple[bool, Union[Dict, str]]]:
+    """Score a batch of (tool, text, language) jobs; each outcome is (ok, result or error message)."""
+    outcomes = []
+    for tool, text, language in jobs:
+        try:
+            outcomes.append((True, score_text(tool, text, language)))
+        except Exception as e:
+            outcomes.append((False, f"{type(e).__name__}: {e}"))
+    return outcomes
+
+
+class ScoringService:
+    """Concurrent front end to the detectors with batching, backpressure and timeouts."""
+
+    def __init__(self, workers: int = None, max_pending: int = 256, timeout: float = 30.0,
+                 batch_size: int = 32, batch_window: float = 0.005, heavy_chars: int = 20_000,
+                 batch_chars: int = 64_000):
+        """Configure the service; worker processes start with start() or `async with`.
+
+        workers: processes in each pool, the small-text pool and the
+            large-text pool (default: CPU count - 1, at least 1)
+        max_pending: requests admitted at once; further callers wait for a slot
+        timeout: default seconds per request (None for no limit)
+        batch_size, batch_chars, batch_window: a batch is sent when it holds
+            batch_size texts, when the next text would take it past
+            batch_chars characters, or batch_window seconds after its first
+            text arrived
+        heavy_chars: texts at least this long bypass batching and go to the
+            large-text pool
+        """
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.batch_chars = batch_chars
+        self.batch_window = batch_window
+        self.heavy_chars = heavy_chars
+        # Two batches per worker keep every worker busy while results travel back
+        self.batches_in_flight = 2 * self.workers
+
+        self._slots = None
+        self._in_flight = 0
+        self._queue = None
+        self._batcher = None
+        self._batch_slots = None
+        self._batch_tasks = set()
+        self._small_pool = None
+        self._heavy_pool = None
+
+    async def start(self):
+        """Start the worker pools and the batching task."""
+        if self._batcher is not None:
+            return
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._queue = asyncio.Queue()
+        self._batch_slots = asyncio.Semaphore(self.batches_in_flight)
+        self._small_pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._heavy_pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._batcher = asyncio.create_task(self._run_batches())
+
+    async def close(self):
+        """Stop batching and shut the worker pools down."""
+        if self._batcher is None:
+            return
+        tasks = [self._batcher, *self._batch_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._batcher = None
+        for pool in (self._small_pool, self._heavy_pool):
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> 'ScoringService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def pending(self) -> int:
+        """Requests admitted and not yet answered."""
+        return self._in_flight
+
+    async def score(self, text: str, tool: str = 'ai', timeout: Optional[float] = ...,
+                    language: str = 'auto') -> Dict:
+        """Score one text; raises asyncio.TimeoutError or ScoringError on failure.
+
+        timeout defaults to the service's; None waits indefinitely. A
+        timed-out request is answered immediately, but a large text already
+        running in a worker process finishes there and its result is dropped.
+        language is 'en', 'pt' or 'auto' to detect it per text; an
+        unsupported one raises ValueError.
+        """
+        if tool not in TOOLS:
+            raise ValueError(f"unknown tool '{tool}' (expected one of: {', '.join(TOOLS)})")
+        resolve_language(language)
+        if self._batcher is None:
+            raise RuntimeError('ScoringService is not started')
+        timeout = self.timeout if timeout is ... else timeout
+
+        async with self._slots:
+            self._in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                if len(text) >= self.heavy_chars:
+                    future = loop.run_in_executor(self._heavy_pool, score_batch, [(tool, text, language)])
+                    ok, result = (await asyncio.wait_for(future, timeout))[0]
+                else:
+                    future = loop.create_future()
+                    await self._queue.put((tool, text, language, future))
+                    ok, result = await asyncio.wait_for(future, timeout)
+            finally:
+                self._in_flight -= 1
+
+        if not ok:
+            raise ScoringError(result)
+        return result
+
+    async def score_many(self, texts: Sequence[str], tool: str = 'ai', timeout: Optional[float] = ...,
+                         language: str = 'auto') -> List[Union[Dict, Exception]]:
+        """Score texts concurrently; failures come back as exception objects, in input order."""
+        return await asyncio.gather(*(self.score(text, tool, timeout, language) for text in texts),
+                                    return_exceptions=True)
+
+    async def _run_batches(self):
+        """Collect queued small texts into batches and keep up to batches_in_flight running.
+
+        While every batch slot is busy, new texts wait in the queue, so the
+        next batch fills up instead of being sent one text at a time.
+        """
+        loop = asyncio.get_running_loop()
+        carried = None
+        while True:
+            await self._batch_slots.acquire()
+            batch = [carried if carried is not None else await self._queue.get()]
+            carried = None
+            chars = len(batch[0][1])
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    job = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if chars + len(job[1]) > self.batch_chars:
+                    # Starts the next batch
+                    carried = job
+                    break
+                batch.append(job)
+                chars += len(job[1])
+
+            task = asyncio.create_task(self._score_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _score_batch(self, batch: List[Tuple[str, str, str, asyncio.Future]]):
+        """Score one batch in a worker process and answer its requests."""
+        try:
+            # Requests that timed out while queued need no work
+            batch = [job for job in batch if not job[3].done()]
+            if not batch:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                outcomes = await loop.run_in_executor(
+                    self._small_pool, score_batch, [(tool, text, language) for tool, text, language, _ in batch])
+            except Exception as e:
+                outcomes = [(False, f"{type(e).__name__}: {e}")] * len(batch)
+            for (_, _, _, future), outcome in zip(batch, outcomes):
+                if not future.done():
+                    future.set_result(outcome)
+        finally:
+            self._batch_slots.release()
+
+
+def _valid_timeout(timeout) -> bool:
+    """True for a request timeout the service accepts: absent (...), null or seconds >= 0."""
+    if timeout is ... or timeout is None:
+        return True
+    return isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and timeout >= 0
+
+
+async def serve_jsonl(service: ScoringService, source, out):
+    """Answer JSON-lines requests ({"id", "tool", "text", "language"}) in completion order."""
+    loop = asyncio.get_running_loop()
+    tasks = set()
+    # Stop reading ahead while max_pending requests are unanswered
+    admitted = asyncio.Semaphore(service.max_pending)
+
+    async def answer(request: Dict):
+        record = {'id': request.get('id')}
+        text = request.get('text')
+        timeout = request.get('timeout', ...)
+        language = request.get('language', 'auto')
+        try:
+            if not isinstance(text, str):
+                record['error'] = "request needs a 'text' string"
+            elif not _valid_timeout(timeout):
+                record['error'] = "'timeout' must be a non-negative number of seconds or null"
+            elif not isinstance(language, str):
+                record['error'] = "'language' must be a string ('en', 'pt' or 'auto')"
+            else:
+                record['result'] = await service.score(text, request.get('tool', 'ai'), timeout, language)
+        except asyncio.TimeoutError:
+            record['error'] = 'timeout'
+        except (ScoringError, ValueError) as e:
+            record['error'] = str(e)
+        finally:
+            admitted.release()
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        out.flush()
+
+    while True:
+        # Reading blocks, so it runs in a thread
+        line = await loop.run_in_executor(None, source.readline)
+        if not line:
+            break
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            out.write(json.dumps({'id': None, 'error': f'invalid JSON: {e}'}) + '\n')
+            continue
+        if not isinstance(request, dict):
+            request = {}
+        await admitted.acquire()
+        task = asyncio.create_task(answer(request))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def _main(args):
+    async with ScoringService(workers=args.workers, max_pending=args.max_pending,
+                              timeout=args.timeout or None, batch_size=args.batch_size,
+                              batch_chars=args.batch_chars) as service:
+        await serve_jsonl(service, sys.stdin, sys.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Score many texts concurrently with AIDetector and SlopDetector',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Each input line is a JSON object: {"id": ..., "tool": "ai"|"slop", "text": "..."}
+(optional "timeout" in seconds and "language": "en"|"pt"|"auto", default "auto"). Each output line is {"id": ..., "result": {...}}
+or {"id": ..., "error": "..."}, written as soon as that request finishes.
+
+Examples:
+  python scripts/text_scoring_service.py < requests.jsonl > results.jsonl
+  python scripts/text_scoring_service.py --workers 4 --timeout 5 < variants.jsonl
+        """
+    )
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes per pool, for batches and for large texts (default: CPU count - 1)')
+    parser.add_argument('--max-pending', type=int, default=256,
+                        help='Requests in flight before reading stops (default: 256)')
+    parser.add_argument('--timeout', type=float, default=30.0,
+                        help='Seconds per request, 0 for no limit (default: 30)')
+    parser.add_argument('--batch-size', type=int, default=32,
+                        help='Small texts scored per worker call (default: 32)')
+    parser.add_argument('--batch-chars', type=int, default=64_000,
+                        help='Characters per batch; a longer text gets a batch of its own (default: 64000)')
+    args = parser.parse_args()
+
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.max_pending < 1 or args.batch_size < 1 or args.batch_chars < 1:
+        parser.error('--max-pending, --batch-size and --batch-chars must be at least 1')
+
+    asyncio.run(_main(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Thin Client for the Text Tools Daemon
+
+Forwards an analysis request to a running text_tools_server.py over its
+Unix socket and prints the result the way the standalone script would.
+Only the standard library's socket and json modules are imported, so a
+call costs interpreter startup plus one round trip instead of importing
+and compiling the analyzers every time. The daemon is started on first
+use unless --no-start is given.
+
+Protocol: one JSON-RPC 2.0 request object per line, one response per line.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+
+# Idle daemons started by the client exit after this many seconds
+AUTOSTART_IDLE_TIMEOUT = 1800
+
+USAGE = """Usage: python text_tools_client.py [--socket PATH] [--no-start] <tool> [args]
+
+Tools:
+  ai_detector FILE [--json] [--detailed] [--near-duplicates] [--lang LANG] [--no-cache]
+              [--diversity ttr|mattr|mtld]
+  text_analyzer FILE [FILE2 --compare] [--lang LANG] [--no-cache]
+  detect_slop FILE [--json] [--verbose] [--lang LANG] [--no-cache]
+  clean_slop FILE [--aggressive] [--save] [--output FILE] [--lang LANG]
+  call METHOD [PARAMS_JSON]      Send a raw request and print the result
+  ping                           Check that the daemon is running
+  shutdown                       Stop the daemon
+
+FILE may be '-' to send the text piped on stdin instead of a path.
+
+Examples:
+  python scripts/text_tools_client.py ai_detector draft.md --detailed
+  python scripts/text_tools_client.py detect_slop post.md --json
+  pbpaste | python scripts/text_tools_client.py detect_slop - --json
+  python scripts/text_tools_client.py call methods
+"""
+
+
+class DaemonError(Exception):
+    """Error response returned by the daemon."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def default_socket_path() -> str:
+    """Socket path shared by the client and server (TEXT_TOOLS_SOCKET overrides)."""
+    if os.environ.get('TEXT_TOOLS_SOCKET'):
+        return os.environ['TEXT_TOOLS_SOCKET']
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f'text-tools-{os.getuid()}.sock')
+
+
+class Client:
+    """Persistent connection to the daemon; requests are answered in order."""
+
+    def __init__(self, path: str = None, start: bool = True, timeout: float = 5.0):
+        self.path = path or default_socket_path()
+        self.sock = self._connect(start, timeout)
+        self.stream = self.sock.makefile('rwb')
+        self.next_id = 1
+
+    def _connect(self, start: bool, timeout: float) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+            return sock
+        except OSError:
+            if not start:
+                sock.close()
+                raise
+        sock.close()
+
+        self._spawn()
+        deadline = time.monotonic() + timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.path)
+                return sock
+            except OSError:
+                sock.close()
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.02)
+
+    def _spawn(self):
+        """Start the daemon in the background, detached from this process."""
+        import subprocess
+        server = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'text_tools_server.py')
+        subprocess.Popen([sys.executable, server, '--socket', self.path,
+                          '--idle-timeout', str(AUTOSTART_IDLE_TIMEOUT)],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+
+    def call(self, method: str, params: dict = None):
+        """Send one request and return its result, raising DaemonError on failure."""
+        request = {'jsonrpc': '2.0', 'id': self.next_id, 'method': method, 'params': params or {}}
+        self.next_id += 1
+        self.stream.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.stream.flush()
+        line = self.stream.readline()
+        if not line:
+            raise DaemonError(-32000, 'Daemon closed the connection')
+        response = json.loads(line)
+        if 'error' in response:
+            raise DaemonError(response['error']['code'], response['error']['message'])
+        return response['result']
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+
+def _split_args(argv):
+    """Split argv into positionals and a dict of --flags (--output, --lang and --diversity take a value)."""
+    positional, flags = [], {}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ('--output', '--socket', '--lang', '--diversity') and i + 1 < len(argv):
+            flags[arg] = argv[i + 1]
+            i += 2
+            continue
+        if arg.startswith('--'):
+            flags[arg] = True
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, flags
+
+
+def _source(path: str, suffix: str = '') -> dict:
+    """Request params naming the input: the stdin text for '-', else the absolute path."""
+    if path == '-':
+        return {'text' + suffix: sys.stdin.read()}
+    return {'path' + suffix: path}
+
+
+def build_request(tool: str, files, flags):
+    """Map a tool invocation onto a daemon method and its params."""
+    paths = [f if f == '-' else os.path.abspath(f) for f in files]
+    cache = '--no-cache' not in flags
+    language = flags.get('--lang', 'auto')
+    if tool == 'ai_detector' and len(paths) == 1:
+        return 'ai_detector.analyze', {
+            **_source(paths[0]), 'cache': cache, 'report': '--json' not in flags,
+            'detailed': '--detailed' in flags, 'near_duplicates': '--near-duplicates' in flags,
+            'language': language, 'diversity': flags.get('--diversity', 'ttr')}
+    if tool == 'text_analyzer' and len(paths) == 2:
+        return 'text_analyzer.compare', {**_source(paths[0], '1'), **_source(paths[1], '2'),
+                                         'language': language}
+    if tool == 'text_analyzer' and len(paths) == 1:
+        return 'text_analyzer.analyze', {**_source(paths[0]), 'cache': cache, 'report': True,
+                                         'language': language}
+    if tool == 'detect_slop' and len(paths) == 1:
+        return 'detect_slop.analyze', {
+            **_source(paths[0]), 'cache': cache, 'report': '--json' not in flags,
+            'verbose': '--verbose' in flags, 'language': language}
+    if tool == 'clean_slop' and len(paths) == 1:
+        output = flags.get('--output')
+        return 'clean_slop.clean', {
+            **_source(paths[0]), 'aggressive': '--aggressive' in flags,
+            'save': '--save' in flags or output is not None,
+            'output': os.path.abspath(output) if output else None, 'report': True,
+            'language': language}
+    return None, None
+
+
+def main():
+    positional, flags = _split_args(sys.argv[1:])
+    if not positional or '--help' in flags:
+        print(USAGE)
+        sys.exit(0 if '--help' in flags else 1)
+
+    tool, args = positional[0], positional[1:]
+    if tool in ('ping', 'shutdown'):
+        method, params = tool, {}
+    elif tool == 'call' and args:
+        method = args[0]
+        try:
+            params = json.loads(args[1]) if len(args) > 1 else {}
+        except ValueError as e:
+            print(f"Error: invalid params JSON: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        method, params = build_request(tool, args, flags)
+        if method is None:
+            print(USAGE, file=sys.stderr)
+            sys.exit(1)
+
+    try:
+        client = Client(flags.get('--socket'), start=tool != 'shutdown' and '--no-start' not in flags)
+    except OSError as e:
+        print(f"Error: cannot reach the text tools daemon: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        result = client.call(method, params)
+    except DaemonError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        client.close()
+
+    if isinstance(result, dict) and result.get('report') is not None:
+        print(result['report'], end='' if result['report'].endswith('\n') else '\n')
+    elif isinstance(result, dict) and 'results' in result:
+        print(json.dumps(result['results'], indent=2, ensure_ascii=False))
+    else:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
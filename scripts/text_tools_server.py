@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Text Tools Daemon
+
+Hosts AIDetector, TextAnalyzer, SlopDetector and SlopCleaner in one
+long-running process, so agent loops that run the detectors dozens of
+times per session pay interpreter startup, imports and pattern
+compilation once. Requests are JSON-RPC 2.0 objects, one per line, read
+from a Unix socket (default) or from stdin with replies on stdout.
+
+Methods (params in parentheses; `text` may be given instead of `path`):
+  ai_detector.analyze   (path|text, near_duplicates, language, diversity, cache, report,
+                         detailed)
+  ai_detector.update    (session, path|text, near_duplicates, language) incremental re-scoring;
+                        English text only
+  ai_detector.close     (session)
+  text_analyzer.analyze (path|text, language, cache, report)
+  text_analyzer.compare (path1|text1, path2|text2, language)
+  detect_slop.analyze   (path|text, language, cache, report, verbose)
+  clean_slop.clean      (path|text, aggressive, language, save, output, report)
+  patterns.stats        compiled-pattern registry counts and compile time
+  ping, methods, shutdown
+
+language is 'en', 'pt' or 'auto' (the default, as in the scripts);
+diversity is 'ttr' (the default), 'mattr' or 'mtld'. The incremental
+detector behind ai_detector.update has English rules only, so an update
+whose language is (or is detected as) anything else is rejected.
+
+ai_detector.update keeps an incremental detector per session until
+ai_detector.close. Sessions a client never closes are dropped after
+--session-ttl seconds without updates, or least recently updated first
+once more than --max-sessions are open; the next update just starts over.
+
+Every result is an object with the tool's result dict under "results"
+and, when report is true, the script's text output under "report".
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import socketserver
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+SKILLS = ROOT / '.agents' / 'skills'
+sys.path.insert(0, str(SKILLS / 'anti-slop' / 'scripts'))
+sys.path.insert(0, str(SKILLS / 'humanize-academic-writing' / 'scripts'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import ai_detector
+import text_analyzer
+import detect_slop
+import clean_slop
+from pattern_registry import REGISTRY
+from pattern_packs import resolve_language
+from text_tools_client import default_socket_path
+
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+TOOL_ERROR = -32000
+
+# Incremental sessions kept at most (least recently updated dropped first)
+MAX_SESSIONS = 64
+# Seconds after its last update that an unclosed session is dropped
+SESSION_TTL = 3600.0
+
+WARM_TEXT = """In this post we will explore synergy. Moreover, it is important to note that results were analyzed.
+
+Furthermore, the data was shown to play a crucial role. We delve into various aspects of the model.
+
+Additionally, the team leveraged a holistic approach. It seems that the end result was very unique.
+"""
+
+
+class RequestError(Exception):
+    """A request that cannot be served; carries its JSON-RPC error code."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class ToolHost:
+    """Runs tool requests against the already imported, warm analyzers."""
+
+    def __init__(self, use_cache: bool = True, max_sessions: int = MAX_SESSIONS,
+                 session_ttl: float = SESSION_TTL):
+        """max_sessions and session_ttl bound the incremental sessions that
+        clients open with ai_detector.update and may never close."""
+        self.use_cache = use_cache
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.started = time.time()
+        self.requests = 0
+        self.last_activity = time.monotonic()
+        self.stop_requested = threading.Event()
+        # Incremental detectors kept between ai_detector.update calls, least
+        # recently updated first, with the monotonic time of their last update
+        self.sessions: 'OrderedDict[str, ai_detector.IncrementalAIDetector]' = OrderedDict()
+        self._session_used: Dict[str, float] = {}
+        self._sessions_lock = threading.Lock()
+        # Report capture swaps sys.stdout, which is process-wide
+        self._stdout_lock = threading.Lock()
+        self._caches = {}
+        self.methods: Dict[str, Callable[[Dict], Dict]] = {
+            'ai_detector.analyze': self.ai_detector_analyze,
+            'ai_detector.update': self.ai_detector_update,
+            'ai_detector.close': self.ai_detector_close,
+            'text_analyzer.analyze': self.text_analyzer_analyze,
+            'text_analyzer.compare': self.text_analyzer_compare,
+            'detect_slop.analyze': self.detect_slop_analyze,
+            'clean_slop.clean': self.clean_slop_clean,
+            'patterns.stats': lambda params: {'results': REGISTRY.stats(),
+                                              'report': REGISTRY.format_stats() + '\n'},
+            'ping': self.ping,
+            'methods': lambda params: {'results': sorted(self.methods)},
+            'shutdown': self.shutdown,
+        }
+
+    def cache(self, module, params: Dict):
+        """The tool's result cache, unless disabled for the daemon or the request."""
+        if not self.use_cache or not params.get('cache', True):
+            return None
+        if module.__name__ not in self._caches:
+            self._caches[module.__name__] = module.make_cache()
+        return self._caches[module.__name__]
+
+    def capture(self, func: Callable[[], object]) -> str:
+        """Run func and return what it printed."""
+        buffer = io.StringIO()
+        with self._stdout_lock, redirect_stdout(buffer):
+            func()
+        return buffer.getvalue()
+
+    @staticmethod
+    def file_path(params: Dict, key: str = 'path') -> str:
+        """Return params[key], checking that it names an existing file."""
+        path = params.get(key)
+        if not isinstance(path, str):
+            raise RequestError(INVALID_PARAMS, f"'{key}' is required")
+        if not Path(path).is_file():
+            raise RequestError(TOOL_ERROR, f"File '{path}' not found")
+        return path
+
+    @staticmethod
+    def read_text(params: Dict, suffix: str = '') -> str:
+        """Return params['text'+suffix], or the contents of params['path'+suffix]."""
+        if isinstance(params.get('text' + suffix), str):
+            text = params['text' + suffix]
+        elif 'path' + suffix in params:
+            with open(ToolHost.file_path(params, 'path' + suffix), 'r', encoding='utf-8') as f:
+                text = f.read()
+        else:
+            raise RequestError(INVALID_PARAMS, f"'path{suffix}' or 'text{suffix}' is required")
+        if not text.strip():
+            raise RequestError(TOOL_ERROR, "Input file is empty")
+        return text
+
+    @staticmethod
+    def slop_source(params: Dict) -> Dict:
+        """Constructor arguments for the anti-slop tools: the in-memory text, or the file path."""
+        if isinstance(params.get('text'), str):
+            return {'text': params['text']}
+        if 'path' in params:
+            return {'filepath': ToolHost.file_path(params)}
+        raise RequestError(INVALID_PARAMS, "'path' or 'text' is required")
+
+    def ai_detector_analyze(self, params: Dict) -> Dict:
+        detector = ai_detector.AIDetector(self.read_text(params), cache=self.cache(ai_detector, params),
+                                          near_duplicates=bool(params.get('near_duplicates')),
+                                          language=params.get('language', 'auto'),
+                                          diversity=params.get('diversity', 'ttr'))
+        results = detector.analyze()
+        reply = {'results': results}
+        if params.get('report'):
+            reply['report'] = detector.format_report(results, detailed=bool(params.get('detailed')))
+        return reply
+
+    def ai_detector_update(self, params: Dict) -> Dict:
+        session = params.get('session')
+        if not isinstance(session, str):
+            raise RequestError(INVALID_PARAMS, "'session' is required")
+        text = self.read_text(params)
+        near_duplicates = bool(params.get('near_duplicates'))
+        try:
+            language = resolve_language(params.get('language', 'auto'), text)
+        except ValueError as e:
+            raise RequestError(INVALID_PARAMS, str(e))
+        if language != 'en':
+            raise RequestError(INVALID_PARAMS, f"ai_detector.update supports English text only, and the "
+                                               f"text language is '{language}'; use ai_detector.analyze")
+        with self._sessions_lock:
+            now = time.monotonic()
+            self._expire_sessions(now)
+            detector = self.sessions.get(session)
+            if detector is None or detector.near_duplicates != near_duplicates:
+                detector = ai_detector.IncrementalAIDetector(text, near_duplicates=near_duplicates)
+                self.sessions[session] = detector
+                results = detector.analyze()
+            else:
+                results = detector.update(text)
+            self.sessions.move_to_end(session)
+            self._session_used[session] = now
+            while len(self.sessions) > self.max_sessions:
+                oldest, _ = self.sessions.popitem(last=False)
+                del self._session_used[oldest]
+            return {'results': results, 'reanalyzed_chars': detector.reanalyzed_chars}
+
+    def _expire_sessions(self, now: float):
+        """Drop sessions not updated within session_ttl (call with the lock held)."""
+        while self.sessions:
+            oldest = next(iter(self.sessions))
+            if now - self._session_used[oldest] <= self.session_ttl:
+                break
+            del self.sessions[oldest]
+            del self._session_used[oldest]
+
+    def ai_detector_close(self, params: Dict) -> Dict:
+        with self._sessions_lock:
+            session = params.get('session')
+            self._session_used.pop(session, None)
+            return {'results': self.sessions.pop(session, None) is not None}
+
+    def text_analyzer_analyze(self, params: Dict) -> Dict:
+        analyzer = text_analyzer.TextAnalyzer(self.read_text(params), cache=self.cache(text_analyzer, params),
+                                              language=params.get('language', 'auto'))
+        results = analyzer.analyze()
+        reply = {'results': results}
+        if params.get('report'):
+            reply['report'] = analyzer.format_report(results)
+        return reply
+
+    def text_analyzer_compare(self, params: Dict) -> Dict:
+        report = text_analyzer.TextAnalyzer.compare_texts(self.read_text(params, '1'), self.read_text(params, '2'),
+                                                          language=params.get('language', 'auto'))
+        return {'results': None, 'report': report}
+
+    def detect_slop_analyze(self, params: Dict) -> Dict:
+        detector = detect_slop.SlopDetector(**self.slop_source(params), cache=self.cache(detect_slop, params),
+                                            language=params.get('language', 'auto'))
+        reply = {'results': detector.to_dict()}
+        if params.get('report'):
+            reply['report'] = self.capture(lambda: detector.print_report(verbose=bool(params.get('verbose'))))
+        return reply
+
+    def clean_slop_clean(self, params: Dict) -> Dict:
+        cleaner = clean_slop.SlopCleaner(**self.slop_source(params), aggressive=bool(params.get('aggressive')),
+                                         language=params.get('language', 'auto'))
+        output = params.get('output')
+        if cleaner.in_memory and params.get('save') and not output:
+            raise RequestError(INVALID_PARAMS, "'save' needs 'output' when the input is 'text'")
+        if params.get('save') or output:
+            report = self.capture(lambda: cleaner.save(output))
+        elif params.get('report'):
+            report = self.capture(cleaner.preview)
+        else:
+            report = None
+        reply = {'results': {
+            'cleaned': cleaner.clean(),
+            'changes': cleaner.changes_made,
+            'rule_counts': dict(cleaner.rule_counts),
+        }}
+        if report is not None:
+            reply['report'] = report
+        return reply
+
+    def ping(self, params: Dict) -> Dict:
+        return {'results': {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'sessions': len(self.sessions),
+            'max_sessions': self.max_sessions,
+        }}
+
+    def shutdown(self, params: Dict) -> Dict:
+        self.stop_requested.set()
+        return {'results': True}
+
+    def warm(self):
+        """Compile every registered pattern and run each tool once before the first request."""
+        REGISTRY.warm()
+        for method in ('ai_detector.analyze', 'text_analyzer.analyze', 'detect_slop.analyze', 'clean_slop.clean'):
+            self.methods[method]({'text': WARM_TEXT, 'report': True, 'cache': False})
+
+    def handle(self, request) -> Optional[Dict]:
+        """Serve one decoded JSON-RPC request; returns None for notifications."""
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return self.error(None, INVALID_REQUEST, 'Invalid request')
+        request_id = request.get('id')
+        params = request.get('params', {})
+        handler = self.methods.get(request['method'])
+        if handler is None:
+            response = self.error(request_id, METHOD_NOT_FOUND, f"Unknown method '{request['method']}'")
+        elif not isinstance(params, dict):
+            response = self.error(request_id, INVALID_PARAMS, 'params must be an object')
+        else:
+            self.requests += 1
+            try:
+                response = {'jsonrpc': '2.0', 'id': request_id, 'result': handler(params)}
+            except RequestError as e:
+                response = self.error(request_id, e.code, str(e))
+            except (OSError, UnicodeDecodeError) as e:
+                response = self.error(request_id, TOOL_ERROR, f"Error reading file: {e}")
+            except Exception as e:
+                response = self.error(request_id, TOOL_ERROR, f"{type(e).__name__}: {e}")
+        return None if 'id' not in request else response
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Serve one request line and return the response line, if any."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return json.dumps(self.error(None, PARSE_ERROR, f"Parse error: {e}"))
+        response = self.handle(request)
+        return None if response is None else json.dumps(response, ensure_ascii=False)
+
+    @staticmethod
+    def error(request_id, code: int, message: str) -> Dict:
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def serve_stdio(host: ToolHost):
+    """Answer requests read from stdin, one response line per request on stdout."""
+    out = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = host.handle_line(line)
+        if response is not None:
+            out.write(response + '\n')
+            out.flush()
+        if host.stop_requested.is_set():
+            break
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        host = self.server.host
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            host.last_activity = time.monotonic()
+            response = host.handle_line(line.decode('utf-8', 'replace'))
+            if response is not None:
+                self.wfile.write(response.encode('utf-8') + b'\n')
+                self.wfile.flush()
+            if host.stop_requested.is_set():
+                break
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_socket(host: ToolHost, path: str, idle_timeout: float = 0):
+    """Serve requests on a Unix socket until shutdown or idle_timeout seconds without requests."""
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            # Left behind by a daemon that did not exit cleanly
+            os.unlink(path)
+        else:
+            probe.close()
+            raise RuntimeError(f"a daemon is already listening on {path}")
+
+    old_umask = os.umask(0o077)
+    try:
+        server = _Server(path, _Handler)
+    finally:
+        os.umask(old_umask)
+    server.host = host
+
+    def watch():
+        while not host.stop_requested.wait(1.0):
+            if idle_timeout and time.monotonic() - host.last_activity > idle_timeout:
+                break
+        server.shutdown()
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve the text analysis and slop tools from one warm process',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/text_tools_server.py
+  python scripts/text_tools_server.py --idle-timeout 600
+  python scripts/text_tools_server.py --stdio < requests.jsonl
+  python scripts/text_tools_client.py ai_detector draft.md
+        """
+    )
+    parser.add_argument('--socket', metavar='PATH', default=None,
+                        help='Unix socket to listen on (default: $TEXT_TOOLS_SOCKET or a per-user temp path)')
+    parser.add_argument('--stdio', action='store_true',
+                        help='Read requests from stdin and write responses to stdout instead')
+    parser.add_argument('--idle-timeout', type=float, default=0,
+                        help='Exit after this many seconds without requests (default: never)')
+    parser.add_argument('--no-warm', action='store_true',
+                        help='Skip compiling all patterns and running each tool once at startup')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the on-disk result caches')
+    parser.add_argument('--max-sessions', type=int, default=MAX_SESSIONS,
+                        help=f'Incremental sessions kept; the least recently updated is dropped '
+                             f'first (default: {MAX_SESSIONS})')
+    parser.add_argument('--session-ttl', type=float, default=SESSION_TTL,
+                        help=f'Drop sessions not updated for this many seconds (default: {SESSION_TTL:.0f})')
+    args = parser.parse_args()
+    if args.max_sessions < 1:
+        parser.error('--max-sessions must be at least 1')
+
+    host = ToolHost(use_cache=not args.no_cache, max_sessions=args.max_sessions,
+                    session_ttl=args.session_ttl)
+    if not args.no_warm:
+        host.warm()
+
+    if args.stdio:
+        serve_stdio(host)
+        return
+
+    path = args.socket or default_socket_path()
+    try:
+        serve_socket(host, path, idle_timeout=args.idle_timeout)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Import paths and seeded text generators for the text tool tests.
+
+The skill scripts import their sibling modules by bare name, so both
+scripts directories go on sys.path, as in scripts/text_tools_server.py.
+The shared modules (result_cache, pattern_registry, pattern_packs,
+profiling) are identical in both skills, so whichever copy is found first
+serves both; data they read from disk, such as each skill's bundled
+pattern packs, is located by the calling tool, not by the shared module.
+
+The generators are deterministic per seed, so a failing case can be
+reproduced from the seed in the test's subTest label.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SKILLS = ROOT / '.agents' / 'skills'
+ANTI_SLOP_SCRIPTS = SKILLS / 'anti-slop' / 'scripts'
+HUMANIZE_SCRIPTS = SKILLS / 'humanize-academic-writing' / 'scripts'
+
+for path in (ANTI_SLOP_SCRIPTS, HUMANIZE_SCRIPTS, ROOT / 'scripts'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+SLOP_PHRASES = [
+    "delve into", "Dive deep into", "unpack the box", "unpack", "navigate the complexities of",
+    "in the ever-evolving landscape of", "In today's fast-paced world,", "in today's digital age",
+    "at the end of the day,", "it's important to note that", "its worth noting that",
+    "However, it is important to", "however it is important to", "Furthermore,", "Moreover",
+    "in essence", "essentially", "fundamentally", "ultimately", "that being said", "synergistic",
+    "holistic approach", "paradigm shift", "game-changer", "revolutionary", "cutting-edge",
+    "next-generation", "world-class", "best-in-class", "leverage", "leveraging", "utilize",
+    "utilizing", "empower", "unlock potential", "drive innovation", "In this article, we will",
+    "in this post", "As we explore", "as we delve into", "Let's take a closer look at this.",
+    "lets take a look", "Now that we've covered", "Before we proceed, note this.",
+    "it's crucial to understand", "may or may not", "could potentially", "might possibly",
+    "it appears that", "it seems that", "one could argue that", "some might say that",
+    "to a certain extent,", "generally speaking,", "in order to", "due to the fact that",
+    "at this point in time", "for the purpose of", "has the ability to", "is able to",
+    "in spite of the fact that", "take into consideration", "make a decision",
+    "conduct an investigation", "in the event that", "prior to", "subsequent to",
+    "completely finished", "absolutely essential", "totally unique", "very unique", "past history",
+    "future plans", "end result", "final outcome", "really important", "very important",
+    "quite literally", "actually, ", "Actually the", "actually not", "It is crucial that",
+    "It is important to",
+]
+
+# Overlapping, adjacent and case/Unicode edge cases (\u212a, the Kelvin sign,
+# matches 'k' under IGNORECASE)
+TRICKY_PHRASES = [
+    "very totally unique", "Actually, it seems that we",
+    "in the ever-evolving landscape of today's digital age", "in the ever-evolving landscape of order to",
+    "actually it appears that", "really absolutely essential", "unpack  the", "UNPACK the",
+    "is able to a certain extent", "actually\nnot", "İn order to", "ſome might say that",
+    "\u212aind of", "IN ORDER TO", "Ünpack", "é in order to é",
+    "“in order to”", "ıt seems that", "In Today's Digital Age",
+]
+
+WORDS = ("the a an of data model team we built shipped users growth metric pipeline system "
+         "latency cost results was were is are analyzed observed shown").split()
+SEPARATORS = [' ', ' ', ' ', '  ', '\n', '. ', ', ']
+
+
+def slop_text(seed: int) -> str:
+    """Prose-like word runs with slop phrases (odd seeds) or a dense phrase soup (even seeds)."""
+    r = random.Random(seed)
+    out = []
+    if seed % 2:
+        for _ in range(300):
+            x = r.random()
+            if x < 0.15:
+                out.append(r.choice(SLOP_PHRASES))
+            elif x < 0.2:
+                out.append(r.choice('.!?,'))
+            elif x < 0.24:
+                out.append('\n')
+            elif x < 0.26:
+                out.append('\n\n')
+            elif x < 0.27:
+                out.append('\n\n\n\n')
+            else:
+                out.append(r.choice(WORDS))
+            out.append(r.choice(SEPARATORS))
+    else:
+        for _ in range(r.choice([5, 30, 200, 600])):
+            x = r.random()
+            if x < 0.35:
+                out.append(r.choice(SLOP_PHRASES + TRICKY_PHRASES))
+            elif x < 0.4:
+                out.append(r.choice('.!?,'))
+            elif x < 0.45:
+                out.append('\n')
+            else:
+                out.append(r.choice("the we data model in order today's actually very really it".split()))
+            out.append(r.choice([' ', ' ', '', '  ', '\n', '. ', ', ']))
+    return ''.join(out)
+
+
+# Portuguese draft with phrases from both skills' bundled pt-br packs
+PT_TEXT = """É importante ressaltar que a equipe vai mergulhar fundo nos dados. Além disso, a análise foi feita com uma abordagem holística.
+
+No final das contas, o modelo é de ponta e de última geração. Em essência, os resultados são revolucionários para os usuários.
+
+Nesse sentido, diversos aspectos do sistema foram avaliados. Em termos de custo, a latência também caiu.
+"""
+
+
+ACADEMIC_TOKENS = [
+    "Moreover,", "Furthermore", "In addition", "It is important to note that", "Notably", "The",
+    "We", "Results", "data", "was analyzed", "were shown", "is considered", "in terms of",
+    "plays a crucial role", "serves as", "with respect to", "various aspects", "model", "team",
+    "Σίσυφος", "É", "was\n\nfixed", "it can be seen that", "x",
+]
+ACADEMIC_SEPARATORS = [" ", " ", ". ", "! ", "? ", "\n", "\n\n", "\n\n\n", ".\n\n", ". \n\n ",
+                       "\t", "  ", ".", "\r\n"]
+
+
+def academic_text(seed: int) -> str:
+    """AI-flavoured academic text with ragged whitespace and paragraph breaks."""
+    r = random.Random(seed)
+    text = ''.join(r.choice(ACADEMIC_TOKENS) + r.choice(ACADEMIC_SEPARATORS)
+                   for _ in range(r.randint(0, 400)))
+    text += r.choice(["", " ", "\n\n", ".  "])
+    return '  \n\n ' + text if seed % 7 == 0 else text
@@ -0,0 +1,139 @@
+"""
+The streaming and incremental detectors and the heatmap must agree with AIDetector.
+
+The streaming and incremental detectors rebuild AIDetector's results from
+per-block running totals instead of the whole document, so each is checked
+against AIDetector(text).analyze() on seeded texts with ragged whitespace,
+empty paragraphs and block boundaries that fall inside sentences and
+paragraph breaks. The heatmap's prefix-sum windows are checked against a
+fresh AIDetector per window.
+"""
+
+import io
+import random
+import unittest
+from collections import Counter
+
+from support import academic_text
+from ai_detector import (
+    AIDetector, IncrementalAIDetector, StreamingAIDetector, count_pairs, ladder_score, paragraph_opening,
+    weighted_score
+)
+
+CORPUS_SIZE = 300
+HEATMAP_TEXTS = 120
+EDIT_SEQUENCES = 200
+EDITS_PER_SEQUENCE = 6
+
+
+def edit(text: str, r: random.Random) -> str:
+    """Apply one to three random splices: deletions, insertions of generated text or breaks."""
+    for _ in range(r.randint(1, 3)):
+        i = r.randint(0, len(text))
+        j = min(len(text), i + r.randint(0, 40))
+        if r.random() < 0.7:
+            insert = academic_text(r.randint(0, 10**6))[:r.randint(0, 60)]
+        else:
+            insert = r.choice(['\n\n', '. ', '.\n\nThe ', ' x', ''])
+        text = text[:i] + insert + text[j:]
+    return text
+
+
+class StreamingAIDetectorTest(unittest.TestCase):
+    def test_matches_whole_document(self):
+        for seed in range(CORPUS_SIZE):
+            text = academic_text(seed)
+            block_size = random.Random(seed).randint(1, 50)
+            with self.subTest(seed=seed, block_size=block_size):
+                streamed = StreamingAIDetector.from_file(io.StringIO(text), block_size=block_size)
+                self.assertEqual(streamed.analyze(), AIDetector(text).analyze())
+
+    def test_near_duplicates(self):
+        for seed in range(0, CORPUS_SIZE, 3):
+            text = academic_text(seed)
+            with self.subTest(seed=seed):
+                streamed = StreamingAIDetector.from_file(io.StringIO(text), block_size=64,
+                                                         near_duplicates=True)
+                self.assertEqual(streamed.analyze(), AIDetector(text, near_duplicates=True).analyze())
+
+
+class IncrementalAIDetectorTest(unittest.TestCase):
+    def check_sequences(self, near_duplicates: bool):
+        for seed in range(EDIT_SEQUENCES):
+            r = random.Random(seed)
+            text = academic_text(seed)
+            detector = IncrementalAIDetector(text, near_duplicates=near_duplicates)
+            for step in range(EDITS_PER_SEQUENCE):
+                # Now and then replace the whole text instead of editing it
+                text = academic_text(r.randint(0, 10**6)) if r.random() < 0.1 else edit(text, r)
+                with self.subTest(seed=seed, step=step):
+                    self.assertEqual(detector.update(text),
+                                     AIDetector(text, near_duplicates=near_duplicates).analyze())
+                    self.assertEqual(IncrementalAIDetector.SEPARATOR.join(detector.blocks), text)
+
+    def test_edit_sequences(self):
+        self.check_sequences(near_duplicates=False)
+
+    def test_edit_sequences_near_duplicates(self):
+        self.check_sequences(near_duplicates=True)
+
+    def test_unchanged_update(self):
+        text = academic_text(1)
+        detector = IncrementalAIDetector(text)
+        self.assertEqual(detector.update(text), AIDetector(text).analyze())
+
+
+def brute_force_window(detector: AIDetector, start: int, end: int) -> dict:
+    """Metric scores of sentences [start, end), from a new AIDetector over their text.
+
+    Paragraph openings are the exception: the heatmap counts the paragraphs
+    that start in the window, which the window's own text cannot tell apart
+    from a paragraph it cuts into, so they are collected from the whole text.
+    """
+    doc = detector.doc
+    window_text = doc.text[doc.sentence_starts[start]:doc.sentence_ends[end - 1]]
+    metrics = {name: metric['score'] for name, metric in AIDetector(window_text).analyze()['metrics'].items()}
+    openings = []
+    for paragraph, offset in zip(doc.paragraphs, doc.paragraph_starts):
+        index = max(0, sum(1 for s in doc.sentence_starts if s <= offset) - 1)
+        if start <= index < end:
+            openings.append(paragraph_opening(paragraph).lower()[:20])
+    metrics['paragraph_patterns'] = (
+        ladder_score('paragraph_patterns', count_pairs(Counter(openings).values()) / len(openings))[0]
+        if len(openings) >= 3 else 0)
+    return metrics
+
+
+class HeatmapTest(unittest.TestCase):
+    def test_windows_match_brute_force(self):
+        for seed in range(HEATMAP_TEXTS):
+            r = random.Random(seed)
+            window, step = r.randint(1, 12), r.randint(1, 4)
+            detector = AIDetector(academic_text(seed))
+            heatmap = detector.heatmap(window=window, step=step)
+            count = heatmap['sentences']
+            with self.subTest(seed=seed, window=window, step=step):
+                covered = [[] for _ in range(count)]
+                for w in heatmap['windows']:
+                    expected = brute_force_window(detector, w['start'], w['end'])
+                    self.assertEqual(w['metrics'], expected)
+                    self.assertEqual(w['score'], round(weighted_score({k: {'score': v} for k, v in expected.items()}), 3))
+                    for i in range(w['start'], w['end']):
+                        covered[i].append(w['score'])
+                # A sentence scores the mean of its windows (the running sums
+                # may round the last digit differently), 0 when a step skips it
+                self.assertEqual(len(heatmap['sentence_scores']), count)
+                for got, scores in zip(heatmap['sentence_scores'], covered):
+                    expected = sum(scores) / len(scores) if scores else 0
+                    self.assertAlmostEqual(got, expected, delta=0.0006)
+
+    def test_blank_text_has_no_windows(self):
+        for text in ('', '  ', '\n\n', ' \n\n\t'):
+            with self.subTest(text=text):
+                heatmap = AIDetector(text).heatmap(window=3)
+                self.assertEqual((heatmap['sentences'], heatmap['windows'], heatmap['sentence_scores']),
+                                 (0, [], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
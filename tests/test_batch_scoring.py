@@ -0,0 +1,64 @@
+"""
+BatchScorer must score every text as AIDetector does.
+
+The list path is checked against AIDetector(text).analyze() on seeded
+texts; the NumPy path, which builds its np.select ladders from the same
+METRIC_LADDERS table, is checked against the list path when NumPy is
+installed.
+"""
+
+import math
+import unittest
+
+from support import academic_text
+from ai_detector import AIDetector
+from batch_scoring import BatchScorer, np
+
+CORPUS_SIZE = 150
+
+# Short texts around the metric minimums and ladder bounds
+SHORT_TEXTS = [
+    "", " ", "x", "Moreover, it works.", "We built it. It shipped. Users came.",
+    "Moreover, a. Furthermore, b. Notably, c. In addition, d.",
+    "A.\n\nA.\n\nA.", "It was analyzed.\n\nIt was analyzed.\n\nIt was shown.",
+]
+
+
+def corpus() -> list:
+    return SHORT_TEXTS + [academic_text(seed) for seed in range(CORPUS_SIZE)]
+
+
+class ListPathTest(unittest.TestCase):
+    def check_matches_detector(self, near_duplicates: bool):
+        texts = corpus()
+        result = BatchScorer(near_duplicates=near_duplicates, use_numpy=False).score(texts)
+        for i, text in enumerate(texts):
+            expected = AIDetector(text, near_duplicates=near_duplicates).analyze()
+            with self.subTest(text=text[:40]):
+                self.assertEqual(result['overall_score'][i], expected['overall_score'])
+                for name, metric in expected['metrics'].items():
+                    self.assertEqual(result['scores'][name][i], metric['score'], name)
+
+    def test_matches_detector(self):
+        self.check_matches_detector(near_duplicates=False)
+
+    def test_matches_detector_near_duplicates(self):
+        self.check_matches_detector(near_duplicates=True)
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class ArrayPathTest(unittest.TestCase):
+    def test_matches_list_path(self):
+        texts = corpus()
+        arrays = BatchScorer(use_numpy=True).score(texts)
+        lists = BatchScorer(use_numpy=False).score(texts)
+        self.assertEqual(arrays['overall_score'].tolist(), lists['overall_score'])
+        for name, scores in lists['scores'].items():
+            self.assertEqual(arrays['scores'][name].tolist(), scores, name)
+        for name, values in lists['values'].items():
+            for got, expected in zip(arrays['values'][name].tolist(), values):
+                self.assertTrue(math.isclose(got, expected, abs_tol=1e-9), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
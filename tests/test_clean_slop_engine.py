@@ -0,0 +1,88 @@
+"""
+Differential tests for clean_slop's fused rewrite engine.
+
+FusedRuleGroup replays runs of literal rules in one scan. Whether a rule
+may join a run is decided by parsing its regex source (_is_bounded,
+_lookaround_reach), so an edit to CLEANING_STAGES can silently change the
+output. These tests pin the output on a fixed, seeded corpus:
+
+- ENGINE.rewrite(t, fused=True) must equal fused=False (same text, change
+  log and per-rule counts);
+- SlopCleaner must reproduce the original stage-by-stage cleaner. Its
+  output digests are stored in fixtures/clean_slop_baseline.json, generated
+  by running the clean_slop.py that predates the fused engine (git history)
+  over the same corpus.
+
+If a rule change is meant to change the output, regenerate the fixture
+with `python tests/test_clean_slop_engine.py --regenerate` and say so in
+the commit.
+"""
+
+import hashlib
+import json
+import sys
+import unittest
+from pathlib import Path
+
+from support import SLOP_PHRASES, TRICKY_PHRASES, slop_text
+from clean_slop import ENGINE, SlopCleaner
+
+BASELINE = Path(__file__).resolve().parent / 'fixtures' / 'clean_slop_baseline.json'
+
+CORPUS_SIZE = 240
+
+
+def digest(cleaned: str, changes) -> str:
+    """Digest of a cleaner's output text and change log."""
+    return hashlib.sha256(json.dumps([cleaned, list(changes)]).encode('utf-8')).hexdigest()
+
+
+def clean_digests(cleaner_class, text: str, make_cleaner) -> list:
+    """[plain, aggressive] output digests of one text."""
+    digests = []
+    for aggressive in (False, True):
+        cleaner = make_cleaner(cleaner_class, text, aggressive)
+        cleaned = cleaner.clean()
+        digests.append(digest(cleaned, cleaner.changes_made))
+    return digests
+
+
+def _current_cleaner(cleaner_class, text: str, aggressive: bool):
+    return cleaner_class.from_text(text, aggressive=aggressive, language='en')
+
+
+class FusedEngineTest(unittest.TestCase):
+    def test_fused_matches_sequential(self):
+        for seed in range(CORPUS_SIZE):
+            text = slop_text(seed)
+            with self.subTest(seed=seed):
+                self.assertEqual(ENGINE.rewrite(text, fused=True), ENGINE.rewrite(text, fused=False))
+
+    def test_tricky_snippets(self):
+        for snippet in TRICKY_PHRASES + SLOP_PHRASES:
+            for text in (snippet, f"We {snippet} it.", f"{snippet}{snippet}", f"{snippet} {snippet}."):
+                with self.subTest(text=text):
+                    self.assertEqual(ENGINE.rewrite(text, fused=True), ENGINE.rewrite(text, fused=False))
+
+    def test_matches_baseline_cleaner(self):
+        expected = json.loads(BASELINE.read_text(encoding='utf-8'))
+        self.assertEqual(len(expected), CORPUS_SIZE)
+        for seed in range(CORPUS_SIZE):
+            with self.subTest(seed=seed):
+                self.assertEqual(clean_digests(SlopCleaner, slop_text(seed), _current_cleaner),
+                                 expected[str(seed)])
+
+
+def regenerate():
+    """Rewrite the baseline fixture from the current cleaner."""
+    digests = {str(seed): clean_digests(SlopCleaner, slop_text(seed), _current_cleaner)
+               for seed in range(CORPUS_SIZE)}
+    BASELINE.parent.mkdir(exist_ok=True)
+    BASELINE.write_text(json.dumps(digests, indent=0) + '\n', encoding='utf-8')
+
+
+if __name__ == '__main__':
+    if '--regenerate' in sys.argv:
+        regenerate()
+    else:
+        unittest.main()
@@ -0,0 +1,81 @@
+"""
+PhraseMatcher must find exactly what the original per-line scan found.
+
+The original detector ran re.finditer(pattern, line, re.IGNORECASE) for
+every line and every pattern of every category; the combined single-scan
+regex has to report the same hits, in the same order. The built-in
+phrases are plain literals, so a second set of patterns exercises what
+pattern packs may add: hits that overlap their own previous hit, and
+matches that would run across a line break.
+"""
+
+import random
+import re
+import unittest
+
+from support import SLOP_PHRASES, TRICKY_PHRASES, slop_text
+from detect_slop import PATTERN_CATEGORIES, FindingsView, PhraseMatcher
+
+CORPUS_SIZE = 200
+
+PACK_LIKE_CATEGORIES = [
+    ('repeats', [r"(?:na)+", r"very\s+very", r"\bk\w*"]),
+    ('spacing', [r"in\s+order\s+to", r"a\s*b?", r"end\s*"]),
+]
+PACK_LIKE_TOKENS = ["na", "nana", "very", "a", "b", "ab", "in", "order", "to", "end", "kind", "Kelvin"]
+
+
+def pack_like_text(seed: int) -> str:
+    r = random.Random(seed)
+    return ''.join(r.choice(PACK_LIKE_TOKENS) + r.choice(['', ' ', '  ', '\n', '\n\n', '. '])
+                   for _ in range(r.randint(1, 120)))
+
+
+def reference_findings(categories, text: str) -> dict:
+    """Findings of the original line-by-line, pattern-by-pattern scan."""
+    lines = text.split('\n')
+    findings = {}
+    for category, patterns in categories:
+        found = findings[category] = []
+        for line_no, line in enumerate(lines, 1):
+            for pattern in patterns:
+                for match in re.finditer(pattern, line, re.IGNORECASE):
+                    found.append({'line': line_no, 'text': line.strip(),
+                                  'match': match.group(), 'position': match.start()})
+    return findings
+
+
+def matcher_findings(matcher: PhraseMatcher, text: str) -> dict:
+    view = FindingsView(matcher.find(text, text.split('\n')), [])
+    return {category: list(view[category]) for category in matcher.categories}
+
+
+class PhraseMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.builtin = PhraseMatcher(PATTERN_CATEGORIES)
+        self.pack_like = PhraseMatcher(PACK_LIKE_CATEGORIES)
+
+    def test_builtin_phrases(self):
+        for seed in range(CORPUS_SIZE):
+            text = slop_text(seed)
+            with self.subTest(seed=seed):
+                self.assertEqual(matcher_findings(self.builtin, text),
+                                 reference_findings(PATTERN_CATEGORIES, text))
+
+    def test_builtin_phrases_at_line_edges(self):
+        for phrase in SLOP_PHRASES + TRICKY_PHRASES:
+            for text in (phrase, f"{phrase}\n{phrase}", f"a\n{phrase}.\n", f"{phrase}{phrase}"):
+                with self.subTest(text=text):
+                    self.assertEqual(matcher_findings(self.builtin, text),
+                                     reference_findings(PATTERN_CATEGORIES, text))
+
+    def test_overlapping_and_multiline_patterns(self):
+        for seed in range(CORPUS_SIZE):
+            text = pack_like_text(seed)
+            with self.subTest(seed=seed):
+                self.assertEqual(matcher_findings(self.pack_like, text),
+                                 reference_findings(PACK_LIKE_CATEGORIES, text))
+
+
+if __name__ == '__main__':
+    unittest.main()
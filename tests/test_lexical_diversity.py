@@ -0,0 +1,76 @@
+"""
+MATTR and MTLD known values, and how AIDetector scores them.
+
+The reference values are worked by hand from the definitions in
+lexical_diversity.py (Covington & McFall; McCarthy & Jarvis).
+"""
+
+import unittest
+from unittest import mock
+
+from support import academic_text
+import ai_detector
+from ai_detector import AIDetector
+from lexical_diversity import MATTR_WINDOW, mattr, mtld
+
+
+class MattrTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(mattr([]), 0.0)
+
+    def test_shorter_than_window_is_plain_ttr(self):
+        self.assertEqual(mattr(['a', 'b', 'a', 'c']), 0.75)
+        self.assertEqual(mattr(['a', 'b', 'c'], window=3), 1.0)
+
+    def test_all_repeated(self):
+        self.assertEqual(mattr(['a'] * (MATTR_WINDOW * 2)), 1 / MATTR_WINDOW)
+
+    def test_known_value(self):
+        # Windows [a b a] and [b a c] have 2 and 3 distinct words
+        self.assertAlmostEqual(mattr(['a', 'b', 'a', 'c'], window=3), 5 / 6)
+
+
+class MtldTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(mtld([]), 0.0)
+
+    def test_never_reaching_threshold_scores_length(self):
+        self.assertEqual(mtld(list('abcdefgh')), 8.0)
+
+    def test_all_repeated(self):
+        # Every second word drops the running TTR to 0.5: five factors in ten words
+        self.assertEqual(mtld(['a'] * 10), 2.0)
+
+    def test_known_value(self):
+        # Forward: "abcdab" is one factor (TTR 4/6), then "cdaa" leaves a partial
+        # factor of (1 - 3/4) / (1 - 0.72); backward: "aa", "dcbadc" and an
+        # empty partial for "ba" make two factors
+        forward = 10 / (1 + 0.25 / 0.28)
+        backward = 10 / 2
+        self.assertAlmostEqual(mtld(list('abcdabcdaa')), (forward + backward) / 2)
+        self.assertAlmostEqual(mtld(list('abcdabcdaa')), 5.14151, places=5)
+
+
+class DetectorLadderTest(unittest.TestCase):
+    def test_measure_uses_its_ladder(self):
+        text = academic_text(2)
+        for measure in ('mattr', 'mtld'):
+            key = f'vocabulary_{measure}'
+            patched = ('<', [(float('inf'), 0.7, 'patched')], (0.0, 'unreachable'))
+            with self.subTest(measure=measure), mock.patch.dict(ai_detector.METRIC_LADDERS, {key: patched}):
+                detector = AIDetector(text, diversity=measure)
+                results = detector.analyze()
+                metric = results['metrics'][key]
+                self.assertEqual((metric['score'], metric['issue']), (0.7, 'patched'))
+                # The TTR entry keeps its own ladder
+                self.assertNotEqual(results['metrics']['vocabulary_diversity']['issue'], 'patched')
+                self.assertAlmostEqual(results['overall_score'],
+                                       round(detector.calculate_overall_score(results['metrics']), 3))
+                ttr_score = AIDetector(text).calculate_overall_score(results['metrics'])
+                weight = ai_detector.METRIC_WEIGHTS['vocabulary_diversity']
+                self.assertAlmostEqual(detector.calculate_overall_score(results['metrics']) - ttr_score,
+                                       (0.7 - results['metrics']['vocabulary_diversity']['score']) * weight)
+
+
+if __name__ == '__main__':
+    unittest.main()
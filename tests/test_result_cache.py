@@ -0,0 +1,87 @@
+"""ResultCache bounds, eviction, failed writes and tool versions."""
+
+import errno
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import support  # noqa: F401  (puts the scripts on sys.path)
+import result_cache
+import ai_detector
+import detect_slop
+import text_analyzer
+from result_cache import ResultCache
+
+
+class EvictionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_stays_within_entry_bound(self):
+        cache = ResultCache('test', 'v1', self.tmp.name, max_entries=20)
+        for i in range(200):
+            cache.put(cache.key(f'text {i}'), {'i': i})
+        self.assertLessEqual(cache.stats()['entries'], 20)
+        # The most recent entry survives eviction
+        self.assertEqual(cache.get(cache.key('text 199')), {'i': 199})
+
+    def test_stays_within_byte_bound(self):
+        cache = ResultCache('test', 'v1', self.tmp.name, max_bytes=4096)
+        for i in range(200):
+            cache.put(cache.key(f'text {i}'), {'payload': 'x' * 100})
+        self.assertLessEqual(cache.stats()['bytes'], 4096)
+
+    def test_puts_do_not_scan_every_time(self):
+        cache = ResultCache('test', 'v1', self.tmp.name, max_entries=100)
+        scan = ResultCache._entries
+        with mock.patch.object(ResultCache, '_entries', autospec=True, side_effect=scan) as entries:
+            for i in range(1000):
+                cache.put(cache.key(f'text {i}'), {'i': i})
+        # One scan on the first put, then one per ~10% of max_entries puts
+        self.assertLess(entries.call_count, 120)
+
+
+class FailedWriteTest(unittest.TestCase):
+    def test_failed_write_leaves_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache('test', 'v1', tmp)
+            key = cache.key('text')
+            full = OSError(errno.ENOSPC, 'No space left on device')
+            with mock.patch.object(result_cache.json, 'dump', side_effect=full):
+                cache.put(key, {'i': 1})
+            self.assertIsNone(cache.get(key))
+            self.assertEqual(list(Path(tmp).rglob('*.tmp')), [])
+
+
+class FetchTest(unittest.TestCase):
+    def test_miss_and_hit_return_the_same_shape(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache('test', 'v1', tmp)
+            compute = lambda: {'span': (1, 2), 'counts': {3: 'x'}}
+            miss = cache.fetch('text', {}, compute)
+            hit = cache.fetch('text', {}, compute)
+            self.assertEqual(miss, {'span': [1, 2], 'counts': {'3': 'x'}})
+            self.assertEqual(hit, miss)
+
+
+class VersionTest(unittest.TestCase):
+    def test_version_covers_shared_modules(self):
+        for module in (detect_slop, ai_detector, text_analyzer):
+            for name in ('pattern_packs.py', 'pattern_registry.py'):
+                with self.subTest(tool=module.__name__, module=name):
+                    edited = Path(module.__file__).resolve().parent / name
+                    original = Path.read_bytes
+
+                    def read_bytes(path, edited=edited):
+                        data = original(path)
+                        return data + b'# edited' if path == edited else data
+
+                    before = module.make_cache().version
+                    with mock.patch.object(Path, 'read_bytes', read_bytes):
+                        self.assertNotEqual(module.make_cache().version, before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+"""The modules shipped with both skills must stay byte-identical."""
+
+import unittest
+
+from support import ANTI_SLOP_SCRIPTS, HUMANIZE_SCRIPTS
+
+SHARED_MODULES = ('result_cache.py', 'pattern_registry.py', 'pattern_packs.py', 'profiling.py')
+
+
+class SharedModulesTest(unittest.TestCase):
+    def test_copies_are_identical(self):
+        for name in SHARED_MODULES:
+            with self.subTest(module=name):
+                anti_slop = (ANTI_SLOP_SCRIPTS / name).read_bytes()
+                humanize = (HUMANIZE_SCRIPTS / name).read_bytes()
+                self.assertTrue(anti_slop == humanize,
+                                f"{name} differs between the skills; copy the edited one over the other")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""CorpusStats vocabulary bounds and the revision comparison ranking in text_analyzer."""
+
+import unittest
+from unittest import mock
+
+from support import academic_text
+import text_analyzer
+from text_analyzer import TextAnalyzer, CorpusStats, compare_revisions, format_matrix
+
+
+def corpus_stats(texts, max_terms):
+    stats = CorpusStats(max_terms=max_terms)
+    for text in texts:
+        stats.add(TextAnalyzer(text, language='en'))
+    return stats
+
+
+class CorpusVocabularyTest(unittest.TestCase):
+    def test_unpruned_counts_are_exact(self):
+        texts = [academic_text(seed) for seed in range(5)]
+        vocab = corpus_stats(texts, max_terms=100_000).summary()['vocabulary']
+        words = set()
+        for text in texts:
+            words.update(TextAnalyzer(text, language='en').doc.words)
+        self.assertFalse(vocab['pruned'])
+        self.assertNotIn('note', vocab)
+        self.assertEqual(vocab['unique_words'], len(words))
+
+    def test_pruned_counts_are_labelled_lower_bounds(self):
+        stats = corpus_stats([academic_text(seed) for seed in range(5)], max_terms=20)
+        stats.prune()
+        vocab = stats.summary()['vocabulary']
+        self.assertTrue(vocab['pruned'])
+        self.assertEqual(vocab['unique_words'], 20)
+        self.assertIn('lower bounds', vocab['note'])
+
+
+def revision(mean, stdev, mattr, transitions, passive, ttr=0.5, density=0.5):
+    """analyze() results holding only the matrix fields; mean=None has no sentences."""
+    sentences = {'error': 'No sentences found'} if mean is None else {'mean': mean, 'stdev': stdev}
+    return {
+        'sentence_stats': sentences,
+        'vocabulary': {'type_token_ratio': ttr, 'mattr': mattr, 'lexical_density': density},
+        'transitions': {'density_per_100_words': transitions},
+        'passive_voice': {'percentage': passive},
+    }
+
+
+# B and C are identical; D has no sentences but the best MATTR and passive voice
+REVISIONS = {
+    'A': revision(17, 5, 0.8, 1, 10, ttr=0.1),
+    'B': revision(25, 5, 0.7, 2, 20),
+    'C': revision(25, 5, 0.7, 2, 20),
+    'D': revision(None, None, 0.9, 3, 5, ttr=0.9, density=0.9),
+}
+
+
+class CompareRevisionsTest(unittest.TestCase):
+    def compare(self, names):
+        fake = lambda text, **kwargs: REVISIONS[text]
+        with mock.patch.object(text_analyzer, 'analyze_revision', fake):
+            return compare_revisions(names, names=names, workers=1, use_cache=False)
+
+    def test_ranks(self):
+        comparison = self.compare(['A', 'B', 'C', 'D'])
+        revisions = {r['name']: r for r in comparison['revisions']}
+        # Competition ranking: ties share a rank, a missing value ranks last
+        self.assertEqual(revisions['A']['ranks'], {'mean_sentence_length': 1, 'sentence_length_stdev': 1,
+                                                   'mattr': 2, 'transition_density': 1, 'passive_pct': 2})
+        self.assertEqual(revisions['C']['ranks'], {'mean_sentence_length': 2, 'sentence_length_stdev': 1,
+                                                   'mattr': 3, 'transition_density': 2, 'passive_pct': 3})
+        self.assertEqual(revisions['D']['ranks'], {'mean_sentence_length': 4, 'sentence_length_stdev': 4,
+                                                   'mattr': 1, 'transition_density': 4, 'passive_pct': 1})
+        self.assertEqual([revisions[name]['mean_rank'] for name in 'ABCD'], [1.4, 2.2, 2.2, 2.8])
+        self.assertEqual(comparison['ranking'], ['A', 'B', 'C', 'D'])
+
+    def test_unranked_metrics_do_not_rank(self):
+        # A has the lowest TTR and D the highest, yet neither moves
+        comparison = self.compare(['A', 'B', 'C', 'D'])
+        for r in comparison['revisions']:
+            self.assertNotIn('type_token_ratio', r['ranks'])
+            self.assertNotIn('lexical_density', r['ranks'])
+        self.assertIn('TTR: not ranked', format_matrix(comparison))
+
+    def test_ties_keep_input_order(self):
+        self.assertEqual(self.compare(['C', 'B', 'A'])['ranking'], ['A', 'C', 'B'])
+        self.assertEqual(self.compare(['B', 'C', 'A'])['ranking'], ['A', 'B', 'C'])
+
+
+if __name__ == '__main__':
+    unittest.main()
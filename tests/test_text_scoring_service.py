@@ -0,0 +1,136 @@
+"""Batching, concurrency and request validation in the asyncio scoring service."""
+
+import asyncio
+import io
+import json
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from support import PT_TEXT, academic_text
+import text_scoring_service
+from ai_detector import AIDetector
+from detect_slop import SlopDetector
+from text_scoring_service import ScoringService, serve_jsonl
+
+
+class RecordingBatches:
+    """Stands in for score_batch in a thread pool and records each batch."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, jobs):
+        with self.lock:
+            self.batches.append([text for _, text, _ in jobs])
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return [(True, {'chars': len(text)}) for _, text, _ in jobs]
+
+
+class BatchingTest(unittest.TestCase):
+    def run_with_recorder(self, texts, recorder, **options):
+        async def run():
+            service = ScoringService(workers=2, **options)
+            await service.start()
+            service._small_pool.shutdown()
+            service._small_pool = ThreadPoolExecutor(max_workers=service.workers)
+            try:
+                with mock.patch.object(text_scoring_service, 'score_batch', recorder):
+                    return await service.score_many(texts)
+            finally:
+                await service.close()
+        return asyncio.run(run())
+
+    def test_batches_are_bounded_by_characters(self):
+        texts = ['x' * 400 for _ in range(20)]
+        recorder = RecordingBatches()
+        results = self.run_with_recorder(texts, recorder, batch_chars=1000, batch_window=0.05)
+        self.assertEqual(results, [{'chars': 400}] * 20)
+        self.assertTrue(all(sum(map(len, batch)) <= 1000 for batch in recorder.batches))
+        self.assertEqual(sum(len(batch) for batch in recorder.batches), 20)
+
+    def test_oversized_text_gets_its_own_batch(self):
+        texts = ['short', 'y' * 5000, 'short']
+        recorder = RecordingBatches()
+        self.run_with_recorder(texts, recorder, batch_chars=1000, batch_window=0.05)
+        self.assertIn(['y' * 5000], recorder.batches)
+
+    def test_several_batches_in_flight(self):
+        texts = [f'text {i}' for i in range(16)]
+        recorder = RecordingBatches(delay=0.1)
+        self.run_with_recorder(texts, recorder, batch_size=2, batch_window=0.01)
+        self.assertGreater(recorder.max_running, 1)
+
+
+class ScoringTest(unittest.TestCase):
+    def test_results_match_detector(self):
+        texts = [academic_text(seed) for seed in range(1, 13)]
+
+        async def run():
+            async with ScoringService(workers=2, batch_size=4) as service:
+                return await service.score_many(texts)
+
+        self.assertEqual(asyncio.run(run()), [AIDetector(text, language='auto').analyze() for text in texts])
+
+    def test_language_is_detected_by_default(self):
+        async def run():
+            async with ScoringService(workers=1) as service:
+                return await asyncio.gather(service.score(PT_TEXT, 'slop'),
+                                            service.score(PT_TEXT, 'slop', language='pt'),
+                                            service.score(PT_TEXT, 'ai'))
+
+        detected, explicit, ai = asyncio.run(run())
+        expected = SlopDetector.from_text(PT_TEXT, language='pt').analyze()
+        expected = dict(expected, findings=expected['findings'].to_dict())
+        self.assertEqual(detected, expected)
+        self.assertEqual(explicit, expected)
+        self.assertTrue(expected['findings']['high_risk'])
+        self.assertEqual(ai, AIDetector(PT_TEXT, language='pt').analyze())
+
+
+class RequestValidationTest(unittest.TestCase):
+    def serve(self, requests) -> list:
+        source = io.StringIO(''.join(json.dumps(r) + '\n' for r in requests))
+        out = io.StringIO()
+
+        async def run():
+            async with ScoringService(workers=1) as service:
+                await serve_jsonl(service, source, out)
+
+        asyncio.run(run())
+        return sorted((json.loads(line) for line in out.getvalue().splitlines()),
+                      key=lambda record: record['id'])
+
+    def test_bad_timeout_and_text_are_reported_separately(self):
+        records = self.serve([
+            {'id': 1, 'text': 'A short text.', 'timeout': 'soon'},
+            {'id': 2, 'text': 'A short text.', 'timeout': -1},
+            {'id': 3, 'timeout': 5},
+            {'id': 4, 'text': ['not', 'a', 'string']},
+            {'id': 5, 'text': 'A short text.', 'timeout': None},
+            {'id': 6, 'text': 'A short text.', 'language': 'fr'},
+            {'id': 7, 'text': 'A short text.', 'language': 7},
+            {'id': 8, 'text': 'Um texto curto.', 'language': 'pt-BR'},
+        ])
+        self.assertIn("'timeout'", records[0]['error'])
+        self.assertIn("'timeout'", records[1]['error'])
+        self.assertEqual(records[2]['error'], "request needs a 'text' string")
+        self.assertEqual(records[3]['error'], "request needs a 'text' string")
+        self.assertIn('result', records[4])
+        self.assertIn("unsupported language 'fr'", records[5]['error'])
+        self.assertIn("'language'", records[6]['error'])
+        self.assertIn('result', records[7])
+
+
+if __name__ == '__main__':
+    unittest.main()
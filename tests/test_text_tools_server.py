@@ -0,0 +1,95 @@
+"""Incremental session bookkeeping and per-skill pattern packs in the text tools daemon."""
+
+import unittest
+from unittest import mock
+
+from support import PT_TEXT
+import text_tools_server
+from text_tools_server import ToolHost
+from detect_slop import SlopDetector
+from clean_slop import SlopCleaner
+
+TEXT = "Moreover, the data was analyzed. Furthermore, results were shown.\n\nThe team met."
+
+
+class SessionLimitTest(unittest.TestCase):
+    def update(self, host: ToolHost, session: str, text: str = TEXT):
+        return host.handle({'jsonrpc': '2.0', 'id': 1, 'method': 'ai_detector.update',
+                            'params': {'session': session, 'text': text}})
+
+    def test_least_recently_updated_session_is_dropped(self):
+        host = ToolHost(use_cache=False, max_sessions=2)
+        self.update(host, 'a')
+        self.update(host, 'b')
+        self.update(host, 'a')
+        self.update(host, 'c')
+        self.assertEqual(list(host.sessions), ['a', 'c'])
+
+    def test_idle_sessions_expire(self):
+        host = ToolHost(use_cache=False, session_ttl=60)
+        with mock.patch.object(text_tools_server.time, 'monotonic', return_value=1000.0):
+            self.update(host, 'old')
+        with mock.patch.object(text_tools_server.time, 'monotonic', return_value=1030.0):
+            self.update(host, 'recent')
+        with mock.patch.object(text_tools_server.time, 'monotonic', return_value=1070.0):
+            self.update(host, 'new')
+        self.assertEqual(list(host.sessions), ['recent', 'new'])
+
+    def test_expired_session_starts_over(self):
+        host = ToolHost(use_cache=False, session_ttl=60)
+        with mock.patch.object(text_tools_server.time, 'monotonic', return_value=0.0):
+            self.update(host, 'a')
+        with mock.patch.object(text_tools_server.time, 'monotonic', return_value=100.0):
+            response = self.update(host, 'a', TEXT + " Notably, it ended.")
+        # A fresh session analyzes the whole text
+        self.assertEqual(response['result']['reanalyzed_chars'], len(TEXT) + len(" Notably, it ended."))
+
+    def test_close_forgets_session(self):
+        host = ToolHost(use_cache=False)
+        self.update(host, 'a')
+        response = host.handle({'jsonrpc': '2.0', 'id': 2, 'method': 'ai_detector.close',
+                                'params': {'session': 'a'}})
+        self.assertTrue(response['result']['results'])
+        self.assertEqual(len(host.sessions), 0)
+        self.assertEqual(host._session_used, {})
+
+
+class LanguagePacksTest(unittest.TestCase):
+    """Both skills share one pattern_packs module in the daemon but bundle different packs."""
+
+    def call(self, method: str, params: dict) -> dict:
+        response = ToolHost(use_cache=False).handle({'jsonrpc': '2.0', 'id': 1, 'method': method,
+                                                     'params': params})
+        return response['result']['results']
+
+    def test_detect_slop_uses_anti_slop_packs(self):
+        for language in ('pt', 'auto'):
+            with self.subTest(language=language):
+                results = self.call('detect_slop.analyze', {'text': PT_TEXT, 'language': language})
+                self.assertEqual(results, SlopDetector.from_text(PT_TEXT, language='pt').to_dict())
+                # Phrase categories come from anti-slop's pack; the score alone
+                # can reach 100 on structure findings
+                self.assertIn('wordy', results['counts'])
+                self.assertGreater(results['counts']['high_risk'], 0)
+                self.assertGreater(results['counts']['buzzwords'], 0)
+
+    def test_clean_slop_uses_anti_slop_packs(self):
+        results = self.call('clean_slop.clean', {'text': PT_TEXT, 'language': 'pt'})
+        cleaner = SlopCleaner.from_text(PT_TEXT, language='pt')
+        self.assertEqual(results['cleaned'], cleaner.clean())
+        self.assertEqual(results['rule_counts'], dict(cleaner.rule_counts))
+        self.assertTrue(results['changes'])
+
+    def test_update_rejects_non_english_text(self):
+        host = ToolHost(use_cache=False)
+        for params in ({'session': 'pt', 'text': PT_TEXT}, {'session': 'pt', 'text': TEXT, 'language': 'pt'}):
+            with self.subTest(params=params):
+                response = host.handle({'jsonrpc': '2.0', 'id': 1, 'method': 'ai_detector.update',
+                                        'params': params})
+                self.assertEqual(response['error']['code'], text_tools_server.INVALID_PARAMS)
+                self.assertIn("'pt'", response['error']['message'])
+        self.assertEqual(len(host.sessions), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()